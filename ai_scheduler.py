@@ -0,0 +1,113 @@
+import collections
+import time
+
+# Distance tiers, by the distance to the target at the ship's last think.
+# (upper distance, think interval as a multiple of the base interval, frames per movement step)
+AI_TIERS = [
+    (250, 1, 1),     # Near: on screen or about to be, full rate
+    (600, 3, 1),     # Mid: re-plans less often, still moves every frame
+    (None, 10, 4),   # Far: off screen, re-plans rarely and moves in coarse steps
+]
+TIER_NAMES = ("near", "mid", "far")
+THINK_BUDGET = 0.001      # Seconds of think() per frame; the most overdue ships go first
+THINK_COST = 0.00004      # Assumed seconds per think(), turning the budget into a think count
+MAX_FAR_INTERVAL = 0.5    # Far ships still re-plan at least this often (seconds)
+STATS_WINDOW = 1.0
+
+
+class AIScheduler:
+    """Spreads EnemyShip.think() over frames and lowers the update rate of distant ships.
+
+    Each ship carries its own schedule: next_think (scheduler clock time,
+    negative until first seen), idle_time (movement not yet integrated) and
+    ai_phase (which frames a coarse ship moves on), so the state can be
+    snapshotted with the ship. plan() runs the thinks that are due, oldest
+    first, up to THINK_BUDGET / THINK_COST of them (at least one per frame),
+    and returns the (ship, step) pairs to move this frame. Near and mid ships move
+    every frame with the frame's delta time, so steering stays smooth; far
+    ships move every few frames with the accumulated time. New ships get a
+    staggered first think so a wave of spawns does not land on one frame.
+    neighbours(ship) gives the ships a think() separates from, so a spatial
+    query can replace the full list; flow is passed on to think() for routing.
+    The budget is a count rather than a measured time so which thinks are
+    deferred does not depend on the machine, and a resimulation replays them.
+    """
+
+    def __init__(self, budget=THINK_BUDGET):
+        self.budget = budget
+        self.max_thinks = max(1, round(budget / THINK_COST))
+        self.clock = 0.0
+        self.frame = 0
+        self.stagger = 0  # Spreads first thinks and coarse moves of new ships
+
+        self.thinks = 0      # This frame
+        self.deferred = 0
+        self.think_time = 0.0
+        self.tiers = [0] * len(AI_TIERS)
+        self.frames = collections.deque()  # (frame end, thinks, deferred, think time)
+
+    def tier(self, ship):
+        distance = ship.last_player_distance
+        for index, (limit, _, _) in enumerate(AI_TIERS):
+            if limit is None or distance < limit:
+                return index
+        return len(AI_TIERS) - 1
+
+    def think_interval(self, tier, base_interval):
+        interval = base_interval * AI_TIERS[tier][1]
+        return min(interval, MAX_FAR_INTERVAL) if AI_TIERS[tier][0] is None else interval
+
+    def plan(self, ships, target, neighbours, delta_time, think_rate, flow=None):
+        """Think the due ships within the budget; returns [(ship, step)] to move this frame"""
+        self.clock += delta_time
+        self.frame += 1
+        base_interval = 1 / think_rate
+        clock = self.clock
+
+        due = []
+        for ship in ships:
+            if ship.next_think < 0:
+                # First seen: think() ran at spawn, so the next one is staggered
+                self.stagger = (self.stagger + 1) % 8
+                ship.next_think = clock + base_interval * self.stagger / 8
+                ship.ai_phase = self.stagger
+            if ship.next_think <= clock:
+                due.append(ship)
+        due.sort(key=lambda ship: ship.next_think)
+
+        start = time.perf_counter()
+        thinks = 0
+        for ship in due[:self.max_thinks]:
+            ship.think(target, neighbours(ship), flow)
+            ship.next_think = clock + self.think_interval(self.tier(ship), base_interval)
+            thinks += 1
+        self.think_time = time.perf_counter() - start
+        self.thinks = thinks
+        self.deferred = len(due) - thinks
+
+        moves = []
+        tiers = [0] * len(AI_TIERS)
+        for ship in ships:
+            tier = self.tier(ship)
+            tiers[tier] += 1
+            ship.idle_time += delta_time
+            if (self.frame + ship.ai_phase) % AI_TIERS[tier][2] == 0:
+                moves.append((ship, ship.idle_time))
+                ship.idle_time = 0.0
+        self.tiers = tiers
+
+        now = time.perf_counter()
+        self.frames.append((now, self.thinks, self.deferred, self.think_time))
+        while self.frames[0][0] < now - STATS_WINDOW:
+            self.frames.popleft()
+        return moves
+
+    def profiler_lines(self):
+        count = max(len(self.frames), 1)
+        thinks = sum(frame[1] for frame in self.frames) / count
+        deferred = sum(frame[2] for frame in self.frames) / count
+        think_time = sum(frame[3] for frame in self.frames) / count
+        tiers = ", ".join(f"{amount} {name}" for name, amount in zip(TIER_NAMES, self.tiers))
+        return [f"{tiers}",
+                f"{thinks:.1f} thinks/frame, {deferred:.1f} deferred, {think_time * 1000:.2f}ms "
+                f"of {self.budget * 1000:.1f}ms budget ({self.max_thinks} thinks)"]
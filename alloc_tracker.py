@@ -0,0 +1,103 @@
+import collections
+import os
+import time
+import tracemalloc
+
+# Opt in with LITTLESPACE_ALLOC=1; tracemalloc slows every allocation down, so it is off by default
+ALLOC_ENV_VAR = "LITTLESPACE_ALLOC"
+STATS_WINDOW = 1.0   # Seconds of frames averaged for the profiler panel
+CAPTURE_LINES = 15   # Source lines listed by a capture
+TRACE_FRAMES = 1     # Stack depth recorded per allocation (1 attributes it to the allocating line)
+
+
+def alloc_tracking_enabled():
+    return os.environ.get(ALLOC_ENV_VAR, "") not in ("", "0")
+
+
+class AllocationTracker:
+    """Bytes allocated per frame in each phase (update, draw, ...), measured with tracemalloc.
+
+    begin(phase) and end(phase) bracket a phase; phases must not nest.
+    tracemalloc has no running total of allocations, so "allocated" is the
+    peak of traced memory above the phase start, which is what the phase had
+    to allocate at once, and "retained" is what was still alive at the end.
+    capture() compares snapshots around the next frame's phases and prints
+    the source lines that allocated the most, to find which subsystem to fix.
+    """
+
+    def __init__(self, name, enabled=None):
+        self.name = name
+        self.enabled = alloc_tracking_enabled() if enabled is None else enabled
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+        self.start_bytes = 0
+        self.frame = {}  # phase -> (allocated, retained) for the frame in progress
+        self.frames = collections.deque()  # (frame end, {phase: (allocated, retained)})
+        self.capture_requested = False
+        self.capturing = False
+        self.snapshots = {}  # phase -> snapshot at begin, while capturing
+
+    def begin(self, phase):
+        if not self.enabled:
+            return
+        if self.capturing:
+            self.snapshots[phase] = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+
+    def end(self, phase):
+        if not self.enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        # A frame can run several fixed updates; their figures add up
+        allocated, retained = self.frame.get(phase, (0, 0))
+        self.frame[phase] = (allocated + peak - self.start_bytes, retained + current - self.start_bytes)
+        if self.capturing:
+            self.print_capture(phase, self.snapshots.pop(phase), tracemalloc.take_snapshot())
+
+    def frame_end(self):
+        """Close the frame's figures; call once per frame after its last phase"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frames.append((now, self.frame))
+        self.frame = {}
+        while self.frames[0][0] < now - STATS_WINDOW:
+            self.frames.popleft()
+
+        # A capture covers one whole frame
+        self.capturing = self.capture_requested
+        self.capture_requested = False
+
+    def capture(self):
+        if self.enabled:
+            self.capture_requested = True
+
+    def print_capture(self, phase, before, after):
+        # Our own bookkeeping and tracemalloc itself are excluded
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        print(f"[alloc] {self.name} {phase}: largest allocations still alive at the end of the phase")
+        for stat in stats[:CAPTURE_LINES]:
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                print(f"  {stat.size_diff:8d} B  {stat.count_diff:5d} blocks  {frame.filename}:{frame.lineno}")
+
+    def profiler_lines(self):
+        if not self.enabled:
+            return [f"off ({ALLOC_ENV_VAR}=1 to enable)"]
+        if not self.frames:
+            return ["no frames yet"]
+        count = len(self.frames)
+        phases = {}
+        for _, frame in self.frames:
+            for phase, (allocated, retained) in frame.items():
+                totals = phases.setdefault(phase, [0, 0])
+                totals[0] += allocated
+                totals[1] += retained
+        lines = [f"{phase}: {allocated / count / 1024:.1f}KB allocated, {retained / count / 1024:+.1f}KB retained per frame"
+                 for phase, (allocated, retained) in phases.items()]
+        total = sum(allocated for allocated, _ in phases.values()) / count
+        lines.append(f"total: {total / 1024:.1f}KB per frame (F10 prints the top lines)")
+        return lines
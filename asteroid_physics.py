@@ -0,0 +1,593 @@
+import math
+import random
+import time
+from array import array
+
+from arcade.gl import BufferDescription
+
+from spatial_index import ray_circle, segment_cells
+
+try:
+    import numpy
+except ImportError:  # Optional: without numpy rocks live in Python lists at a smaller capacity
+    numpy = None
+
+ASTEROID_CAPACITY = 20000   # Rocks simulated with numpy
+FALLBACK_CAPACITY = 1000    # Rocks without numpy, where the broadphase is a dict of cells
+INSTANCE_FLOATS = 5         # x, y, radius, angle, gray per rock on the GPU
+DRIFT_SPEED = (1.0, 6.0)    # World units per second given to a rock when the field comes alive
+SPIN_SPEED = 1.5            # Radians per second, either way
+RESTITUTION = 1.0           # Elastic: no energy lost in a collision
+CORRECTION = 0.8            # Share of an overlap pushed apart in one step
+SPLIT_PIECES = 3
+SPLIT_SPEED = 12.0          # Extra speed of the pieces away from the parent
+MIN_SPLIT_SIZE = 1.5        # Smaller rocks are destroyed instead of split
+KEY_STRIDE = 1 << 21        # Cell key = row * KEY_STRIDE + column
+STATS_WINDOW = 1.0
+
+# The forward half of a cell's neighbourhood: every touching pair of cells is visited once
+FORWARD_CELLS = [(1, 0), (-1, 1), (0, 1), (1, 1)]
+
+ASTEROID_VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+uniform vec2 offset;   // Origin minus camera, world units
+uniform float scale;   // Screen units per world unit
+in vec2 in_vert;       // Unit outline, shared by every rock
+in vec2 in_center;
+in float in_radius;
+in float in_angle;
+in float in_gray;
+out vec4 color;
+void main() {
+    float c = cos(in_angle);
+    float s = sin(in_angle);
+    vec2 corner = vec2(in_vert.x * c - in_vert.y * s, in_vert.x * s + in_vert.y * c) * in_radius;
+    gl_Position = window.projection * window.view * vec4((in_center + corner + offset) * scale, 0.0, 1.0);
+    color = vec4(in_gray, in_gray, in_gray, 1.0);
+}
+"""
+ASTEROID_FRAGMENT_SHADER = """
+#version 330
+in vec4 color;
+out vec4 fragColor;
+void main() {
+    fragColor = color;
+}
+"""
+
+
+class AsteroidField:
+    """Drifting, spinning rocks that collide with each other and the player.
+
+    When enabled, the rocks of every absorbed AsteroidCluster move into
+    preallocated arrays (columns x, y, vx, vy, radius, angle, spin, gray and
+    the owning cluster) and the clusters stop drawing them. Each step
+    integrates the columns, sorts the rocks by the key of their grid cell
+    and pairs every rock with the rocks later in its own cell and in the
+    forward half of its neighbours, found by binary search in the sorted
+    keys. Cells are twice the largest radius, so no touching pair is
+    missed. Colliding pairs exchange an elastic impulse along the contact
+    normal, with mass proportional to area, in a handful of whole-array
+    operations. freeze() writes the rocks back into their clusters as
+    static tuples. Positions are world doubles; the instance buffer is
+    written relative to the floating origin and drawn in one call.
+    """
+
+    def __init__(self, ctx, shape, bounds, capacity=None):
+        self.ctx = ctx
+        self.bounds = bounds  # (left, bottom, right, top) the rocks bounce off
+        self.capacity = capacity or (ASTEROID_CAPACITY if numpy is not None else FALLBACK_CAPACITY)
+        self.enabled = False
+        self.clusters = []  # Absorbed clusters, indexed by each rock's owner
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+        self.count = 0
+        self.cell_size = 1.0
+        self.pairs = 0      # Broadphase candidates in the last step
+        self.contacts = 0   # Of those, touching
+        self.splits = 0
+        self.destroyed = 0
+        self.update_time = 0.0
+        self.draw_time = 0.0
+        self.sorted_keys = None
+        self.order = None
+        self.ray_cells = 0  # Cells visited by raycast(), cumulative
+
+        if numpy is not None:
+            self.x = numpy.zeros(self.capacity)
+            self.y = numpy.zeros(self.capacity)
+            self.vx = numpy.zeros(self.capacity)
+            self.vy = numpy.zeros(self.capacity)
+            self.radius = numpy.ones(self.capacity)
+            self.angle = numpy.zeros(self.capacity)
+            self.spin = numpy.zeros(self.capacity)
+            self.gray = numpy.zeros(self.capacity)
+            self.owner = numpy.zeros(self.capacity, dtype=numpy.int32)
+            self.instances = numpy.zeros((self.capacity, INSTANCE_FLOATS), dtype=numpy.float32)
+        else:
+            self.rocks = []  # [x, y, vx, vy, radius, angle, spin, gray, owner]
+            self.cells = {}  # (column, row) -> rocks, the last step's broadphase
+
+        # Outline as a triangle fan, expanded to triangles so it draws with the instances
+        vertices = array("f")
+        for index in range(1, len(shape) - 1):
+            for px, py in (shape[0], shape[index], shape[index + 1]):
+                vertices.extend((px, py))
+        self.shape_vertices = len(vertices) // 2
+        self.program = ctx.program(vertex_shader=ASTEROID_VERTEX_SHADER, fragment_shader=ASTEROID_FRAGMENT_SHADER)
+        self.shape_buffer = ctx.buffer(data=vertices)
+        self.buffer = ctx.buffer(reserve=self.capacity * INSTANCE_FLOATS * 4)
+        self.geometry = ctx.geometry([
+            BufferDescription(self.shape_buffer, "2f", ["in_vert"]),
+            BufferDescription(self.buffer, "2f 1f 1f 1f", ["in_center", "in_radius", "in_angle", "in_gray"],
+                              instanced=True),
+        ], mode=ctx.TRIANGLES)
+
+    def rebase(self, origin_x, origin_y):
+        """Positions are doubles, so only the origin the instances are written against moves"""
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+
+    def absorb(self, cluster):
+        """Take over a cluster's rocks; returns False when they do not fit"""
+        if self.count + len(cluster.asteroids) > self.capacity:
+            return False
+        owner = len(self.clusters)
+        self.clusters.append(cluster)
+        for ax, ay, size, color in cluster.asteroids:
+            heading = random.uniform(0, 2 * math.pi)
+            speed = random.uniform(*DRIFT_SPEED)
+            self.add(ax, ay, math.cos(heading) * speed, math.sin(heading) * speed, size,
+                     random.uniform(0, 2 * math.pi), random.uniform(-SPIN_SPEED, SPIN_SPEED), color[0] / 255, owner)
+        cluster.dynamic = True
+        return True
+
+    def freeze(self):
+        """Write every rock back into its cluster as a static tuple and empty the field"""
+        frozen = [[] for _ in self.clusters]
+        for x, y, radius, gray, owner in self.rock_records():
+            value = int(round(gray * 255))
+            frozen[owner].append((x, y, radius, (value, value, value)))
+        for cluster, asteroids in zip(self.clusters, frozen):
+            cluster.asteroids = asteroids
+            cluster.spread = max([cluster.spread] + [max(abs(ax - cluster.x), abs(ay - cluster.y))
+                                                     for ax, ay, _, _ in asteroids])
+            cluster.dynamic = False
+        self.clusters = []
+        self.count = 0
+        if numpy is None:
+            self.rocks = []
+
+    def rock_records(self):
+        """(x, y, radius, gray, owner) of every rock"""
+        if numpy is not None:
+            count = self.count
+            return zip(self.x[:count].tolist(), self.y[:count].tolist(), self.radius[:count].tolist(),
+                       self.gray[:count].tolist(), self.owner[:count].tolist())
+        return [(rock[0], rock[1], rock[4], rock[7], rock[8]) for rock in self.rocks]
+
+    def positions(self):
+        """(xs, ys) lists of the rock centres, in index order"""
+        if numpy is not None:
+            return self.x[:self.count].tolist(), self.y[:self.count].tolist()
+        return [rock[0] for rock in self.rocks], [rock[1] for rock in self.rocks]
+
+    def accelerate(self, ax, ay, delta_time):
+        """Add accelerations, given in index order, to the rock velocities (gravity)"""
+        if numpy is not None:
+            count = self.count
+            self.vx[:count] += numpy.asarray(ax) * delta_time
+            self.vy[:count] += numpy.asarray(ay) * delta_time
+            return
+        for rock, rock_ax, rock_ay in zip(self.rocks, ax, ay):
+            rock[2] += rock_ax * delta_time
+            rock[3] += rock_ay * delta_time
+
+    def rows(self):
+        """Every rock as a list [x, y, vx, vy, radius, angle, spin, gray, owner], for snapshots.
+
+        Without numpy these are the live rocks; with numpy they are copies,
+        and load_rows() writes edited ones back into the columns.
+        """
+        if numpy is None:
+            return self.rocks
+        count = self.count
+        columns = [column[:count].tolist() for column in (self.x, self.y, self.vx, self.vy, self.radius, self.angle,
+                                                          self.spin, self.gray, self.owner)]
+        return [list(row) for row in zip(*columns)]
+
+    def load_rows(self, rows):
+        """Replace the rocks with rows; rocks of clusters the field no longer holds are dropped"""
+        rows = [row for row in rows if row[8] < len(self.clusters)][:self.capacity]
+        self.count = len(rows)
+        self.sorted_keys = None
+        if numpy is None:
+            self.rocks[:] = rows
+            self.cells = {}
+            return
+        for index, column in enumerate((self.x, self.y, self.vx, self.vy, self.radius, self.angle, self.spin,
+                                        self.gray, self.owner)):
+            column[:self.count] = [row[index] for row in rows]
+
+    def add(self, x, y, vx, vy, radius, angle, spin, gray, owner):
+        if self.count >= self.capacity:
+            return False
+        if numpy is None:
+            self.rocks.append([x, y, vx, vy, radius, angle, spin, gray, owner])
+            self.count = len(self.rocks)
+            return True
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.radius[index] = radius
+        self.angle[index] = angle
+        self.spin[index] = spin
+        self.gray[index] = gray
+        self.owner[index] = owner
+        self.count += 1
+        return True
+
+    def remove(self, index):
+        """Drop a rock by moving the last one into its slot"""
+        last = self.count - 1
+        if numpy is None:
+            self.rocks[index] = self.rocks[last]
+            self.rocks.pop()
+        else:
+            for column in (self.x, self.y, self.vx, self.vy, self.radius, self.angle, self.spin, self.gray,
+                           self.owner):
+                column[index] = column[last]
+        self.count = last
+        self.sorted_keys = None  # Indexes changed; body checks wait for the next step
+        if numpy is None:
+            self.cells = {}
+
+    def rock(self, index):
+        """(x, y, vx, vy, radius) of one rock"""
+        if numpy is None:
+            return tuple(self.rocks[index][:5])
+        return (float(self.x[index]), float(self.y[index]), float(self.vx[index]), float(self.vy[index]),
+                float(self.radius[index]))
+
+    def split(self, index):
+        """Break a rock into SPLIT_PIECES of the same total area flying apart; small rocks are destroyed.
+
+        Returns the number of pieces made (0 when the rock was destroyed).
+        """
+        x, y, vx, vy, radius = self.rock(index)
+        gray = self.rocks[index][7] if numpy is None else float(self.gray[index])
+        owner = self.rocks[index][8] if numpy is None else int(self.owner[index])
+        self.remove(index)
+        if radius < MIN_SPLIT_SIZE:
+            self.destroyed += 1
+            return 0
+        piece_radius = radius / math.sqrt(SPLIT_PIECES)
+        first = random.uniform(0, 2 * math.pi)
+        made = 0
+        for piece in range(SPLIT_PIECES):
+            heading = first + piece * 2 * math.pi / SPLIT_PIECES
+            dx = math.cos(heading)
+            dy = math.sin(heading)
+            if self.add(x + dx * piece_radius, y + dy * piece_radius, vx + dx * SPLIT_SPEED, vy + dy * SPLIT_SPEED,
+                        piece_radius, random.uniform(0, 2 * math.pi), random.uniform(-SPIN_SPEED, SPIN_SPEED) * 2,
+                        gray, owner):
+                made += 1
+        self.splits += 1
+        return made
+
+    def update(self, delta_time):
+        start = time.perf_counter()
+        if numpy is not None:
+            self.update_arrays(delta_time)
+        else:
+            self.update_python(delta_time)
+        self.update_time = time.perf_counter() - start
+
+    def update_arrays(self, delta_time):
+        count = self.count
+        if not count:
+            self.pairs = self.contacts = 0
+            return
+        x, y = self.x[:count], self.y[:count]
+        vx, vy = self.vx[:count], self.vy[:count]
+        radius = self.radius[:count]
+        x += vx * delta_time
+        y += vy * delta_time
+        self.angle[:count] += self.spin[:count] * delta_time
+        self.bounce(x, y, vx, vy, radius)
+
+        # Broadphase: rocks sorted by cell, pairs found by binary search in the sorted keys
+        self.cell_size = cell_size = 2 * float(radius.max())
+        columns = numpy.floor(x / cell_size).astype(numpy.int64)
+        rows = numpy.floor(y / cell_size).astype(numpy.int64)
+        keys = rows * KEY_STRIDE + columns
+        order = numpy.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        self.order = order
+        self.sorted_keys = sorted_keys
+
+        positions = numpy.arange(count)
+        # Later rocks in the same cell
+        firsts = [positions]
+        ends = [numpy.searchsorted(sorted_keys, sorted_keys, "right")]
+        starts = [positions + 1]
+        for dx, dy in FORWARD_CELLS:
+            probe = sorted_keys + (dy * KEY_STRIDE + dx)
+            firsts.append(positions)
+            starts.append(numpy.searchsorted(sorted_keys, probe, "left"))
+            ends.append(numpy.searchsorted(sorted_keys, probe, "right"))
+        first = numpy.concatenate(firsts)
+        start = numpy.concatenate(starts)
+        counts = numpy.maximum(numpy.concatenate(ends) - start, 0)
+        total = int(counts.sum())
+        self.pairs = total
+        if not total:
+            self.contacts = 0
+            return
+        runs = numpy.cumsum(counts) - counts
+        second = numpy.repeat(start - runs, counts) + numpy.arange(total)
+        i = order[numpy.repeat(first, counts)]
+        j = order[second]
+
+        # Narrowphase on the candidates
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        reach = radius[i] + radius[j]
+        distance_squared = dx * dx + dy * dy
+        touching = distance_squared < reach * reach
+        i, j = i[touching], j[touching]
+        self.contacts = len(i)
+        if not len(i):
+            return
+        dx, dy, reach = dx[touching], dy[touching], reach[touching]
+        distance = numpy.sqrt(distance_squared[touching])
+        numpy.maximum(distance, 1e-6, out=distance)
+        nx = dx / distance
+        ny = dy / distance
+
+        # Elastic impulse along the normal for approaching pairs, mass ~ area
+        inverse_mass = 1.0 / (radius * radius)
+        inverse_i = inverse_mass[i]
+        inverse_j = inverse_mass[j]
+        inverse_sum = inverse_i + inverse_j
+        closing = (vx[j] - vx[i]) * nx + (vy[j] - vy[i]) * ny
+        impulse = numpy.where(closing < 0, -(1 + RESTITUTION) * closing / inverse_sum, 0.0)
+        push = (reach - distance) * CORRECTION / inverse_sum
+        vx -= numpy.bincount(i, impulse * inverse_i * nx, count) - numpy.bincount(j, impulse * inverse_j * nx, count)
+        vy -= numpy.bincount(i, impulse * inverse_i * ny, count) - numpy.bincount(j, impulse * inverse_j * ny, count)
+        x -= numpy.bincount(i, push * inverse_i * nx, count) - numpy.bincount(j, push * inverse_j * nx, count)
+        y -= numpy.bincount(i, push * inverse_i * ny, count) - numpy.bincount(j, push * inverse_j * ny, count)
+
+    def bounce(self, x, y, vx, vy, radius):
+        """Reflect rocks off the world edges"""
+        left, bottom, right, top = self.bounds
+        for position, velocity, low, high in ((x, vx, left, right), (y, vy, bottom, top)):
+            below = position < low + radius
+            above = position > high - radius
+            velocity[below] = numpy.abs(velocity[below])
+            velocity[above] = -numpy.abs(velocity[above])
+
+    def update_python(self, delta_time):
+        rocks = self.rocks
+        left, bottom, right, top = self.bounds
+        largest = 0.0
+        for rock in rocks:
+            rock[0] += rock[2] * delta_time
+            rock[1] += rock[3] * delta_time
+            rock[5] += rock[6] * delta_time
+            if rock[0] < left + rock[4] or rock[0] > right - rock[4]:
+                rock[2] = abs(rock[2]) if rock[0] < left + rock[4] else -abs(rock[2])
+            if rock[1] < bottom + rock[4] or rock[1] > top - rock[4]:
+                rock[3] = abs(rock[3]) if rock[1] < bottom + rock[4] else -abs(rock[3])
+            largest = max(largest, rock[4])
+        if not rocks:
+            self.pairs = self.contacts = 0
+            return
+
+        self.cell_size = cell_size = 2 * largest
+        cells = {}
+        for rock in rocks:
+            cells.setdefault((int(rock[0] // cell_size), int(rock[1] // cell_size)), []).append(rock)
+        self.cells = cells
+        pairs = contacts = 0
+        for (column, row), bucket in cells.items():
+            for index, a in enumerate(bucket):
+                others = bucket[index + 1:]
+                for dx, dy in FORWARD_CELLS:
+                    others = others + cells.get((column + dx, row + dy), [])
+                pairs += len(others)
+                for b in others:
+                    contacts += self.collide_python(a, b)
+        self.pairs = pairs
+        self.contacts = contacts
+
+    def collide_python(self, a, b):
+        dx = b[0] - a[0]
+        dy = b[1] - a[1]
+        reach = a[4] + b[4]
+        distance_squared = dx * dx + dy * dy
+        if distance_squared >= reach * reach:
+            return 0
+        distance = max(math.sqrt(distance_squared), 1e-6)
+        nx = dx / distance
+        ny = dy / distance
+        inverse_a = 1.0 / (a[4] * a[4])
+        inverse_b = 1.0 / (b[4] * b[4])
+        inverse_sum = inverse_a + inverse_b
+        closing = (b[2] - a[2]) * nx + (b[3] - a[3]) * ny
+        if closing < 0:
+            impulse = -(1 + RESTITUTION) * closing / inverse_sum
+            a[2] -= impulse * inverse_a * nx
+            a[3] -= impulse * inverse_a * ny
+            b[2] += impulse * inverse_b * nx
+            b[3] += impulse * inverse_b * ny
+        push = (reach - distance) * CORRECTION / inverse_sum
+        a[0] -= push * inverse_a * nx
+        a[1] -= push * inverse_a * ny
+        b[0] += push * inverse_b * nx
+        b[1] += push * inverse_b * ny
+        return 1
+
+    def candidates(self, x, y, reach):
+        """Indexes of rocks whose cell lies within reach of (x, y), from the last step's broadphase"""
+        if numpy is None:
+            cell_size = self.cell_size
+            cells = self.cells
+            return [rock for column in range(int((x - reach) // cell_size), int((x + reach) // cell_size) + 1)
+                    for row in range(int((y - reach) // cell_size), int((y + reach) // cell_size) + 1)
+                    for rock in cells.get((column, row), ())]
+        if self.sorted_keys is None:
+            return []
+        cell_size = self.cell_size
+        first_column = int((x - reach) // cell_size)
+        last_column = int((x + reach) // cell_size)
+        found = []
+        for row in range(int((y - reach) // cell_size), int((y + reach) // cell_size) + 1):
+            start = numpy.searchsorted(self.sorted_keys, row * KEY_STRIDE + first_column, "left")
+            end = numpy.searchsorted(self.sorted_keys, row * KEY_STRIDE + last_column, "right")
+            found.extend(self.order[start:end].tolist())
+        return found
+
+    def raycast(self, x0, y0, x1, y1):
+        """First rock along the segment: (index, distance) or None.
+
+        Walks the broadphase cells the segment crosses, each with its ring
+        of neighbours (cells are two radii wide, so a rock touching the ray
+        has its centre within one cell of it), then tests the rocks found
+        in those cells in one pass.
+        """
+        length = math.hypot(x1 - x0, y1 - y0)
+        if not length or not self.count:
+            return None
+        unit_x = (x1 - x0) / length
+        unit_y = (y1 - y0) / length
+        keys = set()
+        for column, row, _ in segment_cells(x0, y0, x1, y1, self.cell_size):
+            for near_row in (row - 1, row, row + 1):
+                base = near_row * KEY_STRIDE + column
+                keys.update((base - 1, base, base + 1))
+        self.ray_cells += len(keys)
+
+        if numpy is None:
+            best = None
+            best_distance = length
+            for key in keys:
+                row, column = divmod(key, KEY_STRIDE)
+                for rock in self.cells.get((column, row), ()):
+                    distance = ray_circle(x0, y0, unit_x, unit_y, best_distance, rock[0], rock[1], rock[4])
+                    if distance is not None:
+                        best, best_distance = rock, distance
+            return None if best is None else (next(index for index, rock in enumerate(self.rocks) if rock is best),
+                                              best_distance)
+
+        if self.sorted_keys is None:
+            return None
+        probe = numpy.fromiter(keys, dtype=numpy.int64, count=len(keys))
+        start = numpy.searchsorted(self.sorted_keys, probe, "left")
+        counts = numpy.searchsorted(self.sorted_keys, probe, "right") - start
+        total = int(counts.sum())
+        if not total:
+            return None
+        runs = numpy.cumsum(counts) - counts
+        found = self.order[numpy.repeat(start - runs, counts) + numpy.arange(total)]
+
+        # Ray against every found circle at once
+        offset_x = self.x[found] - x0
+        offset_y = self.y[found] - y0
+        along = offset_x * unit_x + offset_y * unit_y
+        radius = self.radius[found]
+        miss = offset_x * offset_x + offset_y * offset_y - along * along
+        half_chord = numpy.sqrt(numpy.maximum(radius * radius - miss, 0.0))
+        distance = numpy.maximum(along - half_chord, 0.0)
+        hit = (miss <= radius * radius) & (along + half_chord >= 0) & (distance <= length)
+        if not hit.any():
+            return None
+        distance = numpy.where(hit, distance, numpy.inf)
+        nearest = int(numpy.argmin(distance))
+        return int(found[nearest]), float(distance[nearest])
+
+    def collide_body(self, body, radius, mass):
+        """Elastic collision of a moving circle (body.x/y/velocity_x/velocity_y) with the rocks it touches.
+
+        Returns (x, y, direction away from the rock) of the deepest contact,
+        for sparks, or None.
+        """
+        contact = None
+        deepest = 0.0
+        inverse_body = 1.0 / mass
+        reach = radius + self.cell_size / 2
+        for rock in self.candidates(body.x, body.y, reach):
+            if numpy is None:
+                rock_x, rock_y, rock_vx, rock_vy, rock_radius = rock[:5]
+            else:
+                rock_x, rock_y, rock_vx, rock_vy, rock_radius = self.rock(rock)
+            dx = body.x - rock_x
+            dy = body.y - rock_y
+            distance = math.hypot(dx, dy)
+            overlap = radius + rock_radius - distance
+            if overlap <= 0 or distance == 0:
+                continue
+            nx = dx / distance
+            ny = dy / distance
+            inverse_rock = 1.0 / (rock_radius * rock_radius)
+            inverse_sum = inverse_body + inverse_rock
+            closing = (body.velocity_x - rock_vx) * nx + (body.velocity_y - rock_vy) * ny
+            impulse = -(1 + RESTITUTION) * closing / inverse_sum if closing < 0 else 0.0
+            push = overlap / inverse_sum
+            body.velocity_x += impulse * inverse_body * nx
+            body.velocity_y += impulse * inverse_body * ny
+            body.x += push * inverse_body * nx
+            body.y += push * inverse_body * ny
+            rock_vx -= impulse * inverse_rock * nx
+            rock_vy -= impulse * inverse_rock * ny
+            rock_x -= push * inverse_rock * nx
+            rock_y -= push * inverse_rock * ny
+            if numpy is None:
+                rock[0:4] = [rock_x, rock_y, rock_vx, rock_vy]
+            else:
+                self.x[rock], self.y[rock], self.vx[rock], self.vy[rock] = rock_x, rock_y, rock_vx, rock_vy
+            if overlap > deepest:
+                deepest = overlap
+                contact = (body.x - nx * radius, body.y - ny * radius, math.degrees(math.atan2(nx, ny)))
+        return contact
+
+    def draw(self, camera_x, camera_y, scale):
+        """Draw every rock in one instanced call under the active camera"""
+        if not self.count:
+            return
+        start = time.perf_counter()
+        count = self.count
+        if numpy is not None:
+            instances = self.instances[:count]
+            numpy.subtract(self.x[:count], self.origin_x, out=instances[:, 0], casting="unsafe")
+            numpy.subtract(self.y[:count], self.origin_y, out=instances[:, 1], casting="unsafe")
+            instances[:, 2] = self.radius[:count]
+            instances[:, 3] = self.angle[:count]
+            instances[:, 4] = self.gray[:count]
+            self.buffer.write(instances)
+        else:
+            instances = array("f")
+            for x, y, _, _, radius, angle, _, gray, _ in self.rocks:
+                instances.extend((x - self.origin_x, y - self.origin_y, radius, angle, gray))
+            self.buffer.write(instances)
+
+        program = self.program
+        program["offset"] = (self.origin_x - camera_x, self.origin_y - camera_y)
+        program["scale"] = scale
+        self.geometry.render(program, vertices=self.shape_vertices, instances=count)
+        self.draw_time = time.perf_counter() - start
+
+    def profiler_lines(self):
+        if not self.enabled:
+            return ["static (R makes the clusters dynamic)"]
+        backend = "numpy" if numpy is not None else "python"
+        return [f"{self.count} rocks of {self.capacity} from {len(self.clusters)} clusters ({backend})",
+                f"{self.pairs} pairs tested, {self.contacts} contacts, cells of {self.cell_size:.1f}",
+                f"update {self.update_time * 1000:.2f}ms, upload+draw {self.draw_time * 1000:.2f}ms, "
+                f"{self.splits} split, {self.destroyed} destroyed"]
@@ -0,0 +1,102 @@
+import collections
+import math
+import time
+
+import arcade
+
+STATS_WINDOW = 1.0
+
+
+class BeamType:
+    """How one kind of beam fires and looks. Angles in degrees, 0 = up, clockwise like the ships."""
+    __slots__ = ("range", "cooldown", "flash", "width", "color")
+
+    def __init__(self, range=300, cooldown=0.2, flash=0.05, width=1, color=(255, 255, 255, 255)):
+        self.range = range        # World units
+        self.cooldown = cooldown  # Seconds between shots per owner; 0 fires every frame
+        self.flash = flash        # Seconds the line stays on screen; 0 is the frame it fired
+        self.width = width        # World units
+        self.color = color
+
+
+BEAM_TYPES = {
+    "laser": BeamType(range=300, cooldown=0.15, flash=0.06, width=1, color=(255, 80, 80, 230)),
+    "mining": BeamType(range=110, cooldown=0.0, flash=0.0, width=1, color=(120, 255, 170, 150)),
+}
+
+
+class BeamSystem:
+    """Hit-scan beams, resolved the moment they fire.
+
+    cast(x0, y0, x1, y1) returns the first thing on the segment as
+    (target, distance, part) or None. It is normally a raycast of a spatial
+    index, so a beam costs the cells it crosses rather than the objects in
+    the world. A fired beam is drawn as a line from the muzzle to the hit,
+    or to full range, for its type's flash time. Cooldowns are kept per
+    owner and beam type; cells() is the cumulative count of cells the
+    casts have visited, for the profiler.
+    """
+
+    def __init__(self, cast, cells=None, types=BEAM_TYPES):
+        self.cast = cast
+        self.cells = cells
+        self.types = types
+        self.cooldowns = {}  # (owner, type name) -> seconds left
+        self.visible = []    # [x0, y0, x1, y1, age, type]
+        self.fired = collections.deque()  # (time, cast seconds)
+        self.total_fired = 0
+        self.hits = 0
+
+    def fire(self, name, owner, x, y, angle):
+        """Fire from (x, y) toward angle; returns (target, distance, part, hit x, hit y), or None on a miss or cooldown"""
+        beam = self.types[name]
+        key = (owner, name)
+        if self.cooldowns.get(key, 0.0) > 0:
+            return None
+        if beam.cooldown:
+            self.cooldowns[key] = beam.cooldown
+
+        angle_rad = math.radians(angle)
+        unit_x = math.sin(angle_rad)
+        unit_y = math.cos(angle_rad)
+        start = time.perf_counter()
+        hit = self.cast(x, y, x + unit_x * beam.range, y + unit_y * beam.range)
+        now = time.perf_counter()
+        self.fired.append((now, now - start))
+        while self.fired[0][0] < now - STATS_WINDOW:
+            self.fired.popleft()
+        self.total_fired += 1
+
+        distance = hit[1] if hit is not None else beam.range
+        end_x = x + unit_x * distance
+        end_y = y + unit_y * distance
+        self.visible.append([x, y, end_x, end_y, 0.0, beam])
+        if hit is None:
+            return None
+        self.hits += 1
+        return hit[0], distance, hit[2], end_x, end_y
+
+    def update(self, delta_time):
+        for key in list(self.cooldowns):
+            left = self.cooldowns[key] - delta_time
+            if left > 0:
+                self.cooldowns[key] = left
+            else:
+                del self.cooldowns[key]
+        for line in self.visible:
+            line[4] += delta_time
+        self.visible = [line for line in self.visible if line[4] <= line[5].flash]
+
+    def draw(self, camera_x, camera_y, scale):
+        for x0, y0, x1, y1, _, beam in self.visible:
+            arcade.draw_line((x0 - camera_x) * scale, (y0 - camera_y) * scale,
+                             (x1 - camera_x) * scale, (y1 - camera_y) * scale, beam.color, beam.width * scale)
+
+    def profiler_lines(self):
+        count = len(self.fired)
+        cast_time = sum(seconds for _, seconds in self.fired) / max(count, 1)
+        lines = [f"{count} beams/s, {len(self.visible)} on screen, {self.hits} hits of {self.total_fired}",
+                 f"cast {cast_time * 1e6:.0f}us each"]
+        if self.cells is not None and self.total_fired:
+            lines[1] += f", {self.cells() / self.total_fired:.1f} cells visited per beam"
+        return lines
@@ -0,0 +1,247 @@
+import arcade
+import contextlib
+import math
+import time
+from array import array
+
+from arcade.earclip import earclip
+from arcade.gl import BufferDescription
+
+# The arcade functions batching() replaces; their call shapes are kept
+BATCHED_FUNCTIONS = ("draw_circle_filled", "draw_circle_outline", "draw_line", "draw_polygon_filled",
+                     "draw_polygon_outline", "draw_lrbt_rectangle_filled")
+VERTEX_FLOATS = 6            # x, y, r, g, b, a
+INITIAL_BUFFER_VERTICES = 4096  # Grown to the next power of two when a flush needs more
+
+BATCH_VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+in vec2 in_pos;
+in vec4 in_color;
+out vec4 color;
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_pos, 0.0, 1.0);
+    color = in_color;
+}
+"""
+BATCH_FRAGMENT_SHADER = """
+#version 330
+in vec4 color;
+out vec4 fragColor;
+void main() {
+    fragColor = color;
+}
+"""
+
+
+def circle_segments(radius):
+    """Segment count arcade picks for a circle of this radius"""
+    size = radius * 2
+    return max(3, 6 if size <= 12 else int(size) // 2)
+
+
+class DrawBatcher:
+    """Collects arcade.draw_* shapes as coloured triangles and draws them in one call per blend state.
+
+    Between begin() and end() (or inside batching()) the functions in
+    BATCHED_FUNCTIONS are swapped on the arcade module for methods with the
+    same arguments, so existing draw code is batched unchanged. Shapes are
+    tessellated the way arcade does it (same circle segment counts,
+    earclipped polygons) into a vertex array per blend function, and drawn
+    in call order by end(). Blocks do not nest, everything in a block must
+    be drawn with the same camera, and anything drawn another way inside it
+    (sprites, text) lands behind the batched shapes, so blocks are kept to
+    runs of plain shapes.
+    """
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.enabled = True
+        self.originals = None  # Replaced arcade functions while batching
+        self.program = ctx.program(vertex_shader=BATCH_VERTEX_SHADER, fragment_shader=BATCH_FRAGMENT_SHADER)
+        self.buffer = ctx.buffer(reserve=INITIAL_BUFFER_VERTICES * VERTEX_FLOATS * 4)
+        self.geometry = ctx.geometry([BufferDescription(self.buffer, "2f 4f", ["in_pos", "in_color"])],
+                                     mode=ctx.TRIANGLES)
+        self.batches = {}  # blend function -> array of vertices
+        self.unit_circles = {}  # segment count -> [(sin, cos)] around the circle, clockwise from the top
+
+        self.shapes = 0   # This frame so far
+        self.flushes = 0
+        self.vertices = 0
+        self.flush_time = 0.0
+        self.last_frame = (0, 0, 0, 0.0)
+
+    def begin(self):
+        """Start batching every arcade shape drawn until end()"""
+        if not self.enabled or self.originals:
+            return
+        self.originals = {name: getattr(arcade, name) for name in BATCHED_FUNCTIONS}
+        for name in BATCHED_FUNCTIONS:
+            setattr(arcade, name, getattr(self, name))
+
+    def end(self):
+        """Put the arcade functions back and draw what was collected"""
+        if not self.originals:
+            return
+        for name, function in self.originals.items():
+            setattr(arcade, name, function)
+        self.originals = None
+        self.flush()
+
+    @contextlib.contextmanager
+    def batching(self):
+        """begin() and end() around a block"""
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.end()
+
+    def flush(self):
+        start = time.perf_counter()
+        ctx = self.ctx
+        blend_func = ctx.blend_func
+        for blend, data in self.batches.items():
+            if not data:
+                continue
+            count = len(data) // VERTEX_FLOATS
+            if len(data) * 4 > self.buffer.size:
+                self.buffer.orphan(size=(1 << (count - 1).bit_length()) * VERTEX_FLOATS * 4)
+            self.buffer.write(data)
+            ctx.blend_func = blend
+            with ctx.enabled(ctx.BLEND):
+                self.geometry.render(self.program, vertices=count)
+            self.vertices += count
+            self.flushes += 1
+            del data[:]
+        ctx.blend_func = blend_func
+        self.flush_time += time.perf_counter() - start
+
+    def frame_end(self):
+        self.last_frame = (self.shapes, self.flushes, self.vertices, self.flush_time)
+        self.shapes = 0
+        self.flushes = 0
+        self.vertices = 0
+        self.flush_time = 0.0
+
+    def target(self, color):
+        """Vertex array for the current blend state and the colour normalised for it"""
+        self.shapes += 1
+        data = self.batches.get(self.ctx.blend_func)
+        if data is None:
+            data = self.batches[self.ctx.blend_func] = array("f")
+        alpha = color[3] / 255 if len(color) == 4 else 1.0
+        return data, (color[0] / 255, color[1] / 255, color[2] / 255, alpha)
+
+    def unit_circle(self, segments):
+        points = self.unit_circles.get(segments)
+        if points is None:
+            step = math.pi * 2 / segments
+            points = [(math.sin(i * step), math.cos(i * step)) for i in range(segments + 1)]
+            self.unit_circles[segments] = points
+        return points
+
+    def circle_points(self, radius, tilt_angle, segments):
+        if segments == -1:
+            segments = circle_segments(radius)
+        points = self.unit_circle(max(segments, 3))
+        if tilt_angle:
+            angle = math.radians(tilt_angle)
+            cos_a = math.cos(angle)
+            sin_a = math.sin(angle)
+            points = [(x * cos_a + y * sin_a, -x * sin_a + y * cos_a) for x, y in points]
+        return points
+
+    # Same signatures as the arcade functions they stand in for
+
+    def draw_circle_filled(self, center_x, center_y, radius, color, tilt_angle=0, num_segments=-1):
+        data, rgba = self.target(color)
+        points = self.circle_points(radius, tilt_angle, num_segments)
+        center = (center_x, center_y) + rgba
+        x0, y0 = points[0]
+        last = (center_x + x0 * radius, center_y + y0 * radius) + rgba
+        for x, y in points[1:]:
+            point = (center_x + x * radius, center_y + y * radius) + rgba
+            data.extend(center)
+            data.extend(last)
+            data.extend(point)
+            last = point
+
+    def draw_circle_outline(self, center_x, center_y, radius, color, border_width=1, tilt_angle=0, num_segments=-1):
+        # Like arcade, the border runs inwards from the radius
+        data, rgba = self.target(color)
+        points = self.circle_points(radius, tilt_angle, num_segments)
+        inner = radius - border_width
+        previous = None
+        for x, y in points:
+            outer_point = (center_x + x * radius, center_y + y * radius) + rgba
+            inner_point = (center_x + x * inner, center_y + y * inner) + rgba
+            if previous is not None:
+                previous_outer, previous_inner = previous
+                data.extend(previous_inner)
+                data.extend(previous_outer)
+                data.extend(outer_point)
+                data.extend(previous_inner)
+                data.extend(outer_point)
+                data.extend(inner_point)
+            previous = (outer_point, inner_point)
+
+    def draw_line(self, start_x, start_y, end_x, end_y, color, line_width=1):
+        data, rgba = self.target(color)
+        self.add_line(data, rgba, start_x, start_y, end_x, end_y, line_width)
+
+    def add_line(self, data, rgba, start_x, start_y, end_x, end_y, line_width):
+        dx = end_x - start_x
+        dy = end_y - start_y
+        length = math.sqrt(dx * dx + dy * dy)
+        if length == 0:
+            return
+        shift_x = -dy / length * line_width / 2
+        shift_y = dx / length * line_width / 2
+        a = (start_x + shift_x, start_y + shift_y) + rgba
+        b = (start_x - shift_x, start_y - shift_y) + rgba
+        c = (end_x - shift_x, end_y - shift_y) + rgba
+        d = (end_x + shift_x, end_y + shift_y) + rgba
+        data.extend(a)
+        data.extend(b)
+        data.extend(c)
+        data.extend(a)
+        data.extend(c)
+        data.extend(d)
+
+    def draw_polygon_filled(self, point_list, color):
+        data, rgba = self.target(color)
+        triangles = (point_list,) if len(point_list) == 3 else earclip(point_list)
+        for triangle in triangles:
+            for x, y in triangle:
+                data.extend((x, y) + rgba)
+
+    def draw_polygon_outline(self, point_list, color, line_width=1):
+        # Arcade draws one triangle strip: every edge's quad, its start corners
+        # swapped, back to back and closed on the first corner, so the joins are
+        # covered by the strip's linking triangles. Unrolled here in the same order.
+        data, rgba = self.target(color)
+        closed = list(point_list) + [point_list[0]]
+        strip = []
+        for (start_x, start_y), (end_x, end_y) in zip(closed, closed[1:]):
+            points = arcade.get_points_for_thick_line(start_x, start_y, end_x, end_y, line_width)
+            strip.extend((points[1] + rgba, points[0] + rgba, points[2] + rgba, points[3] + rgba))
+        strip.append(strip[0])
+        for index in range(len(strip) - 2):
+            data.extend(strip[index])
+            data.extend(strip[index + 1])
+            data.extend(strip[index + 2])
+
+    def draw_lrbt_rectangle_filled(self, left, right, bottom, top, color):
+        data, rgba = self.target(color)
+        for x, y in ((left, bottom), (right, bottom), (right, top), (left, bottom), (right, top), (left, top)):
+            data.extend((x, y) + rgba)
+
+    def profiler_lines(self):
+        if not self.enabled:
+            return ["off (F6)"]
+        shapes, flushes, vertices, flush_time = self.last_frame
+        return [f"{shapes} shapes in {flushes} draws, {vertices} vertices, flush {flush_time * 1000:.2f}ms (F6 toggles)"]
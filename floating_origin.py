@@ -0,0 +1,49 @@
+ORIGIN_CELL_SIZE = 1024  # The render origin snaps to multiples of this (world units)
+REBASE_DISTANCE = 1024   # Rebase once the camera is this far from the origin on either axis
+
+
+class FloatingOrigin:
+    """World point that GPU-resident positions are stored relative to.
+
+    World positions stay Python floats (doubles) everywhere. Anything kept in
+    float32 buffers (sprite lists, particle arrays) stores its position minus
+    the origin, so the values stay small wherever the camera goes. The origin
+    snaps to a grid of cells and only moves once the camera is a full cell
+    away, then calls each listener with the new origin so it can shift its
+    buffers in one pass.
+    """
+
+    def __init__(self, cell_size=ORIGIN_CELL_SIZE, rebase_distance=REBASE_DISTANCE):
+        self.cell_size = cell_size
+        self.rebase_distance = rebase_distance
+        self.x = 0.0
+        self.y = 0.0
+        self.listeners = []
+        self.rebase_count = 0
+
+    def add_listener(self, rebase):
+        """rebase(origin_x, origin_y) is called after every rebase"""
+        self.listeners.append(rebase)
+
+    def cell(self, x, y):
+        """Cell containing a world point and the point's offset within it"""
+        column = x // self.cell_size
+        row = y // self.cell_size
+        return int(column), int(row), x - column * self.cell_size, y - row * self.cell_size
+
+    def to_local(self, x, y):
+        return x - self.x, y - self.y
+
+    def update(self, x, y):
+        """Rebase around (x, y), normally the camera centre, if it has drifted too far. Returns True on a rebase."""
+        if abs(x - self.x) < self.rebase_distance and abs(y - self.y) < self.rebase_distance:
+            return False
+        self.x = round(x / self.cell_size) * self.cell_size
+        self.y = round(y / self.cell_size) * self.cell_size
+        self.rebase_count += 1
+        for rebase in self.listeners:
+            rebase(self.x, self.y)
+        return True
+
+    def profiler_lines(self):
+        return [f"origin ({self.x:.0f}, {self.y:.0f}), {self.rebase_count} rebases"]
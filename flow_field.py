@@ -0,0 +1,238 @@
+import collections
+import math
+import time
+from array import array
+
+FLOW_CELL_SIZE = 25          # World units per cell
+FLOW_REFRESH_INTERVAL = 0.25  # Seconds between rebuilds toward the target's new position
+FLOW_CELL_BUDGET = 400       # Cells expanded per frame; a rebuild spans several frames
+OBSTACLE_MARGIN = 8          # Clearance added around obstacles, world units
+DIRECT_COST = 4              # Within this path cost of the target ships steer straight at it
+STATS_WINDOW = 1.0
+
+# Chamfer costs approximate euclidean distance on the grid: 2 straight, 3 diagonal
+ORTHOGONAL_COST = 2
+DIAGONAL_COST = 3
+NEIGHBOURS = [(dx, dy, ORTHOGONAL_COST if dx == 0 or dy == 0 else DIAGONAL_COST)
+              for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+NEIGHBOUR_DIRECTIONS = [(dx / math.hypot(dx, dy), dy / math.hypot(dx, dy)) for dx, dy, _ in NEIGHBOURS]
+
+
+class FlowField:
+    """Grid of path costs toward one target, routed around circular obstacles.
+
+    A rebuild is a Dial (bucketed Dijkstra) expansion from the target's cell
+    with chamfer step costs; diagonal steps may not cut the corner of a
+    blocked cell. It is resumable, so each update() only expands
+    FLOW_CELL_BUDGET cells of it, and ships keep sampling the last finished
+    field meanwhile. The budget is a cell count rather than a time so a
+    resimulation rebuilds on exactly the same frames. The
+    grid has a blocked border so the expansion needs no bounds checks.
+    direction() is O(1): the step toward the cheapest of a cell's eight
+    neighbours, also out of a blocked cell a ship has drifted into. Pursuit
+    cost is therefore one rebuild every FLOW_REFRESH_INTERVAL plus a few
+    lookups per ship, however many ships.
+    """
+
+    def __init__(self, width, height, cell_size=FLOW_CELL_SIZE, budget=FLOW_CELL_BUDGET):
+        self.cell_size = cell_size
+        self.columns = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.stride = self.columns + 2  # Row length including the border
+        # (cell offset, step cost, offsets of the two straight cells a diagonal step passes between)
+        self.offsets = [(dy * self.stride + dx, step, dx if dx and dy else 0, dy * self.stride if dx and dy else 0)
+                        for dx, dy, step in NEIGHBOURS]
+        self.budget = budget
+        self.cell_count = self.stride * (self.rows + 2)
+        self.blocked = self.empty_grid()
+        self.costs = array("i", [-1]) * self.cell_count  # Finished field; -1 is blocked or unreachable
+        self.obstacles = []
+        self.obstacles_changed = False
+        self.refresh_timer = FLOW_REFRESH_INTERVAL  # Start a build on the first update
+        self.field_target = -1  # Cell the finished costs lead to, -1 before the first build
+        self.replay = False     # Rebuild the restored schedule at the next update
+
+        # Build in progress
+        self.building = None
+        self.build_target = -1  # -1 when no build is in progress
+        self.build_steps = 0    # Cells expanded so far
+        self.buckets = None  # cost -> [cells]
+        self.cost = 0
+        self.build_start_time = 0.0
+        self.build_work = 0.0
+        self.build_frames = 0
+
+        self.built = (-1, -1, 0)  # (field_target, build_target, build_steps) the arrays hold
+        self.last_build = (0.0, 0, 0)  # (work seconds, frames, cells reached)
+        self.builds = collections.deque()  # Finish times, for the rebuild rate
+
+    def cell(self, x, y):
+        column = min(max(int(x // self.cell_size), 0), self.columns - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return (row + 1) * self.stride + column + 1
+
+    def empty_grid(self):
+        """Blocked flags with only the border set"""
+        blocked = bytearray(self.cell_count)
+        blocked[:self.stride] = b"\x01" * self.stride
+        blocked[-self.stride:] = b"\x01" * self.stride
+        for row in range(self.rows + 2):
+            blocked[row * self.stride] = 1
+            blocked[row * self.stride + self.stride - 1] = 1
+        return blocked
+
+    def set_obstacles(self, obstacles):
+        """Circles (x, y, radius) to route around; takes effect at the next rebuild"""
+        if obstacles != self.obstacles:
+            self.obstacles = list(obstacles)
+            self.obstacles_changed = True
+
+    def rasterize_obstacles(self):
+        blocked = self.empty_grid()
+        size = self.cell_size
+        for x, y, radius in self.obstacles:
+            reach = radius + OBSTACLE_MARGIN
+            first_column = max(0, int((x - reach) // size))
+            last_column = min(self.columns - 1, int((x + reach) // size))
+            first_row = max(0, int((y - reach) // size))
+            last_row = min(self.rows - 1, int((y + reach) // size))
+            for row in range(first_row, last_row + 1):
+                center_y = (row + 0.5) * size
+                for column in range(first_column, last_column + 1):
+                    center_x = (column + 0.5) * size
+                    if (center_x - x) ** 2 + (center_y - y) ** 2 <= reach * reach:
+                        blocked[(row + 1) * self.stride + column + 1] = 1
+        self.blocked = blocked
+        self.obstacles_changed = False
+
+    def update(self, delta_time, target_x, target_y):
+        """Advance the rebuild in progress, or start one toward the target when it is due"""
+        if self.replay:
+            self.rebuild()
+        self.refresh_timer += delta_time
+        if self.building is None:
+            if self.refresh_timer < FLOW_REFRESH_INTERVAL:
+                return
+            self.refresh_timer = 0.0
+            self.start(target_x, target_y)
+        self.expand(self.budget)
+
+    def start(self, target_x, target_y):
+        self.begin(self.cell(target_x, target_y))
+
+    def begin(self, target):
+        start = time.perf_counter()
+        if self.obstacles_changed:
+            self.rasterize_obstacles()
+        self.build_target = target
+        self.build_steps = 0
+        self.built = (self.field_target, target, 0)
+        self.building = array("i", [-1]) * self.cell_count
+        self.building[target] = 0
+        self.buckets = {0: [target]}
+        self.cost = 0
+        self.build_start_time = start
+        self.build_work = time.perf_counter() - start
+        self.build_frames = 0
+
+    def expand(self, limit=None):
+        """Expand up to limit cells of the build in progress, or all of it"""
+        start = time.perf_counter()
+        costs = self.building
+        blocked = self.blocked
+        buckets = self.buckets
+        offsets = self.offsets
+        steps = 0
+        while buckets:
+            bucket = buckets.get(self.cost)
+            if not bucket:
+                buckets.pop(self.cost, None)
+                self.cost += 1
+                continue
+            cell = bucket.pop()
+            cost = self.cost
+            if costs[cell] != cost:
+                continue  # Reached more cheaply after it was queued
+            for offset, step, side_x, side_y in offsets:
+                neighbour = cell + offset
+                if blocked[neighbour]:
+                    continue
+                if side_x and (blocked[cell + side_x] or blocked[cell + side_y]):
+                    continue  # No cutting corners past an obstacle
+                next_cost = cost + step
+                old = costs[neighbour]
+                if old < 0 or next_cost < old:
+                    costs[neighbour] = next_cost
+                    buckets.setdefault(next_cost, []).append(neighbour)
+            steps += 1
+            if steps == limit:
+                break
+        self.build_steps += steps
+        self.build_work += time.perf_counter() - start
+        self.build_frames += 1
+        if not buckets:
+            self.costs = costs
+            self.field_target = self.build_target
+            self.building = None
+            self.buckets = None
+            self.build_target = -1
+            self.build_steps = 0
+            now = time.perf_counter()
+            reached = sum(1 for cost in costs if cost >= 0)
+            self.last_build = (self.build_work, self.build_frames, reached)
+            self.builds.append(now)
+            while self.builds[0] < now - STATS_WINDOW:
+                self.builds.popleft()
+        self.built = (self.field_target, self.build_target, self.build_steps)
+
+    def restored(self):
+        """After a snapshot wrote refresh_timer, field_target, build_target and build_steps back.
+
+        Snapshots hold the schedule rather than the cost grid, so if it
+        differs from what the arrays hold the next update() rebuilds it:
+        the finished field in full, then the same number of cells of the
+        build in progress. Both use the obstacles the restored world sets,
+        so the replay is exact unless they changed while those builds ran.
+        """
+        if (self.field_target, self.build_target, self.build_steps) != self.built:
+            self.replay = True
+            self.obstacles_changed = True
+
+    def rebuild(self):
+        self.replay = False
+        build_target, build_steps = self.build_target, self.build_steps
+        self.building = None
+        self.buckets = None
+        self.costs = array("i", [-1]) * self.cell_count
+        if self.field_target >= 0:
+            self.begin(self.field_target)
+            self.expand()
+        self.build_target = -1
+        self.build_steps = 0
+        if build_target >= 0:
+            self.begin(build_target)
+            if build_steps:
+                self.expand(build_steps)
+
+    def direction(self, x, y):
+        """Unit step toward the target from (x, y), or None near the target or off the field"""
+        costs = self.costs
+        cell = self.cell(x, y)
+        best = costs[cell]
+        if 0 <= best <= DIRECT_COST:
+            return None
+        if best < 0:
+            best = 1 << 30  # Blocked or cut off: head for any reachable neighbour
+        best_index = None
+        for index, (offset, _, _, _) in enumerate(self.offsets):
+            cost = costs[cell + offset]
+            if 0 <= cost < best:
+                best = cost
+                best_index = index
+        return None if best_index is None else NEIGHBOUR_DIRECTIONS[best_index]
+
+    def profiler_lines(self):
+        work, frames, reached = self.last_build
+        blocked = sum(self.blocked) - 2 * (self.stride + self.rows)  # Not counting the border
+        return [f"{self.columns}x{self.rows} cells of {self.cell_size}, {blocked} blocked by {len(self.obstacles)} obstacles",
+                f"{len(self.builds)} builds/s, last {work * 1000:.1f}ms over {frames} frames, {reached} cells reached"]
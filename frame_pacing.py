@@ -0,0 +1,170 @@
+import collections
+import os
+import pyglet
+import time
+from arcade.clock import GLOBAL_CLOCK
+
+# Choose with LITTLESPACE_PACING=vsync|capped|uncapped (F5 cycles while running).
+# LITTLESPACE_BENCHMARK=<seconds> runs uncapped, prints frame statistics and exits.
+PACING_ENV_VAR = "LITTLESPACE_PACING"
+BENCHMARK_ENV_VAR = "LITTLESPACE_BENCHMARK"
+PACING_MODES = ("vsync", "capped", "uncapped")
+DEFAULT_PACING_MODE = "capped"
+
+TARGET_FPS = 60              # Draw rate in capped mode
+UPDATE_RATE = 1 / 60         # Fixed simulation step, independent of the draw rate
+MAX_UPDATES_PER_FRAME = 4    # After a long stall drop the backlog instead of spiralling
+SPIN_TIME = 0.002            # Sleep until this close to the deadline, then spin (sleep overshoots)
+STATS_WINDOW = 1.0           # Seconds of frames averaged for the profiler panel
+BENCHMARK_WARMUP = 1.0       # Seconds ignored at the start of a benchmark (shader compiles, world build)
+
+
+class FramePacer:
+    """Main loop that decouples the update rate from the draw rate.
+
+    on_update runs in fixed UPDATE_RATE steps, as many as the elapsed time
+    needs; on_draw runs once per loop iteration, paced by the mode:
+      vsync     the buffer swap waits for the display
+      capped    sleep then spin until the next TARGET_FPS deadline
+      uncapped  draw again immediately (measures real throughput)
+    Idle time is the part of each frame spent waiting rather than working.
+    Functions in idle_tasks are called with the frame deadline before the
+    wait, to use spare time (in vsync and uncapped modes the deadline has
+    already passed, so they only do work that cannot be put off).
+    """
+
+    def __init__(self, window, mode=None, target_fps=TARGET_FPS, update_rate=UPDATE_RATE):
+        self.window = window
+        self.target_fps = target_fps
+        self.update_rate = update_rate
+
+        benchmark = os.environ.get(BENCHMARK_ENV_VAR, "")
+        self.benchmark_seconds = float(benchmark) if benchmark else None
+        self.benchmark_frame_times = []
+
+        if mode is None:
+            mode = os.environ.get(PACING_ENV_VAR, DEFAULT_PACING_MODE)
+        if self.benchmark_seconds:
+            mode = "uncapped"
+        if mode not in PACING_MODES:
+            print(f"[pacing] unknown mode {mode!r}, using {DEFAULT_PACING_MODE}")
+            mode = DEFAULT_PACING_MODE
+        self.mode = None
+        self.set_mode(mode)
+
+        # (frame end, frame time, work time, idle time, updates) for the last STATS_WINDOW
+        self.frames = collections.deque()
+        self.fps = 0.0
+        self.idle_tasks = []
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.window.set_vsync(mode == "vsync")
+
+    def cycle_mode(self):
+        self.set_mode(PACING_MODES[(PACING_MODES.index(self.mode) + 1) % len(PACING_MODES)])
+
+    def wait_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > SPIN_TIME:
+            time.sleep(remaining - SPIN_TIME)
+        while time.perf_counter() < deadline:
+            pass
+
+    def run(self):
+        """Blocking main loop; use instead of arcade.run()"""
+        window = self.window
+
+        # This loop replaces arcade's clock-scheduled update/draw dispatch. Like
+        # pyglet's own event loop, dispatch events directly instead of queueing them.
+        pyglet.clock.unschedule(window._dispatch_frame)
+        window.dispatch_pending_events()
+        window._enable_event_queue = False
+
+        start_time = last_time = next_frame = time.perf_counter()
+        accumulated = 0.0
+        while not (window.has_exit or window.closed):
+            frame_start = time.perf_counter()
+            if not window.headless:
+                window.dispatch_events()
+            pyglet.clock.tick()
+            if window.has_exit or window.closed:
+                break
+
+            now = time.perf_counter()
+            accumulated += now - last_time
+            last_time = now
+            updates = 0
+            while accumulated >= self.update_rate:
+                if updates == MAX_UPDATES_PER_FRAME:
+                    accumulated = 0.0
+                    break
+                # Advance arcade's clock as its own loop does, one fixed step per update
+                GLOBAL_CLOCK.tick(self.update_rate)
+                window.dispatch_event("on_update", self.update_rate)
+                accumulated -= self.update_rate
+                updates += 1
+            if window.closed:
+                break
+
+            window.switch_to()
+            window.dispatch_event("on_draw")
+            work_end = time.perf_counter()
+            window.flip()
+            flip_end = time.perf_counter()
+
+            if self.mode == "capped":
+                # Hold a steady cadence; after falling behind, restart from now rather than catching up
+                next_frame = max(next_frame + 1 / self.target_fps, flip_end)
+                deadline = next_frame
+            else:
+                deadline = flip_end
+            for task in self.idle_tasks:
+                task(deadline)
+            if self.mode == "capped":
+                self.wait_until(next_frame)
+            frame_end = time.perf_counter()
+
+            if self.mode == "vsync":
+                # The swap blocks until the display is ready
+                work_time = work_end - frame_start
+            else:
+                work_time = flip_end - frame_start
+            self.record(frame_end, frame_end - frame_start, work_time, updates)
+
+            if self.benchmark_seconds and frame_start - start_time >= BENCHMARK_WARMUP:
+                self.benchmark_frame_times.append(frame_end - frame_start)
+                if frame_end - start_time >= BENCHMARK_WARMUP + self.benchmark_seconds:
+                    print(self.benchmark_summary())
+                    break
+
+        if not window.closed:
+            window.close()
+
+    def record(self, frame_end, frame_time, work_time, updates):
+        frames = self.frames
+        frames.append((frame_end, frame_time, work_time, frame_time - work_time, updates))
+        while frames[0][0] < frame_end - STATS_WINDOW:
+            frames.popleft()
+        span = frame_end - frames[0][0] + frames[0][1]
+        self.fps = len(frames) / span if span > 0 else 0.0
+
+    def benchmark_summary(self):
+        times = sorted(self.benchmark_frame_times)
+        count = len(times)
+        total = sum(times)
+        return (f"[pacing] benchmark: {count} frames in {total:.2f}s, {count / total:.1f} fps, "
+                f"frame avg {total / count * 1000:.2f}ms, p50 {times[count // 2] * 1000:.2f}ms, "
+                f"p99 {times[min(count - 1, int(count * 0.99))] * 1000:.2f}ms, max {times[-1] * 1000:.2f}ms")
+
+    def profiler_lines(self):
+        if not self.frames:
+            return [f"mode: {self.mode}"]
+        count = len(self.frames)
+        work = sum(frame[2] for frame in self.frames) / count
+        idle = sum(frame[3] for frame in self.frames) / count
+        updates = sum(frame[4] for frame in self.frames)
+        return [
+            f"mode: {self.mode}, {self.fps:.1f} fps, {updates} updates in {STATS_WINDOW:.0f}s",
+            f"work {work * 1000:.2f}ms, idle {idle * 1000:.2f}ms ({idle / (work + idle) * 100:.0f}%) per frame"
+        ]
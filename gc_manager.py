@@ -0,0 +1,74 @@
+import collections
+import gc
+import time
+
+IDLE_MIN_TIME = 0.001     # Only collect when at least this much of the frame is left
+YOUNG_MIN_COUNT = 700     # Skip idle collections until this many net allocations (Python's gen0 threshold)
+FORCE_COUNT = 20000       # Collect even without idle time past this, to bound memory
+OLDER_EVERY = 10          # Like Python: collect an older generation every 10 of the younger
+STATS_WINDOW = 5.0        # Seconds of pauses summarised in the profiler
+
+
+class GCManager:
+    """Keeps cyclic garbage collection out of the middle of frames.
+
+    freeze() moves everything alive (the world, stars, stations) into the
+    permanent generation so collections never scan it again, and turns off
+    automatic collection. idle(deadline) is then called once a frame with the
+    time the frame has to spare: it runs a young collection when there is
+    garbage and time, an older generation at Python's usual ratio, and a
+    forced collection when too much has built up without idle time. Every
+    collection, scheduled or not, is timed through gc.callbacks.
+    """
+
+    def __init__(self):
+        self.managed = False
+        self.collection_start = 0.0
+        self.pauses = collections.deque()  # (end time, duration, generation)
+        self.forced = 0
+        gc.callbacks.append(self.on_collection)
+
+    def freeze(self):
+        """Call after loading: collect once, then exempt everything alive from future collections"""
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self.managed = True
+
+    def on_collection(self, phase, info):
+        now = time.perf_counter()
+        if phase == "start":
+            self.collection_start = now
+            return
+        self.pauses.append((now, now - self.collection_start, info["generation"]))
+        while self.pauses[0][0] < now - STATS_WINDOW:
+            self.pauses.popleft()
+
+    def idle(self, deadline):
+        """Collect if it is due and fits before deadline (a perf_counter time)"""
+        if not self.managed:
+            return
+        young, young_collections, middle_collections = gc.get_count()
+        if young < YOUNG_MIN_COUNT:
+            return
+        if deadline - time.perf_counter() < IDLE_MIN_TIME:
+            if young < FORCE_COUNT:
+                return
+            self.forced += 1
+
+        if middle_collections >= OLDER_EVERY:
+            gc.collect(2)
+        elif young_collections >= OLDER_EVERY:
+            gc.collect(1)
+        else:
+            gc.collect(0)
+
+    def profiler_lines(self):
+        mode = "scheduled" if self.managed else "automatic"
+        lines = [f"{mode}, {gc.get_freeze_count()} frozen objects, {self.forced} forced"]
+        for generation in range(3):
+            pauses = [pause[1] for pause in self.pauses if pause[2] == generation]
+            if pauses:
+                lines.append(f"gen{generation}: {len(pauses)} in {STATS_WINDOW:.0f}s, "
+                             f"avg {sum(pauses) / len(pauses) * 1000:.2f}ms, max {max(pauses) * 1000:.2f}ms")
+        return lines
@@ -0,0 +1,179 @@
+import math
+import time
+
+try:
+    import numpy
+except ImportError:  # Optional: without numpy every body walks the tree in Python
+    numpy = None
+
+GRAVITY_CONSTANT = 160.0  # Tuned so a size-30 planet pulls ~40 units/s^2 at twice its radius
+DEFAULT_THETA = 0.5       # Opening angle: larger is faster and less accurate, 0 is an exact sum
+SOFTENING = 6.0           # Plummer softening (world units), keeps the pull finite near a centre
+MAX_TREE_DEPTH = 16       # Bodies closer than world size / 2^16 share a leaf
+
+
+class QuadNode:
+    __slots__ = ("center_x", "center_y", "half_size", "mass", "com_x", "com_y", "children")
+
+    def __init__(self, center_x, center_y, half_size):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.half_size = half_size
+        self.mass = 0.0
+        self.com_x = 0.0  # Centre of mass
+        self.com_y = 0.0
+        self.children = None  # None for a leaf
+
+
+class BarnesHutTree:
+    """Quadtree over the attracting bodies for O(n log m) gravity on n free bodies.
+
+    Free bodies (the player, debris, bullets) are test particles: they feel
+    the attractors but do not pull on anything, so only the attractors go in
+    the tree. A node whose size s seen from distance d satisfies s / d < theta
+    is treated as a single mass at its centre of mass.
+    """
+
+    def __init__(self, xs, ys, masses, theta=DEFAULT_THETA,
+                 gravity_constant=GRAVITY_CONSTANT, softening=SOFTENING):
+        self.theta = theta
+        self.gravity_constant = gravity_constant
+        self.softening = softening
+        self.node_count = 0
+        self.root = None
+        if xs:
+            left, right = min(xs), max(xs)
+            bottom, top = min(ys), max(ys)
+            half_size = max(right - left, top - bottom, 1.0) / 2
+            self.root = self.build(list(zip(xs, ys, masses)), (left + right) / 2, (bottom + top) / 2, half_size, 0)
+
+    def build(self, bodies, center_x, center_y, half_size, depth):
+        node = QuadNode(center_x, center_y, half_size)
+        self.node_count += 1
+
+        mass = sum(m for _, _, m in bodies)
+        node.mass = mass
+        if mass > 0:
+            node.com_x = sum(x * m for x, _, m in bodies) / mass
+            node.com_y = sum(y * m for _, y, m in bodies) / mass
+        if len(bodies) == 1 or depth >= MAX_TREE_DEPTH:
+            return node
+
+        quadrants = ([], [], [], [])
+        for body in bodies:
+            quadrants[(body[0] >= center_x) + 2 * (body[1] >= center_y)].append(body)
+
+        quarter = half_size / 2
+        node.children = []
+        for index, quadrant in enumerate(quadrants):
+            if quadrant:
+                child_x = center_x + (quarter if index & 1 else -quarter)
+                child_y = center_y + (quarter if index & 2 else -quarter)
+                node.children.append(self.build(quadrant, child_x, child_y, quarter, depth + 1))
+        return node
+
+    def acceleration(self, x, y):
+        """Acceleration (ax, ay) at one point"""
+        if self.root is None:
+            return 0.0, 0.0
+        theta_squared = self.theta * self.theta
+        softening_squared = self.softening * self.softening
+        ax = ay = 0.0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            dx = node.com_x - x
+            dy = node.com_y - y
+            distance_squared = dx * dx + dy * dy
+            size = node.half_size * 2
+            if node.children is None or size * size < theta_squared * distance_squared:
+                distance_squared += softening_squared
+                strength = node.mass / (distance_squared * math.sqrt(distance_squared))
+                ax += strength * dx
+                ay += strength * dy
+            else:
+                stack.extend(node.children)
+        return ax * self.gravity_constant, ay * self.gravity_constant
+
+    def accelerations(self, xs, ys):
+        """Accelerations for many points. Returns (ax, ay) arrays with numpy, lists without."""
+        if numpy is None:
+            ax = []
+            ay = []
+            for x, y in zip(xs, ys):
+                body_ax, body_ay = self.acceleration(x, y)
+                ax.append(body_ax)
+                ay.append(body_ay)
+            return ax, ay
+
+        xs = numpy.asarray(xs, dtype=numpy.float64)
+        ys = numpy.asarray(ys, dtype=numpy.float64)
+        ax = numpy.zeros_like(xs)
+        ay = numpy.zeros_like(ys)
+        if self.root is None or not len(xs):
+            return ax, ay
+
+        # Walk the tree once for all bodies: each node sees the bodies that reached it,
+        # accepts the ones far enough away and passes the rest down to its children
+        theta_squared = self.theta * self.theta
+        softening_squared = self.softening * self.softening
+        stack = [(self.root, numpy.arange(len(xs)))]
+        while stack:
+            node, indices = stack.pop()
+            dx = node.com_x - xs[indices]
+            dy = node.com_y - ys[indices]
+            distance_squared = dx * dx + dy * dy
+            if node.children is not None:
+                size = node.half_size * 2
+                far = size * size < theta_squared * distance_squared
+                near = indices[~far]
+                if len(near):
+                    for child in node.children:
+                        stack.append((child, near))
+                indices = indices[far]
+                dx = dx[far]
+                dy = dy[far]
+                distance_squared = distance_squared[far]
+                if not len(indices):
+                    continue
+            distance_squared += softening_squared
+            strength = node.mass / (distance_squared * numpy.sqrt(distance_squared))
+            ax[indices] += strength * dx
+            ay[indices] += strength * dy
+        ax *= self.gravity_constant
+        ay *= self.gravity_constant
+        return ax, ay
+
+
+class GravitySimulation:
+    """Rebuilds the attractor tree each step and reports timings for the profiler"""
+
+    def __init__(self, theta=DEFAULT_THETA):
+        self.theta = theta
+        self.enabled = False
+        self.tree = None
+        self.attractor_count = 0
+        self.body_count = 0
+        self.step_time = 0.0
+
+    def step(self, attractors, xs, ys):
+        """attractors is a list of (x, y, mass); returns (ax, ay) lists for the points in xs, ys"""
+        start = time.perf_counter()
+        self.tree = BarnesHutTree([a[0] for a in attractors], [a[1] for a in attractors],
+                                  [a[2] for a in attractors], self.theta)
+        ax, ay = self.tree.accelerations(xs, ys)
+        if numpy is not None:
+            ax, ay = ax.tolist(), ay.tolist()
+        self.attractor_count = len(attractors)
+        self.body_count = len(xs)
+        self.step_time = time.perf_counter() - start
+        return ax, ay
+
+    def profiler_lines(self):
+        if not self.enabled:
+            return ["off (G to enable)"]
+        nodes = self.tree.node_count if self.tree else 0
+        return [
+            f"{self.attractor_count} attractors ({nodes} nodes), {self.body_count} bodies, theta {self.theta}",
+            f"step {self.step_time * 1000:.2f}ms{'' if numpy is not None else ' (no numpy)'}"
+        ]
@@ -0,0 +1,110 @@
+import arcade
+import time
+from arcade.types import LBWH, LRBT
+
+from render_target import TextureBlitter
+
+RADAR_SIZE = 96           # Texels per side, shown at twice that in the window
+RADAR_RANGE = 400         # World units from the centre to the edge of the scope
+RADAR_REFRESH_RATE = 10   # Redraws per second; in between the texture is reused
+RADAR_BACKGROUND = (0, 24, 12, 255)
+RADAR_RING_COLOR = (40, 140, 80)
+RADAR_CENTER_COLOR = (255, 255, 255)
+
+
+class Radar:
+    """Top-down view of the contacts around a point, redrawn into a small texture at a reduced rate.
+
+    query(x, y, radius) returns the objects near the centre, typically a
+    spatial index radius query, and blip(obj) returns (color, size in texels)
+    for each, or None to leave it off. Between refreshes draw() only blits the
+    texture, so the radar costs a single quad on most frames.
+    """
+
+    def __init__(self, window, query, blip, size=RADAR_SIZE, radius=RADAR_RANGE,
+                 refresh_rate=RADAR_REFRESH_RATE):
+        self.window = window
+        self.query = query
+        self.blip = blip
+        self.size = size
+        self.radius = radius
+        self.refresh_rate = refresh_rate
+
+        ctx = window.ctx
+        self.texture = ctx.texture((size, size), components=4, filter=(ctx.NEAREST, ctx.NEAREST))
+        self.framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+        self.blitter = TextureBlitter(ctx)
+
+        # Centred on the origin; blips are drawn relative to the radar centre
+        half = size / 2
+        self.camera = arcade.Camera2D(
+            viewport=LBWH(0, 0, size, size),
+            projection=LRBT(-half, half, -half, half),
+            position=(0, 0),
+            render_target=self.framebuffer
+        )
+
+        self.center_x = 0.0
+        self.center_y = 0.0
+        self.timer = 0.0
+        self.stale = True  # Redraw on the next draw()
+        self.contact_count = 0
+        self.refresh_count = 0
+        self.refresh_time = 0.0  # Last refresh
+
+    def update(self, delta_time, x, y):
+        """Follow (x, y) and schedule a redraw when the refresh interval has passed"""
+        self.center_x = x
+        self.center_y = y
+        self.timer += delta_time
+        if self.timer >= 1 / self.refresh_rate:
+            self.timer = 0.0
+            self.stale = True
+
+    def refresh(self):
+        start = time.perf_counter()
+        scale = self.size / 2 / self.radius
+
+        # Blips grouped by appearance so each group is a single draw
+        groups = {}
+        contacts = self.query(self.center_x, self.center_y, self.radius)
+        for obj in contacts:
+            blip = self.blip(obj)
+            if blip is not None:
+                groups.setdefault(blip, []).append(((obj.x - self.center_x) * scale,
+                                                    (obj.y - self.center_y) * scale))
+
+        self.camera.use()
+        self.framebuffer.clear(color=RADAR_BACKGROUND)
+        arcade.draw_circle_outline(0, 0, self.size / 2 - 1, RADAR_RING_COLOR)
+        arcade.draw_circle_outline(0, 0, self.size / 4, RADAR_RING_COLOR)
+        for (color, blip_size), points in groups.items():
+            arcade.draw_points(points, color, blip_size)
+        arcade.draw_point(0, 0, RADAR_CENTER_COLOR, 2)
+
+        self.contact_count = len(contacts)
+        self.refresh_count += 1
+        self.refresh_time = time.perf_counter() - start
+
+    def draw(self, left, bottom, width):
+        """Show the radar in a square window rect (window coordinates).
+
+        A due refresh renders into the radar texture first, which rebinds the
+        framebuffer and camera, so the caller must re-apply its camera afterwards.
+        """
+        ctx = self.window.ctx
+        target = ctx.active_framebuffer
+        viewport = ctx.viewport
+        if self.stale:
+            self.stale = False
+            self.refresh()
+
+        target.use()
+        ratio = self.window.get_pixel_ratio()
+        self.blitter.draw(self.texture, (round(left * ratio), round(bottom * ratio),
+                                         round(width * ratio), round(width * ratio)))
+        ctx.viewport = viewport
+
+    def profiler_lines(self):
+        return [f"{self.contact_count} contacts within {self.radius}, {self.refresh_rate}Hz, "
+                f"refresh {self.refresh_time * 1000:.2f}ms ({self.refresh_count} total)"]
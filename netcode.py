@@ -0,0 +1,263 @@
+import collections
+import os
+import socket
+import struct
+import time
+
+# Wire format shared by sim_server.py and its clients. Everything is little
+# endian and travels as UDP datagrams on localhost (or a LAN).
+DEFAULT_SERVER_PORT = 47800
+SERVER_ENV_VAR = "LITTLESPACE_SERVER"       # host:port makes a game join a server
+SERVER_ROLE_ENV_VAR = "LITTLESPACE_SERVER_ROLE"  # play (default) or watch
+MAX_DATAGRAM = 1400     # Snapshots are cut to this so they fit one packet without fragmenting
+SNAPSHOT_HISTORY = 64   # Ticks of sent (server) or received (client) states kept as delta baselines
+HELLO_RETRY = 0.5       # Seconds between join attempts until the server answers
+STATS_WINDOW = 1.0      # Seconds averaged for the profiler panel
+
+# Message types (first byte)
+MSG_HELLO = 1      # client -> server: role
+MSG_WELCOME = 2    # server -> client: client id, id of the client's ship (0 when watching)
+MSG_INPUT = 3      # client -> server: acked tick, input bits, view rect
+MSG_SNAPSHOT = 4   # server -> client: tick, baseline tick, removed ids, changed entities
+MSG_BYE = 5        # client -> server
+
+ROLE_WATCH = 0
+ROLE_PLAY = 1
+
+# Input bits
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_THRUST = 4
+INPUT_REVERSE = 8
+INPUT_FIRE = 16
+
+# Entity kinds
+KIND_PLAYER = 1
+KIND_ENEMY_SHIP = 2
+KIND_BULLET = 3
+KIND_ENEMY_BULLET = 4
+
+# Entity flags
+FLAG_THRUST = 1
+FLAG_REVERSE = 2
+
+# An entity's state is the tuple (kind, x, y, angle, flags) in wire units.
+# Only fields that differ from the baseline are sent, marked in a bit mask.
+POSITION_SCALE = 16           # Positions in 1/16 world units, +-2048 fits an int16
+ANGLE_SCALE = 65536 / 360     # Angles in 1/65536 turns
+FIELD_FORMATS = ("B", "h", "h", "H", "B")
+FIELD_SIZES = tuple(struct.calcsize("<" + f) for f in FIELD_FORMATS)
+
+HELLO = struct.Struct("<BB")
+WELCOME = struct.Struct("<BHI")
+INPUT = struct.Struct("<BIBffff")
+SNAPSHOT_HEADER = struct.Struct("<BIIHH")   # type, tick, baseline tick (0 = none), removed, changed
+ENTITY_ID = struct.Struct("<I")
+ENTITY_HEADER = struct.Struct("<IB")        # id, field mask
+
+
+def parse_address(text):
+    """'host:port' or 'host' -> (host, port)"""
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    return host or "127.0.0.1", int(port) if port else DEFAULT_SERVER_PORT
+
+
+def client_from_env():
+    """SimClient for LITTLESPACE_SERVER, or None when the game simulates locally"""
+    address = os.environ.get(SERVER_ENV_VAR, "")
+    if not address:
+        return None
+    role = ROLE_WATCH if os.environ.get(SERVER_ROLE_ENV_VAR, "play") == "watch" else ROLE_PLAY
+    return SimClient(parse_address(address), role)
+
+
+def quantize(kind, x, y, angle, flags):
+    """Entity state in wire units; states are compared after quantizing, so jitter below it is not sent"""
+    return (kind,
+            max(-32768, min(32767, int(round(x * POSITION_SCALE)))),
+            max(-32768, min(32767, int(round(y * POSITION_SCALE)))),
+            int(round(angle % 360 * ANGLE_SCALE)) & 0xFFFF,
+            flags)
+
+
+def dequantize(state):
+    """(kind, x, y, angle, flags) in world units"""
+    kind, x, y, angle, flags = state
+    return kind, x / POSITION_SCALE, y / POSITION_SCALE, angle / ANGLE_SCALE, flags
+
+
+def encode_snapshot(tick, baseline_tick, baseline, current, first_ids=()):
+    """Delta of current against baseline ({id: state}) as one datagram.
+
+    Returns (datagram, sent) where sent is the state the client will hold
+    after applying it: entities that did not fit in MAX_DATAGRAM keep their
+    baseline state there and are sent again next tick. Ids in first_ids
+    (the client's own ship) go first.
+    """
+    removed = [entity_id for entity_id in baseline if entity_id not in current]
+    sent = dict(baseline)
+    body = bytearray()
+    budget = MAX_DATAGRAM - SNAPSHOT_HEADER.size
+
+    removed = removed[:budget // ENTITY_ID.size]
+    for entity_id in removed:
+        body += ENTITY_ID.pack(entity_id)
+        del sent[entity_id]
+    budget -= len(body)
+
+    changed = 0
+    order = [entity_id for entity_id in first_ids if entity_id in current]
+    order += [entity_id for entity_id in current if entity_id not in first_ids]
+    for entity_id in order:
+        state = current[entity_id]
+        old = baseline.get(entity_id)
+        if old == state:
+            continue
+        mask = 0
+        size = ENTITY_HEADER.size
+        fields = []
+        for index, value in enumerate(state):
+            if old is None or old[index] != value:
+                mask |= 1 << index
+                size += FIELD_SIZES[index]
+                fields.append(value)
+        if size > budget:
+            continue  # Smaller records later in the list may still fit
+        format_string = "<" + "".join(FIELD_FORMATS[index] for index in range(5) if mask & (1 << index))
+        body += ENTITY_HEADER.pack(entity_id, mask)
+        body += struct.pack(format_string, *fields)
+        budget -= size
+        sent[entity_id] = state
+        changed += 1
+
+    header = SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, tick, baseline_tick, len(removed), changed)
+    return bytes(header + body), sent
+
+
+def decode_snapshot(data, baseline):
+    """Apply a snapshot datagram to baseline ({id: state}); returns (tick, state)"""
+    _, tick, _, removed, changed = SNAPSHOT_HEADER.unpack_from(data)
+    state = dict(baseline)
+    offset = SNAPSHOT_HEADER.size
+    for _ in range(removed):
+        state.pop(ENTITY_ID.unpack_from(data, offset)[0], None)
+        offset += ENTITY_ID.size
+    for _ in range(changed):
+        entity_id, mask = ENTITY_HEADER.unpack_from(data, offset)
+        offset += ENTITY_HEADER.size
+        values = list(state.get(entity_id, (0, 0, 0, 0, 0)))
+        for index in range(5):
+            if mask & (1 << index):
+                values[index] = struct.unpack_from("<" + FIELD_FORMATS[index], data, offset)[0]
+                offset += FIELD_SIZES[index]
+        state[entity_id] = tuple(values)
+    return tick, state
+
+
+def snapshot_baseline_tick(data):
+    return SNAPSHOT_HEADER.unpack_from(data)[2]
+
+
+class SimClient:
+    """Client side of a sim_server connection.
+
+    join() sends the role; poll() reads every waiting datagram and rebuilds
+    the world state from each snapshot and the baseline it was encoded
+    against. The newest tick is acknowledged with every send_input(), which
+    also reports the client's view rect so the server only sends what is
+    in it. Snapshots whose baseline is no longer held are dropped; the
+    server falls back to a full snapshot once acks stop matching.
+    """
+
+    def __init__(self, address, role=ROLE_PLAY):
+        self.address = address
+        self.role = role
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.client_id = None
+        self.ship_id = 0
+        self.last_hello = 0.0
+
+        self.tick = 0
+        self.state = {}  # id -> (kind, x, y, angle, flags) in wire units, at self.tick
+        self.states = collections.OrderedDict()  # tick -> state, baselines the server may delta against
+
+        self.received = collections.deque()  # (time, bytes, full snapshot)
+        self.dropped = 0
+
+    @property
+    def connected(self):
+        return self.client_id is not None
+
+    def join(self):
+        self.last_hello = time.perf_counter()
+        self.socket.sendto(HELLO.pack(MSG_HELLO, self.role), self.address)
+
+    def close(self):
+        try:
+            self.socket.sendto(bytes([MSG_BYE]), self.address)
+        except OSError:
+            pass
+        self.socket.close()
+
+    def send_input(self, bits, left, bottom, right, top):
+        if not self.connected:
+            if time.perf_counter() - self.last_hello > HELLO_RETRY:
+                self.join()
+            return
+        self.socket.sendto(INPUT.pack(MSG_INPUT, self.tick, bits, left, bottom, right, top), self.address)
+
+    def poll(self):
+        """Read all waiting datagrams; returns True if the state changed"""
+        changed = False
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except (BlockingIOError, ConnectionRefusedError):
+                break
+            if not data:
+                continue
+            if data[0] == MSG_WELCOME:
+                _, self.client_id, self.ship_id = WELCOME.unpack(data)
+            elif data[0] == MSG_SNAPSHOT:
+                changed |= self.apply_snapshot(data)
+        return changed
+
+    def apply_snapshot(self, data):
+        baseline_tick = snapshot_baseline_tick(data)
+        if baseline_tick:
+            baseline = self.states.get(baseline_tick)
+            if baseline is None:
+                self.dropped += 1
+                return False
+        else:
+            baseline = {}
+        tick, state = decode_snapshot(data, baseline)
+        if tick <= self.tick:
+            return False  # Late or duplicated
+        self.tick = tick
+        self.state = state
+        self.states[tick] = state
+        while len(self.states) > SNAPSHOT_HISTORY:
+            self.states.popitem(last=False)
+
+        now = time.perf_counter()
+        self.received.append((now, len(data), not baseline_tick))
+        while self.received[0][0] < now - STATS_WINDOW:
+            self.received.popleft()
+        return True
+
+    def entities(self):
+        """(id, kind, x, y, angle, flags) in world units for the newest state"""
+        for entity_id, state in self.state.items():
+            yield (entity_id,) + dequantize(state)
+
+    def profiler_lines(self):
+        if not self.connected:
+            return [f"joining {self.address[0]}:{self.address[1]}"]
+        count = len(self.received)
+        total = sum(size for _, size, _ in self.received)
+        full = sum(1 for _, _, is_full in self.received if is_full)
+        return [f"client {self.client_id}, tick {self.tick}, {len(self.state)} entities in view",
+                f"{count} snapshots/s ({full} full), {total / 1024:.1f}KB/s, "
+                f"{total / max(count, 1):.0f}B each, {self.dropped} dropped"]
@@ -0,0 +1,183 @@
+import math
+import time
+
+try:
+    import numpy
+except ImportError:  # Optional: without numpy each orbit is evaluated in Python
+    numpy = None
+
+# On-rails orbits are slower than the gravity simulation would make them, so
+# bodies stay readable and the player can keep up with a station
+ORBIT_GRAVITY_CONSTANT = 3.0  # Period of a radius-80 orbit around a size-15 star is about a minute
+KEPLER_ITERATIONS = 4         # Newton steps; converges to float precision for eccentricity < 0.5
+
+
+def orbital_period(semi_major_axis, parent_mass, gravity_constant=ORBIT_GRAVITY_CONSTANT):
+    """Kepler's third law: T = 2 pi sqrt(a^3 / GM)"""
+    return 2 * math.pi * math.sqrt(semi_major_axis ** 3 / (gravity_constant * parent_mass))
+
+
+def solve_kepler(mean_anomaly, eccentricity):
+    """Eccentric anomaly E for M = E - e sin E"""
+    eccentric_anomaly = mean_anomaly + eccentricity * math.sin(mean_anomaly)
+    for _ in range(KEPLER_ITERATIONS):
+        eccentric_anomaly -= ((eccentric_anomaly - eccentricity * math.sin(eccentric_anomaly) - mean_anomaly) /
+                              (1 - eccentricity * math.cos(eccentric_anomaly)))
+    return eccentric_anomaly
+
+
+class Orbit:
+    """Orbital elements of one body around its parent (angles in radians).
+
+    A zero semi-major axis pins the body at a fixed offset from its parent,
+    which is how attachments like solar flares follow a planet.
+    """
+    __slots__ = ("body", "parent", "semi_major_axis", "eccentricity", "periapsis_angle",
+                 "mean_anomaly", "period", "offset_x", "offset_y", "depth")
+
+    def __init__(self, body, parent, semi_major_axis, eccentricity=0.0, periapsis_angle=0.0,
+                 mean_anomaly=0.0, period=1.0, offset_x=0.0, offset_y=0.0):
+        self.body = body
+        self.parent = parent
+        self.semi_major_axis = semi_major_axis
+        self.eccentricity = eccentricity
+        self.periapsis_angle = periapsis_angle
+        self.mean_anomaly = mean_anomaly  # At time 0
+        self.period = period              # Negative for clockwise orbits
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        parent_orbit = getattr(parent, "orbit", None)
+        self.depth = parent_orbit.depth + 1 if parent_orbit else 0
+
+    def position(self, time_now, parent_x, parent_y):
+        """World position at a time, given where the parent is then"""
+        a = self.semi_major_axis
+        if a == 0:
+            return parent_x + self.offset_x, parent_y + self.offset_y
+        e = self.eccentricity
+        eccentric_anomaly = solve_kepler(self.mean_anomaly + 2 * math.pi * time_now / self.period, e)
+        orbit_x = a * (math.cos(eccentric_anomaly) - e)
+        orbit_y = a * math.sqrt(1 - e * e) * math.sin(eccentric_anomaly)
+        cos_w = math.cos(self.periapsis_angle)
+        sin_w = math.sin(self.periapsis_angle)
+        return (parent_x + self.offset_x + orbit_x * cos_w - orbit_y * sin_w,
+                parent_y + self.offset_y + orbit_x * sin_w + orbit_y * cos_w)
+
+
+class OrbitSystem:
+    """Moves bodies along their orbits analytically from the clock time.
+
+    Nothing is integrated, so positions never drift and any time can be
+    evaluated directly. Orbits are evaluated a depth at a time (planets, then
+    their stations, then anything attached to those) so every body sees its
+    parent's position for the same time. With numpy each depth is a handful
+    of array operations however many bodies there are.
+    """
+
+    def __init__(self):
+        self.orbits = []
+        self.levels = None  # Per-depth element arrays, rebuilt after orbits are added
+        self.update_time = 0.0
+
+    def __len__(self):
+        return len(self.orbits)
+
+    def add(self, body, parent, semi_major_axis, eccentricity=0.0, periapsis_angle=0.0,
+            mean_anomaly=0.0, period=None, parent_mass=None, clockwise=False):
+        """Put body on an orbit around parent. The period comes from parent_mass if not given."""
+        if period is None:
+            period = orbital_period(semi_major_axis, parent_mass)
+        orbit = Orbit(body, parent, semi_major_axis, eccentricity, periapsis_angle, mean_anomaly,
+                      -period if clockwise else period)
+        return self.register(orbit)
+
+    def attach(self, body, parent):
+        """Keep body at its current offset from parent"""
+        return self.register(Orbit(body, parent, 0.0, offset_x=body.x - parent.x, offset_y=body.y - parent.y))
+
+    def register(self, orbit):
+        orbit.body.orbit = orbit
+        self.orbits.append(orbit)
+        self.levels = None
+        return orbit
+
+    def build_levels(self):
+        levels = []
+        for orbit in sorted(self.orbits, key=lambda orbit: orbit.depth):
+            if orbit.depth == len(levels):
+                levels.append([])
+            levels[orbit.depth].append(orbit)
+
+        self.levels = []
+        for depth, orbits in enumerate(levels):
+            if depth:
+                # Index of each parent in the previous level's position arrays
+                parent_index = {orbit.body: index for index, orbit in enumerate(levels[depth - 1])}
+                parents = [parent_index[orbit.parent] for orbit in orbits]
+            else:
+                parents = [orbit.parent for orbit in orbits]  # Fixed bodies, read each update
+
+            if numpy is None:
+                self.levels.append((orbits, parents, None))
+                continue
+            e = numpy.array([orbit.eccentricity for orbit in orbits])
+            cos_w = numpy.cos([orbit.periapsis_angle for orbit in orbits])
+            sin_w = numpy.sin([orbit.periapsis_angle for orbit in orbits])
+            a = numpy.array([orbit.semi_major_axis for orbit in orbits])
+            elements = {
+                "mean_anomaly": numpy.array([orbit.mean_anomaly for orbit in orbits]),
+                "mean_motion": numpy.array([2 * math.pi / orbit.period for orbit in orbits]),
+                "eccentricity": e,
+                # Ellipse axes pre-rotated by the argument of periapsis
+                "major_x": a * cos_w, "major_y": a * sin_w,
+                "minor_x": -a * numpy.sqrt(1 - e * e) * sin_w, "minor_y": a * numpy.sqrt(1 - e * e) * cos_w,
+                "offset_x": numpy.array([orbit.offset_x for orbit in orbits]),
+                "offset_y": numpy.array([orbit.offset_y for orbit in orbits]),
+                "parents": parents if not depth else numpy.array(parents, dtype=numpy.intp)
+            }
+            self.levels.append((orbits, parents, elements))
+
+    def update(self, time_now):
+        """Move every body to where it is at time_now. Returns the orbits, parents first."""
+        start = time.perf_counter()
+        if self.levels is None:
+            self.build_levels()
+
+        moved = []
+        xs = ys = None
+        for depth, (orbits, parents, elements) in enumerate(self.levels):
+            if elements is None:
+                for orbit in orbits:
+                    parent = orbit.parent
+                    orbit.body.x, orbit.body.y = orbit.position(time_now, parent.x, parent.y)
+            else:
+                if depth:
+                    parent_x = xs[elements["parents"]]
+                    parent_y = ys[elements["parents"]]
+                else:
+                    parent_x = numpy.array([parent.x for parent in parents])
+                    parent_y = numpy.array([parent.y for parent in parents])
+
+                e = elements["eccentricity"]
+                mean_anomaly = elements["mean_anomaly"] + elements["mean_motion"] * time_now
+                eccentric_anomaly = mean_anomaly + e * numpy.sin(mean_anomaly)
+                for _ in range(KEPLER_ITERATIONS):
+                    eccentric_anomaly -= ((eccentric_anomaly - e * numpy.sin(eccentric_anomaly) - mean_anomaly) /
+                                          (1 - e * numpy.cos(eccentric_anomaly)))
+                cos_e = numpy.cos(eccentric_anomaly) - e
+                sin_e = numpy.sin(eccentric_anomaly)
+                xs = parent_x + elements["offset_x"] + cos_e * elements["major_x"] + sin_e * elements["minor_x"]
+                ys = parent_y + elements["offset_y"] + cos_e * elements["major_y"] + sin_e * elements["minor_y"]
+
+                for orbit, x, y in zip(orbits, xs.tolist(), ys.tolist()):
+                    orbit.body.x = x
+                    orbit.body.y = y
+            moved.extend(orbits)
+
+        self.update_time = time.perf_counter() - start
+        return moved
+
+    def profiler_lines(self):
+        depth = len(self.levels) if self.levels else 0
+        return [f"{len(self.orbits)} orbits, {depth} levels, update {self.update_time * 1000:.2f}ms"
+                f"{'' if numpy is not None else ' (no numpy)'}"]
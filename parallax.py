@@ -0,0 +1,113 @@
+import time
+
+from arcade.gl import geometry
+
+MAX_STAR_LAYERS = 8
+
+# (parallax factor, cell size in pixels, chance of a star per cell, brightness, star size in pixels),
+# farthest first. A factor of 1 scrolls with the world.
+STAR_LAYERS = [
+    (0.05, 32, 0.25, 0.35, 1),
+    (0.15, 40, 0.25, 0.5, 1),
+    (0.4, 56, 0.3, 0.7, 1),
+    (1.0, 80, 0.35, 1.0, 2),
+]
+
+# Every pixel checks the one cell it falls in on each layer. A cell holds at
+# most one star, placed by a hash of (layer, cell column, cell row) and kept
+# clear of the cell edges, so no neighbouring cells need checking.
+STARFIELD_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+}
+"""
+STARFIELD_FRAGMENT_SHADER = """
+#version 330
+uniform vec2 origin;  // Viewport corner in framebuffer pixels
+uniform float density;
+uniform int layer_count;
+uniform vec2 scroll[MAX_LAYERS];  // Layer offset in pixels
+uniform vec4 layers[MAX_LAYERS];  // Cell size, star chance, brightness, star size
+out vec4 fragColor;
+
+uint hash(uint x) {
+    x ^= x >> 16;
+    x *= 0x7feb352du;
+    x ^= x >> 15;
+    x *= 0x846ca68bu;
+    x ^= x >> 16;
+    return x;
+}
+
+void main() {
+    vec2 pixel = gl_FragCoord.xy - origin;
+    float light = 0.0;
+    for (int i = 0; i < layer_count; i++) {
+        vec4 layer = layers[i];
+        vec2 p = pixel + scroll[i];
+        ivec2 cell = ivec2(floor(p / layer.x));
+        uint h = hash(uint(cell.x) ^ hash(uint(cell.y) ^ hash(uint(i))));
+        if (float(h & 0xffffu) / 65535.0 >= layer.y * density) {
+            continue;
+        }
+        uint h2 = hash(h);
+        vec2 jitter = vec2(float(h2 & 0xffffu), float(h2 >> 16)) / 65535.0;
+        vec2 star = vec2(cell) * layer.x + layer.w + jitter * (layer.x - 2.0 * layer.w);
+        vec2 distance = abs(p - floor(star) - 0.5);
+        if (max(distance.x, distance.y) < layer.w * 0.5) {
+            light += layer.z * (0.6 + 0.4 * float(h >> 24) / 255.0);
+        }
+    }
+    fragColor = vec4(vec3(min(light, 1.0)), 1.0);
+}
+""".replace("MAX_LAYERS", str(MAX_STAR_LAYERS))
+
+
+class ParallaxStarfield:
+    """Infinite star background in depth layers, generated per pixel on the GPU.
+
+    Nothing is stored: each layer is a grid of cells and whether a cell has a
+    star, where and how bright is a hash of (layer, column, row). Layers scroll
+    by a fraction of the camera movement, so far stars drift slower than near
+    ones. draw() covers the viewport with one opaque quad, so it replaces
+    clearing the frame and its cost depends on the pixel count, not on how
+    many stars there are. Lowering the density hides a fixed subset of stars.
+    """
+
+    def __init__(self, ctx, layers=STAR_LAYERS):
+        if len(layers) > MAX_STAR_LAYERS:
+            raise ValueError(f"at most {MAX_STAR_LAYERS} star layers are supported")
+        self.ctx = ctx
+        self.layers = layers
+        self.program = ctx.program(vertex_shader=STARFIELD_VERTEX_SHADER, fragment_shader=STARFIELD_FRAGMENT_SHADER)
+        self.program["layer_count"] = len(layers)
+        self.program["layers"] = [value for _, cell, chance, brightness, size in layers
+                                  for value in (cell, chance, brightness, size)] + [0.0] * 4 * (MAX_STAR_LAYERS - len(layers))
+        self.quad = geometry.quad_2d_fs()
+        self.pixels = 0
+        self.draw_time = 0.0
+
+    def draw(self, camera_x, camera_y, pixel_scale, density=1.0):
+        """Fill the current viewport; (camera_x, camera_y) is the world point at its bottom-left corner.
+
+        pixel_scale is framebuffer pixels per world unit for the nearest (factor 1) layer.
+        """
+        start = time.perf_counter()
+        left, bottom, width, height = self.ctx.viewport
+        scroll = []
+        for factor, *_ in self.layers:
+            scroll += [camera_x * pixel_scale * factor, camera_y * pixel_scale * factor]
+        scroll += [0.0, 0.0] * (MAX_STAR_LAYERS - len(self.layers))
+
+        program = self.program
+        program["origin"] = (left, bottom)
+        program["density"] = density
+        program["scroll"] = scroll
+        self.quad.render(program)
+        self.pixels = width * height
+        self.draw_time = time.perf_counter() - start
+
+    def profiler_lines(self):
+        return [f"{len(self.layers)} layers over {self.pixels} pixels, submit {self.draw_time * 1000:.2f}ms"]
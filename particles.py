@@ -0,0 +1,301 @@
+import math
+import random
+import time
+from array import array
+
+from arcade.gl import BufferDescription
+from pyglet.gl import GL_PROGRAM_POINT_SIZE
+
+try:
+    import numpy
+except ImportError:  # Optional: without numpy particles live in Python lists at a smaller capacity
+    numpy = None
+
+PARTICLE_CAPACITY = 50000   # Preallocated slots with numpy
+FALLBACK_CAPACITY = 2000    # Slots without numpy, where every particle is a Python list
+VERTEX_FLOATS = 7           # x, y, r, g, b, a, size per particle on the GPU
+
+PARTICLE_VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+uniform vec2 offset;        // Origin minus camera, world units
+uniform float scale;        // Screen units per world unit
+uniform float pixel_scale;  // Framebuffer pixels per world unit
+in vec2 in_pos;
+in vec4 in_color;
+in float in_size;
+out vec4 color;
+void main() {
+    gl_Position = window.projection * window.view * vec4((in_pos + offset) * scale, 0.0, 1.0);
+    gl_PointSize = max(in_size * pixel_scale, 1.0);
+    color = in_color;
+}
+"""
+PARTICLE_FRAGMENT_SHADER = """
+#version 330
+in vec4 color;
+out vec4 fragColor;
+void main() {
+    fragColor = color;
+}
+"""
+
+
+class Emitter:
+    """How one kind of particle is spawned. Angles in degrees, 0 = up, clockwise like the ships."""
+    __slots__ = ("count", "rate", "speed", "spread", "life", "size", "colors", "drag", "radius")
+
+    def __init__(self, count=0, rate=0, speed=(0, 0), spread=180, life=(0.5, 1.0), size=(1, 2),
+                 colors=((255, 255, 255, 255),), drag=1.0, radius=0.0):
+        self.count = count    # Particles per burst
+        self.rate = rate      # Particles per second when emitted continuously
+        self.speed = speed    # (min, max) world units per second
+        self.spread = spread  # Half-angle around the direction
+        self.life = life      # (min, max) seconds
+        self.size = size      # (min, max) world units
+        self.colors = colors  # Picked at random per particle
+        self.drag = drag      # Fraction of velocity kept per second
+        self.radius = radius  # Spawn jitter around the emit point
+
+
+EMITTERS = {
+    "exhaust": Emitter(rate=90, speed=(25, 45), spread=12, life=(0.2, 0.45), size=(1, 1.5),
+                       colors=((255, 170, 60, 220), (255, 100, 50, 200), (255, 230, 150, 200)), drag=0.2),
+    "reverse_exhaust": Emitter(rate=60, speed=(20, 35), spread=15, life=(0.15, 0.3), size=(1, 1.5),
+                               colors=((100, 150, 255, 200), (170, 200, 255, 180)), drag=0.2),
+    "impact": Emitter(count=14, speed=(20, 70), spread=180, life=(0.15, 0.4), size=(1, 1.5),
+                      colors=((255, 255, 255, 255), (150, 220, 255, 230)), drag=0.05),
+    "explosion": Emitter(count=160, speed=(5, 80), spread=180, life=(0.4, 1.2), size=(1, 3),
+                         colors=((255, 240, 180, 255), (255, 160, 50, 240), (255, 80, 30, 220), (120, 120, 120, 180)),
+                         drag=0.15, radius=3.0),
+    "sparks": Emitter(count=10, speed=(30, 90), spread=50, life=(0.1, 0.3), size=(1, 1),
+                      colors=((255, 220, 120, 255), (255, 255, 220, 255)), drag=0.02),
+}
+
+
+class ParticleSystem:
+    """Short-lived particles from named emitters, simulated and drawn in bulk.
+
+    Live particles are packed at the front of preallocated arrays: emitting
+    appends, and particles that expire are compacted out once per update, so
+    integration and fading are a handful of whole-array operations. The
+    vertex columns (position, colour, size) are uploaded in one write and
+    drawn as points in a single call. Positions are stored relative to
+    origin_x/origin_y; rebase() shifts them when a floating origin moves.
+    Emission beyond the budget (a quality knob) is dropped, not queued.
+    """
+
+    def __init__(self, ctx, capacity=None, emitters=EMITTERS):
+        self.ctx = ctx
+        self.capacity = capacity or (PARTICLE_CAPACITY if numpy is not None else FALLBACK_CAPACITY)
+        self.budget = self.capacity
+        self.emitters = emitters
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+        self.count = 0
+        self.emitted = 0
+        self.dropped = 0
+        self.update_time = 0.0
+        self.draw_time = 0.0
+
+        if numpy is not None:
+            self.vertices = numpy.zeros((self.capacity, VERTEX_FLOATS), dtype=numpy.float32)
+            self.velocity = numpy.zeros((self.capacity, 2), dtype=numpy.float32)
+            self.age = numpy.zeros(self.capacity, dtype=numpy.float32)
+            self.life = numpy.ones(self.capacity, dtype=numpy.float32)
+            self.alpha = numpy.zeros(self.capacity, dtype=numpy.float32)  # Alpha at birth
+            self.base_size = numpy.zeros(self.capacity, dtype=numpy.float32)
+            self.drag = numpy.ones(self.capacity, dtype=numpy.float32)
+            self.scratch = numpy.zeros((self.capacity, 2), dtype=numpy.float32)
+            self.rng = numpy.random.default_rng()
+        else:
+            self.particles = []  # [x, y, vx, vy, age, life, r, g, b, alpha, size, drag]
+
+        self.program = ctx.program(vertex_shader=PARTICLE_VERTEX_SHADER, fragment_shader=PARTICLE_FRAGMENT_SHADER)
+        self.buffer = ctx.buffer(reserve=self.capacity * VERTEX_FLOATS * 4)
+        self.geometry = ctx.geometry([BufferDescription(self.buffer, "2f 4f 1f", ["in_pos", "in_color", "in_size"])],
+                                     mode=ctx.POINTS)
+
+    def set_budget(self, budget):
+        self.budget = min(budget, self.capacity)
+
+    def rebase(self, origin_x, origin_y):
+        """Keep world positions when the origin they are stored against moves"""
+        dx = self.origin_x - origin_x
+        dy = self.origin_y - origin_y
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        if numpy is not None:
+            self.vertices[:self.count, 0] += dx
+            self.vertices[:self.count, 1] += dy
+        else:
+            for particle in self.particles:
+                particle[0] += dx
+                particle[1] += dy
+
+    def emit_continuous(self, name, x, y, direction, velocity_x, velocity_y, delta_time):
+        """Emit at the emitter's rate over delta_time; fractions are rounded at random so low rates average out"""
+        expected = self.emitters[name].rate * delta_time
+        count = int(expected)
+        if random.random() < expected - count:
+            count += 1
+        if count:
+            self.emit(name, x, y, direction, velocity_x, velocity_y, count)
+
+    def emit(self, name, x, y, direction=0.0, velocity_x=0.0, velocity_y=0.0, count=None, color=None):
+        """Burst of the emitter's count (or count) particles at a world point, moving away along direction.
+
+        velocity_x/velocity_y is added to every particle (the emitter's own
+        motion) and color, when given, replaces the emitter's colours.
+        """
+        emitter = self.emitters[name]
+        count = emitter.count if count is None else count
+        available = self.budget - self.count
+        if count > available:
+            self.dropped += count - max(available, 0)
+            count = available
+        if count <= 0:
+            return
+        self.emitted += count
+        colors = (color,) if color is not None else emitter.colors
+
+        if numpy is None:
+            self.emit_python(emitter, x - self.origin_x, y - self.origin_y, direction,
+                             velocity_x, velocity_y, count, colors)
+            return
+
+        rng = self.rng
+        start = self.count
+        end = start + count
+        vertices = self.vertices[start:end]
+        angles = numpy.radians(direction + rng.uniform(-emitter.spread, emitter.spread, count))
+        speeds = rng.uniform(emitter.speed[0], emitter.speed[1], count)
+        self.velocity[start:end, 0] = numpy.sin(angles) * speeds + velocity_x
+        self.velocity[start:end, 1] = numpy.cos(angles) * speeds + velocity_y
+        vertices[:, 0] = x - self.origin_x
+        vertices[:, 1] = y - self.origin_y
+        if emitter.radius:
+            vertices[:, 0:2] += rng.uniform(-emitter.radius, emitter.radius, (count, 2))
+        palette = numpy.array(colors, dtype=numpy.float32) / 255
+        chosen = palette[rng.integers(0, len(palette), count)]
+        vertices[:, 2:5] = chosen[:, 0:3]
+        self.alpha[start:end] = chosen[:, 3] if chosen.shape[1] == 4 else 1.0
+        vertices[:, 5] = self.alpha[start:end]
+        self.base_size[start:end] = rng.uniform(emitter.size[0], emitter.size[1], count)
+        vertices[:, 6] = self.base_size[start:end]
+        self.age[start:end] = 0.0
+        self.life[start:end] = rng.uniform(emitter.life[0], emitter.life[1], count)
+        self.drag[start:end] = emitter.drag
+        self.count = end
+
+    def emit_python(self, emitter, x, y, direction, velocity_x, velocity_y, count, colors):
+        for _ in range(count):
+            angle = math.radians(direction + random.uniform(-emitter.spread, emitter.spread))
+            speed = random.uniform(*emitter.speed)
+            color = random.choice(colors)
+            self.particles.append([
+                x + random.uniform(-emitter.radius, emitter.radius),
+                y + random.uniform(-emitter.radius, emitter.radius),
+                math.sin(angle) * speed + velocity_x, math.cos(angle) * speed + velocity_y,
+                0.0, random.uniform(*emitter.life),
+                color[0] / 255, color[1] / 255, color[2] / 255, (color[3] if len(color) == 4 else 255) / 255,
+                random.uniform(*emitter.size), emitter.drag
+            ])
+        self.count = len(self.particles)
+
+    def update(self, delta_time):
+        start = time.perf_counter()
+        if numpy is not None:
+            self.update_arrays(delta_time)
+        else:
+            self.update_python(delta_time)
+        self.update_time = time.perf_counter() - start
+
+    def update_arrays(self, delta_time):
+        count = self.count
+        if not count:
+            return
+        vertices = self.vertices[:count]
+        velocity = self.velocity[:count]
+        age = self.age[:count]
+        age += delta_time
+
+        # Drag then move; scratch space keeps the step free of temporaries
+        damping = self.scratch[:count, 0]
+        numpy.power(self.drag[:count], delta_time, out=damping)
+        velocity *= damping[:, None]
+        step = self.scratch[:count]
+        numpy.multiply(velocity, delta_time, out=step)
+        vertices[:, 0:2] += step
+
+        # Fade out and shrink to half size over the lifetime
+        progress = self.scratch[:count, 0]
+        numpy.divide(age, self.life[:count], out=progress)
+        numpy.subtract(1.0, progress, out=vertices[:, 5])
+        vertices[:, 5] *= self.alpha[:count]
+        numpy.multiply(progress, -0.5, out=vertices[:, 6])
+        vertices[:, 6] += 1.0
+        vertices[:, 6] *= self.base_size[:count]
+
+        # Pack the survivors to the front
+        alive = age < self.life[:count]
+        survivors = int(numpy.count_nonzero(alive))
+        if survivors == count:
+            return
+        for column in (self.vertices, self.velocity, self.age, self.life, self.alpha, self.base_size, self.drag):
+            column[:survivors] = column[:count][alive]
+        self.count = survivors
+
+    def update_python(self, delta_time):
+        survivors = []
+        for particle in self.particles:
+            particle[4] += delta_time
+            if particle[4] >= particle[5]:
+                continue
+            damping = particle[11] ** delta_time
+            particle[2] *= damping
+            particle[3] *= damping
+            particle[0] += particle[2] * delta_time
+            particle[1] += particle[3] * delta_time
+            survivors.append(particle)
+        self.particles = survivors
+        self.count = len(survivors)
+
+    def draw(self, camera_x, camera_y, scale, pixel_scale):
+        """Draw every live particle in one call under the active camera.
+
+        scale converts world units to the camera's units, pixel_scale to
+        framebuffer pixels (point sizes are in pixels).
+        """
+        if not self.count:
+            return
+        start = time.perf_counter()
+        if numpy is not None:
+            self.buffer.write(self.vertices[:self.count])
+        else:
+            self.buffer.write(self.python_vertices())
+
+        program = self.program
+        program["offset"] = (self.origin_x - camera_x, self.origin_y - camera_y)
+        program["scale"] = scale
+        program["pixel_scale"] = pixel_scale
+        with self.ctx.enabled(self.ctx.BLEND, GL_PROGRAM_POINT_SIZE):
+            self.ctx.blend_func = self.ctx.BLEND_DEFAULT
+            self.geometry.render(program, vertices=self.count)
+        self.draw_time = time.perf_counter() - start
+
+    def python_vertices(self):
+        vertices = array("f")
+        for x, y, _, _, age, life, r, g, b, alpha, size, _ in self.particles:
+            progress = age / life
+            vertices.extend((x, y, r, g, b, alpha * (1 - progress), size * (1 - 0.5 * progress)))
+        return vertices
+
+    def profiler_lines(self):
+        backend = "numpy" if numpy is not None else "python"
+        return [f"{self.count} live, budget {self.budget} of {self.capacity} ({backend})",
+                f"update {self.update_time * 1000:.2f}ms, upload+draw {self.draw_time * 1000:.2f}ms",
+                f"{self.emitted} emitted, {self.dropped} dropped over budget"]
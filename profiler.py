@@ -0,0 +1,169 @@
+import arcade
+import collections
+import os
+import sys
+import threading
+import time
+
+# Opt in with LITTLESPACE_PROFILE=1
+PROFILE_ENV_VAR = "LITTLESPACE_PROFILE"
+
+SAMPLE_INTERVAL = 0.002      # 500 samples per second (best effort, limited by the GIL)
+SAMPLE_HISTORY = 5.0         # Seconds of samples kept in the ring buffer
+HITCH_THRESHOLD = 1 / 30     # Frames slower than this are written out automatically
+HITCH_CONTEXT = 0.25         # Seconds of samples kept before and after a hitch
+PROFILE_OUTPUT_DIR = "profiles"
+
+OVERLAY_REFRESH_INTERVAL = 0.25  # Rebuilding the overlay text every frame would cost more than it shows
+
+
+def profiler_enabled():
+    return os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+
+class SamplingProfiler:
+    """Samples the main thread's stack from a background thread into a ring buffer.
+
+    Frames longer than the hitch threshold are written out together with the
+    samples around them in the folded-stack format used by flamegraph.pl,
+    speedscope and inferno ("root;caller;callee count" per line).
+    """
+
+    def __init__(self, name, interval=SAMPLE_INTERVAL, history=SAMPLE_HISTORY,
+                 hitch_threshold=HITCH_THRESHOLD, output_dir=PROFILE_OUTPUT_DIR):
+        self.name = name
+        self.interval = interval
+        self.history = history
+        self.hitch_threshold = hitch_threshold
+        self.output_dir = output_dir
+
+        # (timestamp, tuple of code objects from outermost to innermost)
+        self.samples = collections.deque(maxlen=int(history / interval))
+        self.labels = {}  # code object -> "function (file:line)"
+
+        self.target_thread_id = None
+        self.thread = None
+        self.running = False
+
+        self.last_frame_start = None
+        self.pending_hitch = None  # [window start, last hitch end, worst frame time]
+        self.captures_written = 0
+
+    def start(self):
+        self.target_thread_id = threading.get_ident()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample_loop, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def sample_loop(self):
+        samples = self.samples
+        target = self.target_thread_id
+        interval = self.interval
+        while self.running:
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.reverse()
+                samples.append((time.perf_counter(), tuple(stack)))
+            frame = None
+            time.sleep(interval)
+
+    def frame_start(self):
+        """Call once per frame (start of on_draw) to detect hitches"""
+        now = time.perf_counter()
+        if self.last_frame_start is not None:
+            frame_time = now - self.last_frame_start
+            if frame_time > self.hitch_threshold:
+                if self.pending_hitch is None:
+                    self.pending_hitch = [self.last_frame_start - HITCH_CONTEXT, now, frame_time]
+                else:
+                    # Hitches close together go into the same capture
+                    self.pending_hitch[1] = now
+                    self.pending_hitch[2] = max(self.pending_hitch[2], frame_time)
+        self.last_frame_start = now
+
+        # Write the hitch out once the samples after it have been collected, or
+        # before the start of a long run of slow frames drops out of the ring buffer
+        if self.pending_hitch is not None:
+            window_start, hitch_end, worst_frame_time = self.pending_hitch
+            if now - hitch_end >= HITCH_CONTEXT or now - window_start >= self.history * 0.5:
+                self.pending_hitch = None
+                self.write_capture(f"hitch_{worst_frame_time * 1000:.0f}ms", window_start, now)
+
+    def capture(self):
+        """Write out everything currently in the ring buffer (on-demand hotkey)"""
+        return self.write_capture("manual", 0, float("inf"))
+
+    def label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self.labels[code] = label
+        return label
+
+    def write_capture(self, reason, start_time, end_time):
+        counts = collections.Counter()
+        for timestamp, stack in list(self.samples):
+            if start_time <= timestamp <= end_time:
+                counts[stack] += 1
+        if not counts:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.captures_written += 1
+        filename = os.path.join(
+            self.output_dir,
+            f"{self.name}_{time.strftime('%Y%m%d_%H%M%S')}_{self.captures_written:03d}_{reason}.folded"
+        )
+        with open(filename, "w") as f:
+            for stack, count in counts.most_common():
+                f.write(";".join(self.label(code) for code in stack))
+                f.write(f" {count}\n")
+
+        print(f"[profiler] wrote {sum(counts.values())} samples to {filename}")
+        return filename
+
+
+class ProfilerOverlay:
+    """On-screen profiler panel (toggled with F3) listing live counters from each subsystem"""
+
+    def __init__(self, x, y):
+        self.sections = []  # (title, callable returning a list of lines)
+        self.visible = False
+        self.refresh_timer = 0.0
+        self.text = arcade.Text("", x, y, arcade.color.YELLOW, 10,
+                                multiline=True, width=420, anchor_y="top")
+
+    def add_section(self, title, source):
+        self.sections.append((title, source))
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.refresh_timer = OVERLAY_REFRESH_INTERVAL
+
+    def update(self, delta_time):
+        if not self.visible:
+            return
+        self.refresh_timer += delta_time
+        if self.refresh_timer < OVERLAY_REFRESH_INTERVAL:
+            return
+        self.refresh_timer = 0.0
+
+        lines = []
+        for title, source in self.sections:
+            lines.append(f"[{title}]")
+            lines.extend(f"  {line}" for line in source())
+        self.text.text = "\n".join(lines)
+
+    def draw(self):
+        if self.visible:
+            self.text.draw()
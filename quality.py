@@ -0,0 +1,123 @@
+import time
+
+TARGET_FRAME_TIME = 1 / 60
+FRAME_TIME_SMOOTHING = 0.1    # Exponential moving average weight for new frames
+OVER_BUDGET = 0.9             # Fraction of the target above which detail is reduced
+UNDER_BUDGET = 0.6            # Fraction of the target below which detail is increased
+FRAMES_BEFORE_DECREASE = 10   # React quickly to slow frames...
+FRAMES_BEFORE_INCREASE = 120  # ...but only add detail after ~2 seconds of headroom
+CHANGE_COOLDOWN = 0.5         # Seconds to wait after a change before judging again
+
+
+class QualityKnob:
+    def __init__(self, name, levels, start_level=None):
+        self.name = name
+        self.levels = levels  # Values ordered from cheapest to most detailed
+        self.level = len(levels) - 1 if start_level is None else start_level
+
+    @property
+    def value(self):
+        return self.levels[self.level]
+
+    @property
+    def fraction(self):
+        # Normalized level so knobs with different numbers of levels can be compared
+        if len(self.levels) == 1:
+            return 1.0
+        return self.level / (len(self.levels) - 1)
+
+
+class QualityGovernor:
+    """Scales detail knobs up or down to hold the frame-time target.
+
+    Call frame_begin() at the start of on_update and frame_end() at the end of
+    on_draw; the work time in between is compared against the target. When the
+    frame pacer runs several updates before a draw, the time is measured from
+    the first of them, so catch-up frames count all their work. Knobs are
+    registered in priority order: the first knob is the first to be reduced when
+    several are at the same relative level, and the last to be restored.
+    """
+
+    def __init__(self, target_frame_time=TARGET_FRAME_TIME):
+        self.target_frame_time = target_frame_time
+        self.knobs = {}
+        self.enabled = True
+
+        self.frame_start = None
+        self.average_work_time = 0.0
+        self.over_frames = 0
+        self.under_frames = 0
+        self.last_change_time = 0.0
+        self.last_change = "none"
+
+    def add_knob(self, name, levels, start_level=None):
+        knob = QualityKnob(name, levels, start_level)
+        self.knobs[name] = knob
+        return knob
+
+    def value(self, name):
+        return self.knobs[name].value
+
+    def frame_begin(self):
+        if self.frame_start is None:
+            self.frame_start = time.perf_counter()
+
+    def frame_end(self):
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        work_time = now - self.frame_start
+        self.frame_start = None
+
+        self.average_work_time += (work_time - self.average_work_time) * FRAME_TIME_SMOOTHING
+
+        if not self.enabled or now - self.last_change_time < CHANGE_COOLDOWN:
+            return
+
+        if self.average_work_time > self.target_frame_time * OVER_BUDGET:
+            self.over_frames += 1
+            self.under_frames = 0
+        elif self.average_work_time < self.target_frame_time * UNDER_BUDGET:
+            self.under_frames += 1
+            self.over_frames = 0
+        else:
+            self.over_frames = 0
+            self.under_frames = 0
+
+        if self.over_frames >= FRAMES_BEFORE_DECREASE:
+            self.step(-1, now)
+        elif self.under_frames >= FRAMES_BEFORE_INCREASE:
+            self.step(1, now)
+
+    def step(self, direction, now):
+        self.over_frames = 0
+        self.under_frames = 0
+
+        knobs = list(self.knobs.values())
+        if direction < 0:
+            # Reduce the most detailed knob, earliest registered first
+            candidates = [knob for knob in knobs if knob.level > 0]
+            if not candidates:
+                return False
+            knob = max(candidates, key=lambda k: k.fraction)
+        else:
+            # Restore the least detailed knob, latest registered first
+            candidates = [knob for knob in reversed(knobs) if knob.level < len(knob.levels) - 1]
+            if not candidates:
+                return False
+            knob = min(candidates, key=lambda k: k.fraction)
+
+        knob.level += direction
+        self.last_change_time = now
+        self.last_change = f"{knob.name} {'down' if direction < 0 else 'up'}"
+        return True
+
+    def profiler_lines(self):
+        lines = [
+            f"work {self.average_work_time * 1000:.1f}ms / {self.target_frame_time * 1000:.1f}ms"
+            f"{'' if self.enabled else ' (governor off)'}",
+            f"last change: {self.last_change}"
+        ]
+        for knob in self.knobs.values():
+            lines.append(f"{knob.name}: {knob.value} ({knob.level + 1}/{len(knob.levels)})")
+        return lines
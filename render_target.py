@@ -0,0 +1,103 @@
+import arcade
+import math
+from arcade.gl import geometry
+from arcade.types import LBWH, LRBT
+
+# Copies the offscreen texture to the screen; alpha is forced to 1 because
+# blended draws leave partial alpha in the framebuffer
+BLIT_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+BLIT_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D source;
+in vec2 uv;
+out vec4 fragColor;
+void main() {
+    fragColor = vec4(texture(source, uv).rgb, 1.0);
+}
+"""
+
+
+def letterbox(window_width, window_height, width, height, integer_scale=True):
+    """Largest (left, bottom, width, height) rect for a width x height image centered in the window.
+
+    With integer_scale every source pixel covers the same number of screen
+    pixels whenever the window is at least 1x; smaller windows scale down.
+    """
+    scale = min(window_width / width, window_height / height)
+    if integer_scale and scale >= 1:
+        scale = math.floor(scale)
+    view_width = int(width * scale)
+    view_height = int(height * scale)
+    return ((window_width - view_width) // 2, (window_height - view_height) // 2, view_width, view_height)
+
+
+class TextureBlitter:
+    """Copies a texture onto a rect of the bound framebuffer with one opaque quad"""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.program = ctx.program(vertex_shader=BLIT_VERTEX_SHADER, fragment_shader=BLIT_FRAGMENT_SHADER)
+        self.program["source"] = 0
+        self.quad = geometry.quad_2d_fs()
+
+    def draw(self, texture, viewport):
+        self.ctx.viewport = viewport
+        texture.use(0)
+        self.quad.render(self.program)
+
+
+class PixelRenderTarget:
+    """Offscreen framebuffer at the native resolution, upscaled to the window in a single pass.
+
+    Draw code keeps working in logical (window) coordinates: cameras from
+    camera() project the logical area onto the framebuffer, so each pixel is
+    shaded once at native resolution. blit() letterboxes the texture into the
+    window with nearest-neighbour filtering.
+    """
+
+    def __init__(self, window, width, height, logical_width, logical_height, integer_scale=True):
+        self.window = window
+        self.width = width
+        self.height = height
+        self.logical_width = logical_width
+        self.logical_height = logical_height
+        self.integer_scale = integer_scale
+
+        ctx = window.ctx
+        self.texture = ctx.texture((width, height), components=4, filter=(ctx.NEAREST, ctx.NEAREST))
+        self.framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+        self.blitter = TextureBlitter(ctx)
+
+        self.viewport = (0, 0, width, height)  # Window area the image is blitted to
+        self.resize(*window.get_framebuffer_size())
+
+    def camera(self):
+        """Camera drawing logical coordinates into the framebuffer"""
+        half_width = self.logical_width / 2
+        half_height = self.logical_height / 2
+        return arcade.Camera2D(
+            viewport=LBWH(0, 0, self.width, self.height),
+            projection=LRBT(-half_width, half_width, -half_height, half_height),
+            position=(half_width, half_height),
+            render_target=self.framebuffer
+        )
+
+    def resize(self, window_width, window_height):
+        self.viewport = letterbox(window_width, window_height, self.width, self.height, self.integer_scale)
+
+    def clear(self, color=arcade.color.BLACK):
+        self.framebuffer.clear(color=color)
+
+    def blit(self):
+        """Draw the framebuffer to the screen; the screen stays bound afterwards"""
+        self.window.ctx.screen.use()
+        self.blitter.draw(self.texture, self.viewport)
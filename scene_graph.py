@@ -0,0 +1,103 @@
+import math
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def multiply(parent, local):
+    """Compose two affine matrices (a, b, c, d, tx, ty): x' = a x + c y + tx, y' = b x + d y + ty"""
+    pa, pb, pc, pd, ptx, pty = parent
+    la, lb, lc, ld, ltx, lty = local
+    return (pa * la + pc * lb, pb * la + pd * lb,
+            pa * lc + pc * ld, pb * lc + pd * ld,
+            pa * ltx + pc * lty + ptx, pb * ltx + pd * lty + pty)
+
+
+class SceneNode:
+    """Position, rotation (degrees, counter-clockwise) and scale relative to a parent node.
+
+    The world matrix is cached and only recomputed after this node or one
+    of its ancestors changes; changing a node marks its subtree dirty. A node
+    can carry local points (part geometry) whose world positions are cached
+    alongside the matrix, so a part that did not move costs nothing to draw.
+    """
+    __slots__ = ("x", "y", "rotation", "scale", "parent", "children", "points",
+                 "matrix", "world_points_cache", "dirty")
+
+    def __init__(self, x=0.0, y=0.0, rotation=0.0, scale=1.0, points=None):
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+        self.scale = scale
+        self.parent = None
+        self.children = []
+        self.points = points or []
+        self.matrix = IDENTITY
+        self.world_points_cache = None
+        self.dirty = True
+
+    def add(self, child):
+        """Attach child to this node and return it"""
+        if child.parent is not None:
+            child.parent.children.remove(child)
+        child.parent = self
+        self.children.append(child)
+        child.invalidate()
+        return child
+
+    def invalidate(self):
+        # A clean node always has a clean parent, so a dirty node's subtree is already dirty
+        if self.dirty:
+            return
+        self.dirty = True
+        stack = list(self.children)
+        while stack:
+            node = stack.pop()
+            if not node.dirty:
+                node.dirty = True
+                stack.extend(node.children)
+
+    def set_position(self, x, y):
+        if x != self.x or y != self.y:
+            self.x = x
+            self.y = y
+            self.invalidate()
+
+    def set_rotation(self, rotation):
+        if rotation != self.rotation:
+            self.rotation = rotation
+            self.invalidate()
+
+    def set_scale(self, scale):
+        if scale != self.scale:
+            self.scale = scale
+            self.invalidate()
+
+    def local_matrix(self):
+        angle = math.radians(self.rotation)
+        cos_a = math.cos(angle) * self.scale
+        sin_a = math.sin(angle) * self.scale
+        return (cos_a, sin_a, -sin_a, cos_a, self.x, self.y)
+
+    def world_matrix(self):
+        if self.dirty:
+            local = self.local_matrix()
+            self.matrix = multiply(self.parent.world_matrix(), local) if self.parent else local
+            self.world_points_cache = None
+            self.dirty = False
+        return self.matrix
+
+    def transform_point(self, x, y):
+        """A point in this node's local space, in world space"""
+        a, b, c, d, tx, ty = self.world_matrix()
+        return a * x + c * y + tx, b * x + d * y + ty
+
+    def world_position(self):
+        matrix = self.world_matrix()
+        return matrix[4], matrix[5]
+
+    def world_points(self):
+        """World positions of this node's points, cached until the node moves"""
+        a, b, c, d, tx, ty = self.world_matrix()
+        if self.world_points_cache is None:
+            self.world_points_cache = [(a * x + c * y + tx, b * x + d * y + ty) for x, y in self.points]
+        return self.world_points_cache
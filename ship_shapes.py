@@ -0,0 +1,26 @@
+THRUSTER_GAP = 1.5  # Space between the hull and the thruster flame
+
+
+def ship_hull(size):
+    """Local triangle points of a ship pointing up"""
+    return [(0, size), (-size * 0.8, -size * 0.6), (size * 0.8, -size * 0.6)]
+
+
+def thruster_shape(ship_size, width, length, gap=THRUSTER_GAP):
+    """Local trapezoid of a thruster flame behind a ship of ship_size"""
+    top = -ship_size * 0.6 - gap
+    bottom = top - length
+    return [(-width * 0.5, top), (width * 0.5, top), (width * 0.4, bottom), (-width * 0.4, bottom)]
+
+
+def vertex_buffer(count):
+    """Point list to draw from, filled in place each frame by transform_into"""
+    return [[0.0, 0.0] for _ in range(count)]
+
+
+def transform_into(buffer, shape, x, y, cos_a, sin_a, camera_x, camera_y, scale):
+    """Rotate shape clockwise by the angle of (cos_a, sin_a), place it at (x, y) and write screen points into buffer"""
+    for point, (px, py) in zip(buffer, shape):
+        point[0] = (x + px * cos_a + py * sin_a - camera_x) * scale
+        point[1] = (y - px * sin_a + py * cos_a - camera_y) * scale
+    return buffer
@@ -0,0 +1,378 @@
+import argparse
+import arcade
+import collections
+import math
+import random
+import socket
+import threading
+import time
+
+from netcode import (DEFAULT_SERVER_PORT, FLAG_REVERSE, FLAG_THRUST, HELLO, INPUT, INPUT_FIRE, INPUT_LEFT,
+                     INPUT_REVERSE, INPUT_RIGHT, INPUT_THRUST, KIND_BULLET, KIND_ENEMY_BULLET, KIND_ENEMY_SHIP,
+                     KIND_PLAYER, MSG_BYE, MSG_HELLO, MSG_INPUT, MSG_WELCOME, ROLE_PLAY, ROLE_WATCH,
+                     SNAPSHOT_HISTORY, WELCOME, SimClient, dequantize, encode_snapshot, quantize)
+from space_flight_minimal import (SCREEN_HEIGHT, SCREEN_WIDTH, SHIP_SIZE, WORLD_HEIGHT, WORLD_WIDTH, Bullet,
+                                  EnemyShip, Player)
+from spatial_index import SpatialGrid
+
+# Authoritative combat server for space_flight_minimal:
+#   python sim_server.py [--port 47800] [--bots 4] [--seconds 30]
+# then join with LITTLESPACE_SERVER=127.0.0.1:47800 python space_flight_minimal.py
+TICK_RATE = 60
+THINK_RATE = 20               # Enemy ship decisions per second, like the game's ai_think_rate knob
+ENEMY_SHIPS_PER_PLAYER = 2
+MAX_BULLETS_PER_PLAYER = 8
+INTEREST_MARGIN = 40          # World units around a view rect that are sent too, so things do not pop in
+CLIENT_TIMEOUT = 5.0          # Seconds of silence before a client is dropped
+STATS_INTERVAL = 5.0          # Seconds between printed server statistics
+
+# The simulation steps ships with the game's key handling
+INPUT_KEYS = ((INPUT_LEFT, arcade.key.LEFT), (INPUT_RIGHT, arcade.key.RIGHT),
+              (INPUT_THRUST, arcade.key.UP), (INPUT_REVERSE, arcade.key.DOWN), (INPUT_FIRE, arcade.key.SPACE))
+
+
+def input_keys(bits):
+    return {key for bit, key in INPUT_KEYS if bits & bit}
+
+
+class CombatSimulation:
+    """The minimal game's combat rules for any number of players.
+
+    Uses the game's Player, EnemyShip and Bullet classes unchanged. Enemy
+    ships chase the nearest player; each player brings ENEMY_SHIPS_PER_PLAYER
+    of them. Every entity gets a net_id, and all of them are kept in a
+    spatial grid for the per-client interest queries.
+    """
+
+    def __init__(self):
+        self.players = {}  # net_id -> Player
+        self.enemy_ships = []
+        self.bullets = []
+        self.enemy_bullets = []
+        self.contacts = SpatialGrid()
+        self.next_id = 1
+        self.think_timer = 0.0
+
+    def add(self, obj, kind, radius=0.0):
+        obj.net_id = self.next_id
+        obj.net_kind = kind
+        self.next_id += 1
+        self.contacts.insert(obj, radius)
+        return obj
+
+    def add_player(self):
+        player = self.add(Player(WORLD_WIDTH // 2 + random.uniform(-100, 100),
+                                 WORLD_HEIGHT // 2 + random.uniform(-100, 100)), KIND_PLAYER)
+        player.input_bits = 0
+        self.players[player.net_id] = player
+        return player
+
+    def remove_player(self, net_id):
+        player = self.players.pop(net_id, None)
+        if player:
+            self.contacts.remove(player)
+
+    def spawn_enemy_ship(self, near):
+        angle = random.uniform(0, 2 * math.pi)
+        distance = 150 + random.uniform(-50, 50)
+        x = max(50, min(near.x + math.cos(angle) * distance, WORLD_WIDTH - 50))
+        y = max(50, min(near.y + math.sin(angle) * distance, WORLD_HEIGHT - 50))
+        ship = self.add(EnemyShip(x, y), KIND_ENEMY_SHIP, SHIP_SIZE)
+        ship.think(near, self.enemy_ships)
+        self.enemy_ships.append(ship)
+
+    def nearest_player(self, x, y):
+        return min(self.players.values(), key=lambda player: (player.x - x) ** 2 + (player.y - y) ** 2)
+
+    def step(self, delta_time):
+        players = list(self.players.values())
+        for player in players:
+            keys = input_keys(player.input_bits)
+            if arcade.key.SPACE in keys:
+                owned = sum(1 for bullet in self.bullets if bullet.owner is player)
+                bullet = player.shoot() if owned < MAX_BULLETS_PER_PLAYER else None
+                if bullet:
+                    bullet.owner = player
+                    self.bullets.append(self.add(bullet, KIND_BULLET))
+            player.update(delta_time, keys)
+            self.contacts.move(player)
+
+        self.think_timer += delta_time
+        think = self.think_timer >= 1 / THINK_RATE
+        if think:
+            self.think_timer = 0.0
+        if players:
+            for ship in self.enemy_ships:
+                target = self.nearest_player(ship.x, ship.y)
+                ship.update(delta_time, target, self.enemy_ships, think)
+                self.contacts.move(ship)
+                if ship.can_shoot(target, delta_time):
+                    self.enemy_bullets.append(self.add(ship.shoot(target), KIND_ENEMY_BULLET))
+
+        for bullets in (self.bullets, self.enemy_bullets):
+            for bullet in bullets:
+                bullet.update(delta_time)
+            self.remove_where(bullets, Bullet.is_off_screen)
+
+        # Player bullets destroy enemy ships, enemy bullets are absorbed by players (no damage yet)
+        hit_ships = set()
+        for bullet in self.bullets:
+            for ship in self.enemy_ships:
+                if ship not in hit_ships and ship.check_collision_with_bullet(bullet):
+                    hit_ships.add(ship)
+                    bullet.spent = True
+                    break
+        self.remove_where(self.bullets, lambda bullet: getattr(bullet, "spent", False))
+        self.remove_where(self.enemy_ships, hit_ships.__contains__)
+        self.remove_where(self.enemy_bullets, lambda bullet: any(
+            math.hypot(player.x - bullet.x, player.y - bullet.y) <= player.size for player in players))
+
+        # Each player brings its share of enemy ships; ships outlive a player who leaves
+        while players and len(self.enemy_ships) < ENEMY_SHIPS_PER_PLAYER * len(players):
+            self.spawn_enemy_ship(random.choice(players))
+
+        for bullets in (self.bullets, self.enemy_bullets):
+            for bullet in bullets:
+                self.contacts.move(bullet)
+
+    def remove_where(self, objects, condition):
+        kept = []
+        for obj in objects:
+            if condition(obj):
+                self.contacts.remove(obj)
+            else:
+                kept.append(obj)
+        objects[:] = kept
+
+    def visible_state(self, left, bottom, right, top):
+        """{net_id: quantized state} of everything in the rect widened by INTEREST_MARGIN"""
+        return {obj.net_id: self.entity_state(obj)
+                for obj in self.contacts.query_rect(left - INTEREST_MARGIN, bottom - INTEREST_MARGIN,
+                                                    right + INTEREST_MARGIN, top + INTEREST_MARGIN)}
+
+    def entity_state(self, obj):
+        flags = 0
+        if getattr(obj, "thrusting_forward", False):
+            flags |= FLAG_THRUST
+        if getattr(obj, "thrusting_backward", False):
+            flags |= FLAG_REVERSE
+        return quantize(obj.net_kind, obj.x, obj.y, obj.angle, flags)
+
+    def entity_count(self):
+        return len(self.contacts)
+
+
+class ClientSession:
+    """Server-side view of one connected client"""
+
+    def __init__(self, client_id, address, role, player=None):
+        self.client_id = client_id
+        self.address = address
+        self.role = role
+        self.player = player
+        # Until the first input arrives a client sees a screen around the world centre
+        self.view = (WORLD_WIDTH / 2 - SCREEN_WIDTH / 2, WORLD_HEIGHT / 2 - SCREEN_HEIGHT / 2,
+                     WORLD_WIDTH / 2 + SCREEN_WIDTH / 2, WORLD_HEIGHT / 2 + SCREEN_HEIGHT / 2)
+        self.acked_tick = 0
+        self.sent = collections.OrderedDict()  # tick -> state as the client will hold it
+        self.last_heard = time.perf_counter()
+        self.bytes_sent = 0
+        self.full_snapshots = 0
+
+    def baseline(self):
+        """(tick, state) the next snapshot is encoded against; (0, {}) for a full snapshot"""
+        state = self.sent.get(self.acked_tick)
+        if state is None:
+            return 0, {}
+        return self.acked_tick, state
+
+    def record(self, tick, state):
+        self.sent[tick] = state
+        # Older baselines than the newest ack are never needed again
+        while self.sent and (len(self.sent) > SNAPSHOT_HISTORY or next(iter(self.sent)) < self.acked_tick):
+            self.sent.popitem(last=False)
+
+
+class CombatServer:
+    """Steps a CombatSimulation at TICK_RATE and sends every client its own snapshot each tick.
+
+    Clients send their input bits, their view rect and the newest tick they
+    received. Each snapshot only covers the client's view (plus its own
+    ship) and is a delta against the state at that acknowledged tick, so
+    bandwidth and encoding work follow what a client can see rather than the
+    size of the world. When the ack is missing or too old the client gets a
+    full snapshot instead.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_SERVER_PORT):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+        self.simulation = CombatSimulation()
+        self.clients = {}  # address -> ClientSession
+        self.next_client_id = 1
+        self.tick = 0
+        self.running = True
+
+        self.sim_time = 0.0       # Since the last stats print
+        self.snapshot_time = 0.0
+        self.ticks = 0
+        self.last_stats = time.perf_counter()
+
+    def receive(self):
+        while True:
+            try:
+                data, address = self.socket.recvfrom(65536)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if not data:
+                continue
+            session = self.clients.get(address)
+            if data[0] == MSG_HELLO:
+                if session is None:
+                    session = self.connect(address, HELLO.unpack(data)[1])
+                ship_id = session.player.net_id if session.player else 0
+                self.socket.sendto(WELCOME.pack(MSG_WELCOME, session.client_id, ship_id), address)
+            elif session is None:
+                continue
+            elif data[0] == MSG_INPUT:
+                _, acked_tick, bits, left, bottom, right, top = INPUT.unpack(data)
+                session.acked_tick = max(session.acked_tick, acked_tick)
+                session.view = (left, bottom, right, top)
+                session.last_heard = time.perf_counter()
+                if session.player:
+                    session.player.input_bits = bits
+            elif data[0] == MSG_BYE:
+                self.disconnect(session)
+
+    def connect(self, address, role):
+        player = self.simulation.add_player() if role == ROLE_PLAY else None
+        session = ClientSession(self.next_client_id, address, role, player)
+        self.next_client_id += 1
+        self.clients[address] = session
+        print(f"[server] client {session.client_id} joined from {address[0]}:{address[1]} "
+              f"to {'play' if player else 'watch'}")
+        return session
+
+    def disconnect(self, session):
+        self.clients.pop(session.address, None)
+        if session.player:
+            self.simulation.remove_player(session.player.net_id)
+        print(f"[server] client {session.client_id} left")
+
+    def send_snapshots(self):
+        for session in list(self.clients.values()):
+            state = self.simulation.visible_state(*session.view)
+            own = ()
+            if session.player:
+                # A client always sees its own ship, whatever view it reports
+                own = (session.player.net_id,)
+                state[session.player.net_id] = self.simulation.entity_state(session.player)
+            baseline_tick, baseline = session.baseline()
+            datagram, sent = encode_snapshot(self.tick, baseline_tick, baseline, state, own)
+            session.record(self.tick, sent)
+            session.bytes_sent += len(datagram)
+            if not baseline_tick:
+                session.full_snapshots += 1
+            try:
+                self.socket.sendto(datagram, session.address)
+            except OSError:
+                pass
+
+    def step(self, delta_time):
+        self.receive()
+        now = time.perf_counter()
+        for session in list(self.clients.values()):
+            if now - session.last_heard > CLIENT_TIMEOUT:
+                self.disconnect(session)
+
+        start = time.perf_counter()
+        self.tick += 1
+        self.simulation.step(delta_time)
+        middle = time.perf_counter()
+        self.send_snapshots()
+        end = time.perf_counter()
+        self.sim_time += middle - start
+        self.snapshot_time += end - middle
+        self.ticks += 1
+        if end - self.last_stats >= STATS_INTERVAL:
+            self.print_stats(end - self.last_stats)
+            self.last_stats = end
+
+    def print_stats(self, elapsed):
+        ticks = max(self.ticks, 1)
+        print(f"[server] tick {self.tick}: {self.simulation.entity_count()} entities, {len(self.clients)} clients, "
+              f"sim {self.sim_time / ticks * 1000:.3f}ms + snapshots {self.snapshot_time / ticks * 1000:.3f}ms per tick")
+        for session in self.clients.values():
+            print(f"  client {session.client_id}: {session.bytes_sent / elapsed / 1024:.1f}KB/s, "
+                  f"{session.full_snapshots} full snapshots")
+            session.bytes_sent = 0
+            session.full_snapshots = 0
+        self.sim_time = self.snapshot_time = 0.0
+        self.ticks = 0
+
+    def run(self, seconds=None):
+        """Fixed-rate loop until stop() or for the given number of seconds"""
+        step = 1 / TICK_RATE
+        start = next_tick = time.perf_counter()
+        while self.running and (seconds is None or next_tick - start < seconds):
+            self.step(step)
+            next_tick += step
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # Behind: drop the backlog rather than spiral
+        self.socket.close()
+
+    def stop(self):
+        self.running = False
+
+
+def run_bot(address, role, stop_event):
+    """Headless client flying at random, for testing the server on localhost"""
+    client = SimClient(address, role)
+    client.join()
+    bits = 0
+    x, y = WORLD_WIDTH / 2, WORLD_HEIGHT / 2
+    while not stop_event.is_set():
+        client.poll()
+        if random.random() < 0.05:
+            bits = random.choice((INPUT_LEFT, INPUT_RIGHT, 0)) | random.choice((INPUT_THRUST, 0)) | INPUT_FIRE
+        own = client.state.get(client.ship_id)
+        if own:
+            _, x, y, _, _ = dequantize(own)
+        client.send_input(bits, x - SCREEN_WIDTH / 2, y - SCREEN_HEIGHT / 2, x + SCREEN_WIDTH / 2, y + SCREEN_HEIGHT / 2)
+        time.sleep(1 / TICK_RATE)
+    print("[bot] " + "; ".join(client.profiler_lines()))
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authoritative combat server for space_flight_minimal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVER_PORT)
+    parser.add_argument("--bots", type=int, default=0, help="headless clients to start in this process")
+    parser.add_argument("--watchers", type=int, default=0, help="headless watching clients")
+    parser.add_argument("--seconds", type=float, default=None, help="stop after this long")
+    args = parser.parse_args()
+
+    server = CombatServer(args.host, args.port)
+    print(f"[server] listening on {server.address[0]}:{server.address[1]} at {TICK_RATE}Hz")
+    stop_event = threading.Event()
+    bots = [threading.Thread(target=run_bot, args=(server.address, role, stop_event), daemon=True)
+            for role in [ROLE_PLAY] * args.bots + [ROLE_WATCH] * args.watchers]
+    for bot in bots:
+        bot.start()
+    try:
+        server.run(args.seconds)
+    except KeyboardInterrupt:
+        pass
+    stop_event.set()
+    for bot in bots:
+        bot.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
+import time
+_start_time = time.perf_counter()
+
 import arcade
 
+from frame_pacing import FramePacer
+from startup import StartupTimer
+
+startup_timer = StartupTimer("simple_game", _start_time)
+startup_timer.mark("import")
+
 SCREEN_WIDTH = 640
 SCREEN_HEIGHT = 360
 SCREEN_SCALE = 2
@@ -26,6 +35,9 @@ class GameWindow(arcade.Window):
         # FPS tracking
         self.frame_delta_time = 0.0
         
+        # Fixed 60Hz updates; draw pacing is vsync, capped or uncapped (F5)
+        self.pacer = FramePacer(self)
+        
         # Create Text object for FPS display (much faster than draw_text)
         self.fps_text = arcade.Text("FPS: --", 
                                    (SCREEN_WIDTH * SCREEN_SCALE) - 100, 
@@ -46,13 +58,15 @@ class GameWindow(arcade.Window):
         
         # Draw FPS in bottom-right corner
         self.fps_text.draw()
+        
+        startup_timer.first_frame()
 
     def on_update(self, delta_time):
-        # Store delta_time for FPS calculation
+        # Store delta_time (the pacer's fixed update step)
         self.frame_delta_time = delta_time
         
         # Update FPS text
-        fps_value = f"FPS: {1/self.frame_delta_time:.1f}" if self.frame_delta_time > 0 else "FPS: --"
+        fps_value = f"FPS: {self.pacer.fps:.1f}" if self.pacer.fps > 0 else "FPS: --"
         self.fps_text.text = fps_value
         
         # Update circle position based on key states
@@ -74,6 +88,8 @@ class GameWindow(arcade.Window):
             self.key_left = True
         elif key == arcade.key.RIGHT:
             self.key_right = True
+        elif key == arcade.key.F5:
+            self.pacer.cycle_mode()
 
     def on_key_release(self, key, modifiers):
         if key == arcade.key.UP:
@@ -87,7 +103,8 @@ class GameWindow(arcade.Window):
 
 def main():
     window = GameWindow()
-    arcade.run()
+    startup_timer.mark("window")
+    window.pacer.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,37 @@
+import time
+_start_time = time.perf_counter()
+
 import arcade
 import math
 import random
+from arcade.types import LBWH
+
+from alloc_tracker import AllocationTracker
+from asteroid_physics import AsteroidField
+from beams import BeamSystem
+from draw_batcher import DrawBatcher
+from floating_origin import FloatingOrigin
+from frame_pacing import FramePacer
+from gc_manager import GCManager
+from gravity import GravitySimulation
+from minimap import RADAR_SIZE, Radar
+from orbits import OrbitSystem
+from particles import ParticleSystem
+from profiler import ProfilerOverlay, SamplingProfiler, profiler_enabled
+from quality import QualityGovernor
+from render_target import PixelRenderTarget
+from scene_graph import SceneNode
+from ship_shapes import THRUSTER_GAP, ship_hull, thruster_shape, transform_into, vertex_buffer
+from spatial_index import SpatialGrid, ray_circle
+from startup import StartupTimer, WorldBuilder
+from tile_cache import TILE_SIZE, TileCache
+from triggers import TriggerSystem, TriggerZone
+from world_snapshot import ObjectLayout, WorldSnapshotter
+from worldgen import (DEBRIS_COLORS, FOG_COLORS, PLANET_SCHEMES, SECTOR_SIZE, STAR_COLORS, STATION_TYPES,
+                      SectorStreamer, records, world_records)
+
+startup_timer = StartupTimer("space_flight", _start_time)
+startup_timer.mark("import")
 
 # Screen and world settings
 SCREEN_WIDTH = 640
@@ -13,6 +44,9 @@ WINDOW_HEIGHT = SCREEN_HEIGHT * SCREEN_SCALE
 WORLD_WIDTH = 2000
 WORLD_HEIGHT = 2000
 
+# Hand-placed showcase in the middle of the world; generated sectors keep clear of it
+SHOWCASE_RECT = (WORLD_WIDTH // 2 - 800, WORLD_HEIGHT // 2 - 300, WORLD_WIDTH // 2 + 800, WORLD_HEIGHT // 2 + 350)
+
 # Physics variables (from flight_old_variables.md)
 ACCELERATION = 240
 FRICTION = 0.995
@@ -32,13 +66,58 @@ THRUSTER_WIDTH = 4
 THRUSTER_COLOR = (255, 100, 50, 180)
 SHOW_REVERSE_THRUSTER = True
 REVERSE_THRUSTER_LENGTH = 4
+REVERSE_THRUSTER_COLOR = (100, 150, 255, 180)  # Blue for reverse
+
+# Camera zoom
+ZOOM_MIN = 0.25  # Whole world fits on screen
+ZOOM_MAX = 2.0
+ZOOM_STEP = 1.25
+
+# Radar in the bottom-left corner of the HUD, stations shown in one colour
+RADAR_MARGIN = 10
+RADAR_STATION_COLOR = (255, 220, 80)
+
+# Level of detail, chosen from an object's radius on screen in pixels
+LOD_IMPOSTOR = 0  # Prerendered sprite, all impostors drawn in one batch
+LOD_SIMPLE = 1    # Simplified geometry
+LOD_FULL = 2
+LOD_SIMPLE_PIXELS = 32
+LOD_IMPOSTOR_PIXELS = 16
+SCENERY_LOD_SIZE = 16  # Fog, rocks, debris and beacons switch to impostors below 0.5x zoom
+
+# Gravity (G toggles): attractor mass is density * size^2
+PLANET_DENSITY = 1.0
+PULSAR_DENSITY = 8.0  # Small but dense
+DEBRIS_BINDING = 4.0      # Per second squared: pulls a piece back to its place in the field against the tides
+DEBRIS_DAMPING = 1.5      # Per second: pieces lose velocity relative to their field
+DEBRIS_MAX_SPREAD = 2.0   # Pieces stay within this multiple of the generated spread from the field centre
+
+# Stations orbiting generated planets are smaller than the showcase ones
+ORBITING_STATION_SIZE = 10
+
+# Mining stations sweep a mining beam that breaks up drifting rocks it dwells on
+MINING_SPLIT_TIME = 1.0
+
+# Trigger zones around stations and hazards
+DOCKING_RANGE = 1.6   # Times the station size
+DOCKING_SPEED = 10    # Slower than this in docking range counts as docked
+BEACON_RANGE = 60
+FLARE_WIDTH = 8       # World units across a flare's zone
+FLARE_PUSH = 120      # Acceleration along a flare at full intensity
+STATUS_COLOR = (255, 220, 80)
+HAZARD_MESSAGES = {
+    "beacon": "Warning beacon: hazard nearby",
+    "flare": "Caught in a solar flare",
+    "anomaly": "Energy anomaly",
+}
 
 class Star:
-    def __init__(self, x, y, size, opacity):
+    def __init__(self, x, y, size, opacity, rank=0.0):
         self.x = x
         self.y = y
         self.size = size
         self.opacity = opacity
+        self.rank = rank  # Random 0-1; drawn when below the star density setting
     
     def draw(self, camera_x, camera_y):
         color = (255, 255, 255, int(255 * self.opacity))
@@ -47,35 +126,24 @@ class Star:
         arcade.draw_circle_filled(screen_x, screen_y, self.size * SCREEN_SCALE, color)
 
 class StarField:
-    def __init__(self, width, height, star_count=200):  # Reduced from 400 to 200
-        self.stars = []
-        self.generate_stars(width, height, star_count)
-    
-    def generate_stars(self, width, height, star_count):
-        for _ in range(star_count):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            
-            # 80% small dim stars, 20% bright larger stars
-            if random.random() < 0.8:
-                size = 1.0
-                opacity = 0.6
-            else:
-                size = 1.5
-                opacity = 1.0
-            
-            self.stars.append(Star(x, y, size, opacity))
+    def __init__(self):
+        self.stars = []  # Filled one sector tile at a time by the world generator
     
-    def draw(self, camera_x, camera_y):
+    def add_stars(self, star_records):
+        for x, y, size, opacity, rank in star_records:
+            self.stars.append(Star(x, y, size, opacity, rank))
+    
+    def draw(self, camera_x, camera_y, density=1.0, view_width=SCREEN_WIDTH, view_height=SCREEN_HEIGHT):
         # Only draw stars that are visible on screen
         left = camera_x
-        right = camera_x + SCREEN_WIDTH
+        right = camera_x + view_width
         bottom = camera_y
-        top = camera_y + SCREEN_HEIGHT
+        top = camera_y + view_height
         
         for star in self.stars:
-            if (star.x >= left and star.x <= right and 
-                star.y >= bottom and star.y <= top):
+            if (star.rank < density and
+                star.x + star.size >= left and star.x - star.size <= right and 
+                star.y + star.size >= bottom and star.y - star.size <= top):
                 star.draw(camera_x, camera_y)
 
 class Planet:
@@ -84,14 +152,17 @@ class Planet:
         self.y = y
         self.size = size
         self.name, self.color, self.outline_color, self.detail_color = color_scheme
+        self.orbit = None  # Set when the body is put on an orbit
     
-    def draw(self, camera_x, camera_y):
+    def draw(self, camera_x, camera_y, detail=LOD_FULL):
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
         screen_size = self.size * SCREEN_SCALE
         
         # Draw planet body
         arcade.draw_circle_filled(screen_x, screen_y, screen_size, self.color)
+        if detail < LOD_FULL:
+            return
         
         # Draw planet outline for depth
         arcade.draw_circle_outline(screen_x, screen_y, screen_size, self.outline_color, 2)
@@ -108,7 +179,7 @@ class Planet:
             arcade.draw_circle_filled(feature_x, feature_y, screen_size * 0.15, self.detail_color)
 
 class SpaceFog:
-    def __init__(self, x, y, width, height, color, density):
+    def __init__(self, x, y, width, height, color, density, particles=None):
         self.x = x
         self.y = y
         self.width = width
@@ -116,24 +187,36 @@ class SpaceFog:
         self.color = color
         self.density = density
         self.particles = []
+        self.colors = None  # Per-particle colours, see particle_colors()
         
-        # Generate fog particles
-        for _ in range(int(density * 50)):
+        # Use particles generated by a worker when given
+        if particles is not None:
+            self.particles = particles
+            return
+        
+        # Generate fog particles (the quality governor draws a fraction of these)
+        for _ in range(int(density * 100)):
             px = x + random.uniform(-width/2, width/2)
             py = y + random.uniform(-height/2, height/2)
             size = random.uniform(3, 8)
             opacity = random.uniform(0.1, 0.3)
             self.particles.append((px, py, size, opacity))
     
-    def draw(self, camera_x, camera_y):
-        for px, py, size, opacity in self.particles:
+    def draw(self, camera_x, camera_y, particle_density=1.0):
+        particles = self.particles
+        colors = self.particle_colors()
+        for i in range(int(len(particles) * particle_density)):
+            px, py, size, opacity = particles[i]
             screen_x = (px - camera_x) * SCREEN_SCALE
             screen_y = (py - camera_y) * SCREEN_SCALE
-            
-            # Create color with opacity
+            arcade.draw_circle_filled(screen_x, screen_y, size * SCREEN_SCALE, colors[i])
+    
+    def particle_colors(self):
+        """Colour with opacity per particle, built once instead of every frame"""
+        if self.colors is None:
             r, g, b = self.color
-            fog_color = (r, g, b, int(255 * opacity))
-            arcade.draw_circle_filled(screen_x, screen_y, size * SCREEN_SCALE, fog_color)
+            self.colors = [(r, g, b, int(255 * opacity)) for _, _, _, opacity in self.particles]
+        return self.colors
 
 class EnergyAnomaly:
     def __init__(self, x, y, size, color):
@@ -148,7 +231,10 @@ class EnergyAnomaly:
         self.rotation += 45 * delta_time  # Rotate 45 degrees per second
         self.pulse += 3 * delta_time      # Pulse cycle
     
-    def draw(self, camera_x, camera_y):
+    def trigger_zone(self):
+        return TriggerZone(self, "anomaly", radius=self.size)
+    
+    def draw(self, camera_x, camera_y, detail=LOD_FULL):
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
         
@@ -156,8 +242,9 @@ class EnergyAnomaly:
         pulse_scale = 1.0 + 0.3 * math.sin(self.pulse)
         current_size = self.size * pulse_scale * SCREEN_SCALE
         
-        # Draw spinning energy rings
-        for ring in range(3):
+        # Draw spinning energy rings (only the middle one at reduced detail)
+        rings = range(3) if detail == LOD_FULL else range(1, 2)
+        for ring in rings:
             ring_size = current_size * (0.6 + ring * 0.2)
             ring_opacity = 100 - ring * 20
             
@@ -167,11 +254,23 @@ class EnergyAnomaly:
             # Draw multiple circles to create energy effect
             arcade.draw_circle_outline(screen_x, screen_y, ring_size, ring_color, 2)
 
+# Unit outline shared by every asteroid, made irregular by varying the radius per corner
+ASTEROID_SHAPE = [((0.8 + 0.4 * math.sin(i * 2.3)) * math.cos(i / 6 * 2 * math.pi),
+                   (0.8 + 0.4 * math.sin(i * 2.3)) * math.sin(i / 6 * 2 * math.pi)) for i in range(6)]
+
 class AsteroidCluster:
-    def __init__(self, x, y, count, spread):
+    def __init__(self, x, y, count, spread, asteroids=None):
         self.x = x
         self.y = y
+        self.spread = spread
         self.asteroids = []
+        self.dynamic = False  # Rocks handed to the AsteroidField are drawn and moved there
+        self.points = vertex_buffer(len(ASTEROID_SHAPE))  # Reused by every rock in draw()
+        
+        # Use rocks generated by a worker when given
+        if asteroids is not None:
+            self.asteroids = asteroids
+            return
         
         for _ in range(count):
             ax = x + random.uniform(-spread, spread)
@@ -182,22 +281,33 @@ class AsteroidCluster:
             self.asteroids.append((ax, ay, size, color))
     
     def draw(self, camera_x, camera_y):
+        points = self.points
         for ax, ay, size, color in self.asteroids:
             screen_x = (ax - camera_x) * SCREEN_SCALE
             screen_y = (ay - camera_y) * SCREEN_SCALE
+            radius = size * SCREEN_SCALE
             
             # Draw asteroid as irregular shape (approximated with polygon)
-            points = []
-            for i in range(6):
-                angle = (i / 6) * 2 * math.pi
-                # Add some randomness to make it irregular
-                radius = size * SCREEN_SCALE * (0.8 + 0.4 * math.sin(i * 2.3))
-                px = screen_x + radius * math.cos(angle)
-                py = screen_y + radius * math.sin(angle)
-                points.append((px, py))
+            for point, (px, py) in zip(points, ASTEROID_SHAPE):
+                point[0] = screen_x + radius * px
+                point[1] = screen_y + radius * py
             
             arcade.draw_polygon_filled(points, color)
 
+# Body and outline colours used when stations are drawn at reduced detail
+STATION_SIMPLE_COLORS = {
+    "command": ((120, 120, 140), (200, 200, 220)),
+    "fuel": ((150, 100, 50), (200, 150, 100)),
+    "bar": ((80, 50, 120), (150, 100, 200)),
+    "mining": ((100, 80, 60), (150, 120, 90)),
+    "research": ((100, 120, 150), (150, 180, 220)),
+    "trade": ((150, 120, 80), (200, 160, 120)),
+    "military": ((100, 100, 100), (150, 150, 150)),
+    "shipyard": ((80, 100, 120), (150, 150, 150)),
+    "medical": ((200, 200, 200), (255, 50, 50)),
+    "casino": ((50, 0, 50), (255, 215, 0))
+}
+
 class BaseStation:
     def __init__(self, x, y, size, station_type):
         self.x = x
@@ -209,11 +319,34 @@ class BaseStation:
         self.pulse = 0
         self.main_blink = True
         self.secondary_blink = False
+        self.orbit = None
+        self.beam_time = 0.0  # Seconds the mining beam has been on a drifting rock
+        
+        # Parts hang off the station's node in world units, so moving the station
+        # moves them with one matrix instead of recomputing their geometry
+        self.node = SceneNode(x, y)
+        self.parts = {}
+        if station_type == "command":
+            self.parts["hull"] = self.node.add(SceneNode(points=[
+                (size * math.cos(i / 6 * 2 * math.pi), size * math.sin(i / 6 * 2 * math.pi)) for i in range(6)]))
+            self.parts["arrays"] = self.node.add(SceneNode(points=[
+                (size * 0.7 * math.cos(i * math.pi / 2), size * 0.7 * math.sin(i * math.pi / 2)) for i in range(4)]))
+        elif station_type == "fuel":
+            self.parts["tanks"] = self.node.add(SceneNode(points=[
+                (size * 0.6 * math.cos(i / 3 * 2 * math.pi), size * 0.6 * math.sin(i / 3 * 2 * math.pi)) for i in range(3)]))
+    
+    def trigger_zone(self):
+        return TriggerZone(self, "dock", radius=self.size * DOCKING_RANGE)
+    
+    def turn_parts(self):
+        if "arrays" in self.parts:
+            self.parts["arrays"].set_rotation(self.rotation)
     
     def update(self, delta_time):
         self.blink_timer += delta_time
         self.rotation += 30 * delta_time
         self.pulse += 2 * delta_time
+        self.turn_parts()
         
         # Main lights blink every 2 seconds
         if self.blink_timer >= 2.0:
@@ -223,12 +356,15 @@ class BaseStation:
         # Secondary lights blink every 1 second (offset)
         self.secondary_blink = (self.blink_timer % 1.0) < 0.5
     
-    def draw(self, camera_x, camera_y):
+    def draw(self, camera_x, camera_y, detail=LOD_FULL):
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
         screen_size = self.size * SCREEN_SCALE
+        self.node.set_position(self.x, self.y)  # No-op unless the station moved
         
-        if self.station_type == "command":
+        if detail < LOD_FULL:
+            self.draw_simple_station(screen_x, screen_y, screen_size)
+        elif self.station_type == "command":
             self.draw_command_station(screen_x, screen_y, screen_size)
         elif self.station_type == "fuel":
             self.draw_fuel_station(screen_x, screen_y, screen_size)
@@ -249,14 +385,22 @@ class BaseStation:
         elif self.station_type == "casino":
             self.draw_casino_station(screen_x, screen_y, screen_size)
     
+    def part_points(self, part, x, y):
+        """World points of a part in the screen units of the draw methods, (x, y) being the station"""
+        return [(x + (px - self.x) * SCREEN_SCALE, y + (py - self.y) * SCREEN_SCALE)
+                for px, py in self.parts[part].world_points()]
+    
+    def draw_simple_station(self, x, y, size):
+        # Reduced detail: hull and the main blinking light only
+        body_color, outline_color = STATION_SIMPLE_COLORS[self.station_type]
+        arcade.draw_circle_filled(x, y, size * 0.8, body_color)
+        arcade.draw_circle_outline(x, y, size * 0.8, outline_color, 2)
+        if self.main_blink:
+            arcade.draw_circle_filled(x, y, 4, outline_color)
+    
     def draw_command_station(self, x, y, size):
         # Large hexagonal command center with rotating sections
-        points = []
-        for i in range(6):
-            angle = (i / 6) * 2 * math.pi
-            px = x + size * math.cos(angle)
-            py = y + size * math.sin(angle)
-            points.append((px, py))
+        points = self.part_points("hull", x, y)
         
         arcade.draw_polygon_filled(points, (120, 120, 140))
         arcade.draw_polygon_outline(points, (200, 200, 220), 3)
@@ -265,11 +409,8 @@ class BaseStation:
         arcade.draw_circle_filled(x, y, size * 0.5, (100, 100, 120))
         arcade.draw_circle_outline(x, y, size * 0.5, (150, 150, 170), 2)
         
-        # Rotating communication arrays
-        for i in range(4):
-            angle = math.radians(self.rotation + i * 90)
-            array_x = x + size * 0.7 * math.cos(angle)
-            array_y = y + size * 0.7 * math.sin(angle)
+        # Rotating communication arrays (the arrays node turns with self.rotation)
+        for array_x, array_y in self.part_points("arrays", x, y):
             arcade.draw_circle_filled(array_x, array_y, 4, (255, 255, 100))
         
         # Command lights
@@ -279,11 +420,8 @@ class BaseStation:
     def draw_fuel_station(self, x, y, size):
         # Cylindrical fuel tanks with connecting tubes
         # Main tanks
-        for i in range(3):
-            angle = (i / 3) * 2 * math.pi
-            tank_x = x + size * 0.6 * math.cos(angle)
-            tank_y = y + size * 0.6 * math.sin(angle)
-            
+        tanks = self.part_points("tanks", x, y)
+        for tank_x, tank_y in tanks:
             # Tank body
             arcade.draw_circle_filled(tank_x, tank_y, size * 0.3, (150, 100, 50))
             arcade.draw_circle_outline(tank_x, tank_y, size * 0.3, (200, 150, 100), 2)
@@ -296,10 +434,7 @@ class BaseStation:
         arcade.draw_circle_filled(x, y, size * 0.25, (100, 100, 100))
         
         # Fuel lines (connecting tubes)
-        for i in range(3):
-            angle = (i / 3) * 2 * math.pi
-            end_x = x + size * 0.6 * math.cos(angle)
-            end_y = y + size * 0.6 * math.sin(angle)
+        for end_x, end_y in tanks:
             arcade.draw_line(x, y, end_x, end_y, (100, 150, 100), 3)
     
     def draw_space_bar(self, x, y, size):
@@ -619,12 +754,18 @@ class Pulsar:
         self.color = color
         self.rotation = 0
         self.pulse = 0
+        
+        # Beam tips on a node that spins with the pulsar
+        self.node = SceneNode(x, y)
+        self.beams = self.node.add(SceneNode(points=[
+            (size * 2 * math.cos(i * math.pi / 2), size * 2 * math.sin(i * math.pi / 2)) for i in range(4)]))
     
     def update(self, delta_time):
         self.rotation += 90 * delta_time  # Fast rotation
         self.pulse += 4 * delta_time      # Fast pulse
+        self.beams.set_rotation(self.rotation)
     
-    def draw(self, camera_x, camera_y):
+    def draw(self, camera_x, camera_y, detail=LOD_FULL):
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
         
@@ -635,16 +776,18 @@ class Pulsar:
         # Draw bright core
         arcade.draw_circle_filled(screen_x, screen_y, core_size, self.color)
         
-        # Draw rotating energy beams
-        for beam in range(4):
-            beam_angle = math.radians(self.rotation + beam * 90)
-            beam_length = self.size * SCREEN_SCALE * 2
+        # Draw rotating energy beams (two opposing beams at reduced detail)
+        self.node.set_position(self.x, self.y)
+        tips = self.beams.world_points()
+        beam_length = self.size * SCREEN_SCALE * 2
+        for beam in range(0, 4, 1 if detail == LOD_FULL else 2):
+            tip_x, tip_y = tips[beam]
+            end_x = (tip_x - camera_x) * SCREEN_SCALE
+            end_y = (tip_y - camera_y) * SCREEN_SCALE
             
-            # Beam start and end points
-            start_x = screen_x + core_size * math.cos(beam_angle)
-            start_y = screen_y + core_size * math.sin(beam_angle)
-            end_x = screen_x + beam_length * math.cos(beam_angle)
-            end_y = screen_y + beam_length * math.sin(beam_angle)
+            # Beams start at the edge of the pulsing core
+            start_x = screen_x + (end_x - screen_x) * core_size / beam_length
+            start_y = screen_y + (end_y - screen_y) * core_size / beam_length
             
             # Draw beam with fading opacity
             r, g, b = self.color
@@ -664,6 +807,9 @@ class WarningBeacon:
             self.is_on = not self.is_on
             self.blink_timer = 0
     
+    def trigger_zone(self):
+        return TriggerZone(self, "beacon", radius=BEACON_RANGE)
+    
     def draw(self, camera_x, camera_y):
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
@@ -678,11 +824,19 @@ class WarningBeacon:
             arcade.draw_circle_filled(screen_x, screen_y, 12 * SCREEN_SCALE, (255, 200, 0, 50))
 
 class SpaceDebris:
-    def __init__(self, x, y, count, spread):
+    def __init__(self, x, y, count, spread, debris=None):
         self.x = x
         self.y = y
+        self.spread = spread
+        self.max_spread = spread * DEBRIS_MAX_SPREAD
         self.debris = []
         
+        # Use pieces generated by a worker when given
+        if debris is not None:
+            self.debris = debris
+            self.home = self.formation()
+            return
+        
         for _ in range(count):
             dx = x + random.uniform(-spread, spread)
             dy = y + random.uniform(-spread, spread)
@@ -691,22 +845,57 @@ class SpaceDebris:
             rotation_speed = random.uniform(-45, 45)
             
             # Different debris colors
-            debris_colors = [
-                (150, 150, 120),  # Metal
-                (100, 80, 60),    # Rusty
-                (80, 100, 120),   # Blue metal
-                (120, 100, 80)    # Brown
-            ]
-            color = random.choice(debris_colors)
+            color = random.choice(DEBRIS_COLORS)
             
-            self.debris.append([dx, dy, size, rotation, rotation_speed, color])
+            # Pieces start at rest; gravity gives them velocity
+            self.debris.append([dx, dy, size, rotation, rotation_speed, color, 0.0, 0.0])
+        self.home = self.formation()  # Offsets bind() holds the pieces near
+    
+    def formation(self):
+        """Each piece's offset from the pieces' mean position"""
+        if not self.debris:
+            return []
+        mean_x = sum(piece[0] for piece in self.debris) / len(self.debris)
+        mean_y = sum(piece[1] for piece in self.debris) / len(self.debris)
+        return [(piece[0] - mean_x, piece[1] - mean_y) for piece in self.debris]
     
     def update(self, delta_time):
         for debris in self.debris:
             debris[3] += debris[4] * delta_time  # Update rotation
     
+    def update_bounds(self):
+        """Re-centre the field on its pieces after gravity has moved them"""
+        if not self.debris:
+            return
+        self.x = sum(piece[0] for piece in self.debris) / len(self.debris)
+        self.y = sum(piece[1] for piece in self.debris) / len(self.debris)
+        self.spread = max(max(abs(piece[0] - self.x), abs(piece[1] - self.y)) for piece in self.debris)
+    
+    def bind(self, delta_time):
+        """Keep the pieces together as gravity moves them: the field drifts as a whole, pieces stay in formation"""
+        if not self.debris:
+            return
+        count = len(self.debris)
+        mean_vx = sum(piece[6] for piece in self.debris) / count
+        mean_vy = sum(piece[7] for piece in self.debris) / count
+        keep = math.exp(-DEBRIS_DAMPING * delta_time)
+        self.update_bounds()
+        limit = self.max_spread
+        pull = DEBRIS_BINDING * delta_time
+        for piece, (home_x, home_y) in zip(self.debris, self.home):
+            piece[6] = mean_vx + (piece[6] - mean_vx) * keep - (piece[0] - self.x - home_x) * pull
+            piece[7] = mean_vy + (piece[7] - mean_vy) * keep - (piece[1] - self.y - home_y) * pull
+            # A piece at the edge is held there, moving with the field
+            if abs(piece[0] - self.x) > limit:
+                piece[0] = self.x + math.copysign(limit, piece[0] - self.x)
+                piece[6] = mean_vx
+            if abs(piece[1] - self.y) > limit:
+                piece[1] = self.y + math.copysign(limit, piece[1] - self.y)
+                piece[7] = mean_vy
+        self.spread = min(self.spread, limit)
+    
     def draw(self, camera_x, camera_y):
-        for dx, dy, size, rotation, rotation_speed, color in self.debris:
+        for dx, dy, size, rotation, rotation_speed, color, _, _ in self.debris:
             screen_x = (dx - camera_x) * SCREEN_SCALE
             screen_y = (dy - camera_y) * SCREEN_SCALE
             
@@ -741,11 +930,19 @@ class SolarFlare:
         self.length = length
         self.intensity = 0
         self.pulse_timer = 0
+        self.orbit = None
     
     def update(self, delta_time):
         self.pulse_timer += delta_time * 2
         self.intensity = 0.5 + 0.5 * math.sin(self.pulse_timer)
     
+    def trigger_zone(self):
+        """The length of the flare, from its base outward"""
+        angle_rad = math.radians(self.direction)
+        return TriggerZone(self, "flare", half_length=self.length / 2, half_width=FLARE_WIDTH / 2,
+                           angle=self.direction, offset_x=math.cos(angle_rad) * self.length / 2,
+                           offset_y=math.sin(angle_rad) * self.length / 2)
+    
     def draw(self, camera_x, camera_y):
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
@@ -771,6 +968,92 @@ class SolarFlare:
             
             arcade.draw_line(start_x, start_y, finish_x, finish_y, flare_color, 2)
 
+class WorldLabel:
+    def __init__(self, text, x, y, color, font_size):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.color = color
+        self.font_size = font_size
+        self.text_object = None  # arcade.Text is created the first time the label is seen
+    
+    def draw(self, camera_x, camera_y):
+        screen_x = (self.x - camera_x) * SCREEN_SCALE
+        screen_y = (self.y - camera_y) * SCREEN_SCALE
+        
+        if self.text_object is None:
+            self.text_object = arcade.Text(self.text, screen_x, screen_y, self.color, self.font_size, anchor_x="center")
+        else:
+            self.text_object.position = (screen_x, screen_y)
+        
+        self.text_object.draw()
+
+class ImpostorLayer:
+    """Prerendered sprites that stand in for distant objects, drawn as one sprite batch.
+    
+    Sprite positions are float32 on the GPU, so they are stored relative to
+    the floating origin and shifted whenever it is rebased.
+    """
+    
+    def __init__(self):
+        self.sprite_list = arcade.SpriteList()
+        self.sprites = {}  # object -> (sprite, LOD size)
+        self.hidden = set()  # Objects drawn some other way for now
+        self.zoom = None
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+    
+    def add(self, obj, lod_size, radius, color, soft=False):
+        if obj in self.sprites:
+            return
+        
+        r, g, b = color[:3]
+        if soft:
+            texture = arcade.make_soft_circle_texture(64, (r, g, b, 255), center_alpha=color[3] if len(color) > 3 else 255)
+        else:
+            texture = arcade.make_circle_texture(32, (r, g, b, 255))
+        
+        # Sprites live in scaled coordinates relative to the origin, only touched on
+        # zoom changes, rebases and when their object moves
+        sprite = arcade.Sprite(texture, center_x=(obj.x - self.origin_x) * SCREEN_SCALE,
+                               center_y=(obj.y - self.origin_y) * SCREEN_SCALE)
+        sprite.width = sprite.height = radius * 2 * SCREEN_SCALE
+        sprite.visible = False
+        self.sprite_list.append(sprite)
+        self.sprites[obj] = (sprite, lod_size)
+        self.zoom = None
+    
+    def move(self, obj):
+        """Follow an object that has moved"""
+        entry = self.sprites.get(obj)
+        if entry:
+            entry[0].position = ((obj.x - self.origin_x) * SCREEN_SCALE, (obj.y - self.origin_y) * SCREEN_SCALE)
+    
+    def rebase(self, origin_x, origin_y):
+        """Re-express every sprite relative to a new floating origin"""
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        for obj in self.sprites:
+            self.move(obj)
+    
+    def hide(self, obj, hidden=True):
+        """Keep an object's sprite out of the batch whatever the zoom"""
+        if hidden:
+            self.hidden.add(obj)
+        else:
+            self.hidden.discard(obj)
+        self.zoom = None
+    
+    def update(self, zoom):
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
+        for obj, (sprite, lod_size) in self.sprites.items():
+            sprite.visible = lod_size * SCREEN_SCALE * zoom < LOD_IMPOSTOR_PIXELS and obj not in self.hidden
+    
+    def draw(self):
+        self.sprite_list.draw()
+
 class Camera:
     def __init__(self):
         self.x = 0
@@ -778,17 +1061,47 @@ class Camera:
         self.target_x = 0
         self.target_y = 0
         self.smoothing = 0.1
+        self.zoom = 1.0
+        self.target_zoom = 1.0
+    
+    @property
+    def view_width(self):
+        # World units visible across the screen at the current zoom
+        return SCREEN_WIDTH / self.zoom
+    
+    @property
+    def view_height(self):
+        return SCREEN_HEIGHT / self.zoom
+    
+    def zoom_by(self, factor):
+        self.target_zoom = max(ZOOM_MIN, min(self.target_zoom * factor, ZOOM_MAX))
     
     def follow_player(self, player_x, player_y):
         # Center camera on player
-        self.target_x = player_x - SCREEN_WIDTH // 2
-        self.target_y = player_y - SCREEN_HEIGHT // 2
-        
-        # Keep camera within world bounds
-        self.target_x = max(0, min(self.target_x, WORLD_WIDTH - SCREEN_WIDTH))
-        self.target_y = max(0, min(self.target_y, WORLD_HEIGHT - SCREEN_HEIGHT))
+        self.target_x = player_x - self.view_width / 2
+        self.target_y = player_y - self.view_height / 2
+        
+        # Keep camera within world bounds (centre the world when the view is larger than it)
+        if self.view_width >= WORLD_WIDTH:
+            self.target_x = (WORLD_WIDTH - self.view_width) / 2
+        else:
+            self.target_x = max(0, min(self.target_x, WORLD_WIDTH - self.view_width))
+        if self.view_height >= WORLD_HEIGHT:
+            self.target_y = (WORLD_HEIGHT - self.view_height) / 2
+        else:
+            self.target_y = max(0, min(self.target_y, WORLD_HEIGHT - self.view_height))
     
     def update(self, delta_time):
+        # Smooth zoom around the centre of the view
+        if self.zoom != self.target_zoom:
+            center_x = self.x + self.view_width / 2
+            center_y = self.y + self.view_height / 2
+            self.zoom += (self.target_zoom - self.zoom) * self.smoothing * 2
+            if abs(self.target_zoom - self.zoom) < 0.001:
+                self.zoom = self.target_zoom
+            self.x = center_x - self.view_width / 2
+            self.y = center_y - self.view_height / 2
+        
         # Smooth camera movement
         self.x += (self.target_x - self.x) * self.smoothing
         self.y += (self.target_y - self.y) * self.smoothing
@@ -802,6 +1115,13 @@ class Player:
         self.angle = 0  # 0 = pointing up
         self.size = SHIP_SIZE
         
+        # Local shapes are fixed; draw() transforms them into reused vertex buffers
+        self.hull_shape = ship_hull(self.size)
+        self.thruster_shape = thruster_shape(self.size, THRUSTER_WIDTH, THRUSTER_LENGTH)
+        self.reverse_thruster_shape = thruster_shape(self.size, THRUSTER_WIDTH * 0.8, REVERSE_THRUSTER_LENGTH)
+        self.hull_points = vertex_buffer(3)
+        self.thruster_points = vertex_buffer(4)
+        
         # Thruster state
         self.thrusting_forward = False
         self.thrusting_backward = False
@@ -809,6 +1129,7 @@ class Player:
         # Collision optimization
         self.collision_check_timer = 0
         self.collision_check_interval = 0.016  # Check collisions ~60fps instead of every frame
+        self.contact = None  # (x, y, direction away from the debris) of the last collision
     
     def update(self, delta_time, keys_pressed):
         # Handle rotation
@@ -874,7 +1195,7 @@ class Player:
         field_distance = field_dx * field_dx + field_dy * field_dy  # Use squared distance (faster)
         
         # Skip if ship is too far from debris field (rough estimate)
-        max_field_radius = 60  # Approximate debris field spread
+        max_field_radius = debris_field.spread * 2  # Approximate debris field radius
         if field_distance > (max_field_radius + 20) * (max_field_radius + 20):
             return False
         
@@ -910,6 +1231,10 @@ class Player:
                     self.x += pushback_x * overlap
                     self.y += pushback_y * overlap
                     
+                    # Where the hull touched, for sparks
+                    self.contact = (self.x - pushback_x * self.size, self.y - pushback_y * self.size,
+                                    math.degrees(math.atan2(pushback_x, pushback_y)))
+                    
                     return True  # Collision occurred - exit early
         
         return False  # No collision
@@ -918,32 +1243,16 @@ class Player:
         # Draw thruster first (behind ship)
         self.draw_thruster(camera_x, camera_y)
         
-        # Calculate triangle points
+        # Rotate and translate the triangle into the reused buffer
         angle_rad = math.radians(self.angle)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        # Triangle points (pointing up)
-        original_points = [
-            (0, self.size),                        # Top point
-            (-self.size * 0.8, -self.size * 0.6),  # Bottom left
-            (self.size * 0.8, -self.size * 0.6)    # Bottom right
-        ]
-        
-        # Rotate and translate points
-        rotated_points = []
-        for px, py in original_points:
-            rotated_x = px * cos_a + py * sin_a
-            rotated_y = -px * sin_a + py * cos_a
-            final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-            final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-            rotated_points.append((final_x, final_y))
+        transform_into(self.hull_points, self.hull_shape, self.x, self.y,
+                       math.cos(angle_rad), math.sin(angle_rad), camera_x, camera_y, SCREEN_SCALE)
         
         # Draw filled triangle
-        arcade.draw_polygon_filled(rotated_points, SHIP_FILL_COLOR)
+        arcade.draw_polygon_filled(self.hull_points, SHIP_FILL_COLOR)
         
         # Draw triangle outline
-        arcade.draw_polygon_outline(rotated_points, SHIP_BORDER_COLOR, BORDER_THICKNESS)
+        arcade.draw_polygon_outline(self.hull_points, SHIP_BORDER_COLOR, BORDER_THICKNESS)
     
     def draw_thruster(self, camera_x, camera_y):
         angle_rad = math.radians(self.angle)
@@ -952,58 +1261,15 @@ class Player:
         
         # Forward thruster
         if self.thrusting_forward:
-            gap = 1.5
-            thruster_length = THRUSTER_LENGTH
-            thruster_width = THRUSTER_WIDTH
-            
-            # Trapezoidal thruster shape
-            top_width = thruster_width
-            bottom_width = thruster_width * 0.8
-            
-            thruster_points = [
-                (-top_width * 0.5, -self.size * 0.6 - gap),
-                (top_width * 0.5, -self.size * 0.6 - gap),
-                (bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length),
-                (-bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length)
-            ]
-            
-            # Rotate and translate thruster points
-            rotated_thruster = []
-            for px, py in thruster_points:
-                rotated_x = px * cos_a + py * sin_a
-                rotated_y = -px * sin_a + py * cos_a
-                final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-                final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-                rotated_thruster.append((final_x, final_y))
-            
-            arcade.draw_polygon_filled(rotated_thruster, THRUSTER_COLOR)
+            transform_into(self.thruster_points, self.thruster_shape, self.x, self.y,
+                           cos_a, sin_a, camera_x, camera_y, SCREEN_SCALE)
+            arcade.draw_polygon_filled(self.thruster_points, THRUSTER_COLOR)
         
         # Reverse thruster
         if self.thrusting_backward and SHOW_REVERSE_THRUSTER:
-            gap = 1.5
-            thruster_length = REVERSE_THRUSTER_LENGTH
-            thruster_width = THRUSTER_WIDTH * 0.8
-            
-            top_width = thruster_width
-            bottom_width = thruster_width * 0.8
-            
-            thruster_points = [
-                (-top_width * 0.5, -self.size * 0.6 - gap),
-                (top_width * 0.5, -self.size * 0.6 - gap),
-                (bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length),
-                (-bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length)
-            ]
-            
-            rotated_thruster = []
-            for px, py in thruster_points:
-                rotated_x = px * cos_a + py * sin_a
-                rotated_y = -px * sin_a + py * cos_a
-                final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-                final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-                rotated_thruster.append((final_x, final_y))
-            
-            reverse_color = (100, 150, 255, 180)  # Blue for reverse
-            arcade.draw_polygon_filled(rotated_thruster, reverse_color)
+            transform_into(self.thruster_points, self.reverse_thruster_shape, self.x, self.y,
+                           cos_a, sin_a, camera_x, camera_y, SCREEN_SCALE)
+            arcade.draw_polygon_filled(self.thruster_points, REVERSE_THRUSTER_COLOR)
 
 
 class SpaceFlightGame(arcade.Window):
@@ -1016,6 +1282,36 @@ class SpaceFlightGame(arcade.Window):
         self.camera = None
         self.keys_pressed = set()
         
+        # World is drawn in screen units relative to Camera and zoomed on the GPU;
+        # impostor sprites are in scaled world units; the HUD is not zoomed.
+        # World and impostors render into a native-resolution framebuffer that is
+        # upscaled once; labels and HUD are drawn at window resolution after the blit.
+        self.render_target = PixelRenderTarget(self, SCREEN_WIDTH, SCREEN_HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.world_camera = self.render_target.camera()
+        self.impostor_camera = self.render_target.camera()
+        self.label_camera = arcade.Camera2D(viewport=LBWH(*self.render_target.viewport))
+        self.gui_camera = arcade.Camera2D()
+        
+        # Stars, fog, asteroids and planets that are not orbiting never move: they are drawn from cached tiles
+        self.tile_cache = TileCache(self, self.render_background_tile, SCREEN_SCALE)
+        self.impostors = ImpostorLayer()
+        
+        # World positions are doubles; float32 GPU buffers are kept relative to an
+        # origin that follows the camera so they stay precise in very large worlds
+        self.origin = FloatingOrigin()
+        self.origin.add_listener(self.impostors.rebase)
+        
+        # Exhaust and collision sparks, stored relative to the origin like the impostors
+        self.particles = ParticleSystem(self.ctx)
+        self.origin.add_listener(self.particles.rebase)
+        
+        # Asteroid clusters are static until R hands their rocks to the collision simulation
+        self.asteroid_field = AsteroidField(self.ctx, ASTEROID_SHAPE, (0, 0, WORLD_WIDTH, WORLD_HEIGHT))
+        self.origin.add_listener(self.asteroid_field.rebase)
+        
+        # Runs of plain arcade shapes are collected and drawn in a few calls (F6 toggles)
+        self.batcher = DrawBatcher(self.ctx)
+        
         # Space objects
         self.planets = []
         self.space_fog = []
@@ -1028,6 +1324,20 @@ class SpaceFlightGame(arcade.Window):
         self.solar_flares = []
         self.labels = []  # Text labels for components
         
+        # Planets, stations and flares on orbits are moved from the clock every update;
+        # planets, stations and pulsars are culled through a grid that follows them
+        self.orbits = OrbitSystem()
+        self.orbit_time = 0.0  # Game clock the orbits are evaluated at, kept in snapshots
+        self.body_index = SpatialGrid()
+        
+        # Radar of the bodies around the player, fed by the culling grid and redrawn at 10Hz
+        self.radar = Radar(self, self.body_index.query_radius, self.radar_blip)
+        
+        # Beams resolve instantly by walking the cells of this grid of stations, debris
+        # fields and asteroid clusters along the ray (SPACE fires the ship's laser)
+        self.target_index = SpatialGrid()
+        self.beams = BeamSystem(self.cast_beam, lambda: self.target_index.ray_cells + self.asteroid_field.ray_cells)
+        
         # FPS display
         self.fps_text = arcade.Text("FPS: --", 
                                    WINDOW_WIDTH - 100, 
@@ -1042,18 +1352,198 @@ class SpaceFlightGame(arcade.Window):
                                       arcade.color.WHITE, 
                                       12)
         
+        # Docking and hazard messages from the trigger zones the ship is in
+        self.status_text = arcade.Text("", WINDOW_WIDTH // 2, WINDOW_HEIGHT - 30, STATUS_COLOR, 14, anchor_x="center")
+        self.status_zone = None
+        
+        # Enter, stay and exit events for the ship around stations, beacons, flares and anomalies
+        self.triggers = TriggerSystem()
+        self.triggers.on("dock", self.on_dock_zone)
+        for kind in HAZARD_MESSAGES:
+            self.triggers.on(kind, self.on_hazard_zone)
+        
         self.frame_delta_time = 0.0
+        self.world_builder = None
+        
+        # Optional Barnes-Hut gravity from planets and pulsars
+        self.gravity = GravitySimulation()
+        
+        # Fixed 60Hz updates; draw pacing is vsync, capped or uncapped (F5)
+        self.pacer = FramePacer(self)
+        
+        # Cyclic GC runs in the idle part of frames once the world is frozen after setup
+        self.gc_manager = GCManager()
+        self.pacer.idle_tasks.append(self.gc_manager.idle)
+        self.sector_streamer = None
+        
+        # Ship, camera and body animation as one binary string for instant resume (F7 saves, F8 restores)
+        self.snapshots = self.create_snapshotter()
+        
+        # Opt-in sampling profiler (LITTLESPACE_PROFILE=1, F9 captures on demand)
+        self.profiler = None
+        if profiler_enabled():
+            self.profiler = SamplingProfiler("space_flight")
+            self.profiler.start()
+        
+        # Opt-in allocation tracking per phase (LITTLESPACE_ALLOC=1, F10 prints the top lines)
+        self.allocations = AllocationTracker("space_flight")
+        
+        # Runtime quality governor, knobs listed in the order they are reduced.
+        # Start levels match the previous hand-tuned settings.
+        self.quality = QualityGovernor()
+        self.quality.add_knob("fog_density", [0.25, 0.5, 1.0], start_level=1)
+        self.quality.add_knob("star_density", [0.25, 0.5, 0.75, 1.0], start_level=1)
+        self.quality.add_knob("particle_budget", [5000, 20000, 50000])
+        self.quality.add_knob("station_detail", [LOD_SIMPLE, LOD_FULL])
+        self.quality.add_knob("labels", [False, True])
+        
+        # Profiler panel (F3), F4 toggles the governor
+        self.profiler_overlay = ProfilerOverlay(10, WINDOW_HEIGHT - 10)
+        self.profiler_overlay.add_section("quality", self.quality.profiler_lines)
+        self.profiler_overlay.add_section("frame pacing", self.pacer.profiler_lines)
+        self.profiler_overlay.add_section("background tiles", self.tile_cache.profiler_lines)
+        self.profiler_overlay.add_section("gravity", self.gravity.profiler_lines)
+        self.profiler_overlay.add_section("orbits", self.orbits.profiler_lines)
+        self.profiler_overlay.add_section("radar", self.radar.profiler_lines)
+        self.profiler_overlay.add_section("particles", self.particles.profiler_lines)
+        self.profiler_overlay.add_section("asteroids", self.asteroid_field.profiler_lines)
+        self.profiler_overlay.add_section("beams", self.beams.profiler_lines)
+        self.profiler_overlay.add_section("triggers", self.triggers.profiler_lines)
+        self.profiler_overlay.add_section("draw batching", self.batcher.profiler_lines)
+        self.profiler_overlay.add_section("floating origin", self.origin.profiler_lines)
+        self.profiler_overlay.add_section("garbage collector", self.gc_manager.profiler_lines)
+        self.profiler_overlay.add_section("allocations", self.allocations.profiler_lines)
+        self.profiler_overlay.add_section("snapshots", self.snapshots.profiler_lines)
+    
+    def create_snapshotter(self):
+        """Player, camera, the orbit clock, drifting debris and rocks, and the animation of bodies.
+
+        The world is rebuilt from its seed and orbiting bodies are placed from
+        the orbit clock, so only that time and the animation phases of bodies
+        are saved; debris pieces and, while dynamic asteroids are on, the
+        rocks are saved whole. Body lists only grow as sectors stream in; a
+        restore leaves bodies loaded since the save as they are. Rocks replay
+        exactly when they were on at both the save and the restore.
+        """
+        snapshots = WorldSnapshotter()
+        snapshots.add_section("clock", lambda: [self], ObjectLayout(
+            [("orbit_time", "d")], restored=lambda game: game.update_orbits()))
+        snapshots.add_section("player", lambda: [self.player], ObjectLayout(
+            [("x", "d"), ("y", "d"), ("velocity_x", "d"), ("velocity_y", "d"), ("angle", "d"),
+             ("thrusting_forward", "?"), ("thrusting_backward", "?"), ("collision_check_timer", "d")]))
+        snapshots.add_section("camera", lambda: [self.camera], ObjectLayout(
+            [("x", "d"), ("y", "d"), ("target_x", "d"), ("target_y", "d"), ("zoom", "d"), ("target_zoom", "d")]))
+        snapshots.add_section("stations", lambda: self.space_stations, ObjectLayout(
+            [("blink_timer", "d"), ("rotation", "d"), ("pulse", "d"), ("main_blink", "?"), ("secondary_blink", "?")],
+            restored=BaseStation.turn_parts))
+        snapshots.add_section("pulsars", lambda: self.pulsars, ObjectLayout(
+            [("rotation", "d"), ("pulse", "d")], restored=lambda pulsar: pulsar.beams.set_rotation(pulsar.rotation)))
+        snapshots.add_section("anomalies", lambda: self.energy_anomalies, ObjectLayout(
+            [("rotation", "d"), ("pulse", "d")]))
+        snapshots.add_section("beacons", lambda: self.warning_beacons, ObjectLayout(
+            [("blink_timer", "d"), ("is_on", "?")]))
+        snapshots.add_section("flares", lambda: self.solar_flares, ObjectLayout(
+            [("pulse_timer", "d"), ("intensity", "d")]))
+        snapshots.add_section("debris pieces", lambda: [piece for field in self.space_debris for piece in field.debris],
+                              ObjectLayout([(0, "d"), (1, "d"), (3, "d"), (6, "d"), (7, "d")], items=True))
+        snapshots.add_section("debris fields", lambda: self.space_debris, ObjectLayout(
+            [("x", "d"), ("y", "d"), ("spread", "d")], restored=self.debris_moved))
+        snapshots.add_section("asteroid field", lambda: [self.asteroid_field], ObjectLayout(
+            [("enabled", "?")], restored=self.asteroids_restored))
+        snapshots.add_section("rocks", self.asteroid_field.rows, ObjectLayout(
+            [(index, "d") for index in range(8)] + [(8, "i")], create=lambda: [0.0] * 8 + [0], items=True),
+            restored=self.asteroid_field.load_rows)
+        return snapshots
     
     def setup(self):
         # Start player in center of world
         self.player = Player(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
-        self.starfield = StarField(WORLD_WIDTH, WORLD_HEIGHT)
+        self.starfield = StarField()
         self.camera = Camera()
         
-        # Generate space objects around starting area
-        self.generate_space_objects()
+        # The showcase is built over the first frames so the window shows immediately
+        self.world_builder = WorldBuilder(self.generate_space_objects())
+        
+        # Star tiles and the rest of space are generated in worker processes as the camera approaches
+        self.sector_streamer = SectorStreamer(self.merge_sector, WORLD_WIDTH, WORLD_HEIGHT,
+                                              exclude_rects=[SHOWCASE_RECT])
+        self.sector_streamer.request_around(self.player.x, self.player.y, SCREEN_WIDTH)
+        self.profiler_overlay.add_section("world generation", self.sector_streamer.profiler_lines)
+    
+    def merge_sector(self, sector_x, sector_y, data):
+        """Generator that adds a generated sector's objects to the world, one object per step"""
+        left = sector_x * SECTOR_SIZE
+        bottom = sector_y * SECTOR_SIZE
+        self.starfield.add_stars(world_records(data["stars"], 5, left, bottom))
+        yield
+        
+        particles = world_records(data["fog_parts"], 4, left, bottom)
+        offset = 0
+        for x, y, width, height, color_index, count in world_records(data["fog"], 6, left, bottom):
+            count = int(count)
+            fog = SpaceFog(x, y, width, height, FOG_COLORS[int(color_index)], count / 100,
+                           particles[offset:offset + count])
+            offset += count
+            self.space_fog.append(fog)
+            yield
+        
+        rocks = world_records(data["rocks"], 4, left, bottom)
+        offset = 0
+        for x, y, spread, count in world_records(data["asteroids"], 4, left, bottom):
+            count = int(count)
+            asteroids = [(ax, ay, size, (int(gray), int(gray), int(gray)))
+                         for ax, ay, size, gray in rocks[offset:offset + count]]
+            offset += count
+            self.asteroid_clusters.append(AsteroidCluster(x, y, count, spread, asteroids))
+            yield
+        
+        pieces = world_records(data["pieces"], 6, left, bottom)
+        offset = 0
+        for x, y, spread, count in world_records(data["debris"], 4, left, bottom):
+            count = int(count)
+            debris = [[dx, dy, size, rotation, rotation_speed, DEBRIS_COLORS[int(color_index)], 0.0, 0.0]
+                      for dx, dy, size, rotation, rotation_speed, color_index in pieces[offset:offset + count]]
+            offset += count
+            self.space_debris.append(SpaceDebris(x, y, count, spread, debris))
+            yield
+        
+        for x, y, size, type_index in world_records(data["stations"], 4, left, bottom):
+            self.space_stations.append(BaseStation(x, y, size, STATION_TYPES[int(type_index)]))
+            yield
+        
+        # Star systems: planets orbit the star, stations orbit the planets, flares stay on their planet
+        planets = records(data["planets"], 10)
+        offset = 0
+        for x, y, star_size, color_index, count in world_records(data["systems"], 5, left, bottom):
+            count = int(count)
+            star = Pulsar(x, y, star_size, STAR_COLORS[int(color_index)])
+            self.pulsars.append(star)
+            star_mass = star_size * star_size * PULSAR_DENSITY
+            for (radius, eccentricity, periapsis, phase, size, scheme_index,
+                 station_index, station_radius, station_phase, flare_direction) in planets[offset:offset + count]:
+                planet = Planet(x, y, size, PLANET_SCHEMES[int(scheme_index)])
+                self.orbits.add(planet, star, radius, eccentricity, periapsis, phase, parent_mass=star_mass)
+                self.planets.append(planet)
+                if station_index >= 0:
+                    station = BaseStation(x, y, ORBITING_STATION_SIZE, STATION_TYPES[int(station_index)])
+                    self.orbits.add(station, planet, station_radius, mean_anomaly=station_phase,
+                                    parent_mass=size * size * PLANET_DENSITY, clockwise=True)
+                    self.space_stations.append(station)
+                if flare_direction >= 0:
+                    flare = SolarFlare(x, y, flare_direction, size * 2)
+                    self.orbits.attach(flare, planet)
+                    self.solar_flares.append(flare)
+            offset += count
+            yield
+        
+        self.index_bodies()
+        self.build_impostors()
+        
+        # Fog can reach a little past the sector edge
+        self.tile_cache.invalidate_rect(left - 20, bottom - 20, left + SECTOR_SIZE + 20, bottom + SECTOR_SIZE + 20)
     
     def generate_space_objects(self):
+        """Generator that builds the showcase layout one object per step"""
         # Create organized showcase layout
         center_x = WORLD_WIDTH // 2
         center_y = WORLD_HEIGHT // 2
@@ -1085,6 +1575,7 @@ class SpaceFlightGame(arcade.Window):
             
             station = BaseStation(x, y, size, station_type)
             self.space_stations.append(station)
+            yield
         
         # Row 2: Planets (Second row)
         planet_data = [
@@ -1106,6 +1597,7 @@ class SpaceFlightGame(arcade.Window):
             
             planet = Planet(x, y, size, planet_scheme)
             self.planets.append(planet)
+            yield
         
         # Row 3: Energy Phenomena (Third row - center)
         row_y = center_y
@@ -1117,6 +1609,7 @@ class SpaceFlightGame(arcade.Window):
             y = row_y
             pulsar = Pulsar(x, y, 15, color)
             self.pulsars.append(pulsar)
+            yield
         
         # Energy Anomalies
         energy_colors = [(255, 100, 255), (100, 255, 255), (255, 255, 100)]
@@ -1125,6 +1618,7 @@ class SpaceFlightGame(arcade.Window):
             y = row_y
             anomaly = EnergyAnomaly(x, y, 25, color)
             self.energy_anomalies.append(anomaly)
+            yield
         
         # Row 4: Environmental Effects (Fourth row)
         row_y = center_y - spacing_y
@@ -1143,10 +1637,12 @@ class SpaceFlightGame(arcade.Window):
             y = row_y
             fog = SpaceFog(x, y, 80, 60, color, 0.5)
             self.space_fog.append(fog)
+            yield
         
         # Asteroid Cluster
         cluster = AsteroidCluster(center_x + spacing_x * 2.5, row_y, 10, 40)
         self.asteroid_clusters.append(cluster)
+        yield
         
         # Row 5: Navigation & Debris (Bottom row)
         row_y = center_y - spacing_y * 2
@@ -1157,6 +1653,7 @@ class SpaceFlightGame(arcade.Window):
             y = row_y
             beacon = WarningBeacon(x, y)
             self.warning_beacons.append(beacon)
+            yield
         
         # Space Debris
         for i in range(3):
@@ -1164,6 +1661,7 @@ class SpaceFlightGame(arcade.Window):
             y = row_y
             debris = SpaceDebris(x, y, 8, 30)
             self.space_debris.append(debris)
+            yield
         
         # Solar Flares (attached to first 3 planets)
         for i, planet in enumerate(self.planets[:3]):
@@ -1171,7 +1669,9 @@ class SpaceFlightGame(arcade.Window):
                 direction = flare_num * 90 + i * 30  # Organized directions
                 length = 60
                 flare = SolarFlare(planet.x, planet.y, direction, length)
+                self.orbits.attach(flare, planet)
                 self.solar_flares.append(flare)
+                yield
         
         # Add subtle teal fog patches around the space environment
         # Using teal colors from the user's image with subtle opacity
@@ -1197,6 +1697,7 @@ class SpaceFlightGame(arcade.Window):
             color = teal_colors[i % len(teal_colors)]
             fog = SpaceFog(x, y, width, height, color, density)
             self.space_fog.append(fog)
+            yield
         
         # Create labels for each section
         label_offset_y = 40  # Distance above objects
@@ -1212,12 +1713,12 @@ class SpaceFlightGame(arcade.Window):
         for i, name in enumerate(station_names):
             x = start_x + i * spacing_x
             y = row_y + label_offset_y
-            label = arcade.Text(name, x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel(name, x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         # Section header for stations
         header_y = row_y + label_offset_y + 25
-        header = arcade.Text("SPACE STATIONS", center_x * SCREEN_SCALE, header_y * SCREEN_SCALE, arcade.color.YELLOW, 16, anchor_x="center")
+        header = WorldLabel("SPACE STATIONS", center_x, header_y, arcade.color.YELLOW, 16)
         self.labels.append(header)
         
         # Row 2 Labels - Planets
@@ -1228,11 +1729,11 @@ class SpaceFlightGame(arcade.Window):
         for i, name in enumerate(planet_names):
             x = start_x + i * spacing_x
             y = row_y + label_offset_y
-            label = arcade.Text(name, x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel(name, x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         header_y = row_y + label_offset_y + 25
-        header = arcade.Text("PLANETS", center_x * SCREEN_SCALE, header_y * SCREEN_SCALE, arcade.color.YELLOW, 16, anchor_x="center")
+        header = WorldLabel("PLANETS", center_x, header_y, arcade.color.YELLOW, 16)
         self.labels.append(header)
         
         # Row 3 Labels - Energy Phenomena
@@ -1243,7 +1744,7 @@ class SpaceFlightGame(arcade.Window):
         for i, name in enumerate(pulsar_names):
             x = center_x - spacing_x * 2 + i * spacing_x
             y = row_y + label_offset_y
-            label = arcade.Text(name, x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel(name, x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         # Anomaly labels
@@ -1251,11 +1752,11 @@ class SpaceFlightGame(arcade.Window):
         for i, name in enumerate(anomaly_names):
             x = center_x + spacing_x * 0.5 + i * spacing_x
             y = row_y + label_offset_y
-            label = arcade.Text(name, x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel(name, x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         header_y = row_y + label_offset_y + 25
-        header = arcade.Text("ENERGY PHENOMENA", center_x * SCREEN_SCALE, header_y * SCREEN_SCALE, arcade.color.YELLOW, 16, anchor_x="center")
+        header = WorldLabel("ENERGY PHENOMENA", center_x, header_y, arcade.color.YELLOW, 16)
         self.labels.append(header)
         
         # Row 4 Labels - Environmental Effects
@@ -1266,15 +1767,15 @@ class SpaceFlightGame(arcade.Window):
         for i, name in enumerate(fog_names):
             x = center_x - spacing_x * 2.5 + i * spacing_x
             y = row_y + label_offset_y
-            label = arcade.Text(name, x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel(name, x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         # Asteroid label
-        asteroid_label = arcade.Text("Asteroids", (center_x + spacing_x * 2.5) * SCREEN_SCALE, (row_y + label_offset_y) * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+        asteroid_label = WorldLabel("Asteroids", center_x + spacing_x * 2.5, row_y + label_offset_y, arcade.color.WHITE, 12)
         self.labels.append(asteroid_label)
         
         header_y = row_y + label_offset_y + 25
-        header = arcade.Text("ENVIRONMENTAL EFFECTS", center_x * SCREEN_SCALE, header_y * SCREEN_SCALE, arcade.color.YELLOW, 16, anchor_x="center")
+        header = WorldLabel("ENVIRONMENTAL EFFECTS", center_x, header_y, arcade.color.YELLOW, 16)
         self.labels.append(header)
         
         # Row 5 Labels - Navigation & Debris
@@ -1284,7 +1785,7 @@ class SpaceFlightGame(arcade.Window):
         for i in range(5):
             x = center_x - spacing_x * 2 + i * spacing_x
             y = row_y + label_offset_y
-            label = arcade.Text("Beacon", x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel("Beacon", x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         # Debris labels
@@ -1292,152 +1793,601 @@ class SpaceFlightGame(arcade.Window):
         for i, name in enumerate(debris_names):
             x = center_x + spacing_x * 1.5 + i * spacing_x * 0.8
             y = row_y + label_offset_y
-            label = arcade.Text(name, x * SCREEN_SCALE, y * SCREEN_SCALE, arcade.color.WHITE, 12, anchor_x="center")
+            label = WorldLabel(name, x, y, arcade.color.WHITE, 12)
             self.labels.append(label)
         
         header_y = row_y + label_offset_y + 25
-        header = arcade.Text("NAVIGATION & DEBRIS", center_x * SCREEN_SCALE, header_y * SCREEN_SCALE, arcade.color.YELLOW, 16, anchor_x="center")
+        header = WorldLabel("NAVIGATION & DEBRIS", center_x, header_y, arcade.color.YELLOW, 16)
         self.labels.append(header)
         
     
+    def index_bodies(self):
+        """Add new planets, stations and pulsars to the culling grid, beam targets to theirs and trigger zones"""
+        for planet in self.planets:
+            self.body_index.insert(planet, planet.size)
+        for station in self.space_stations:
+            self.body_index.insert(station, station.size)
+            self.target_index.insert(station, station.size)
+        for pulsar in self.pulsars:
+            self.body_index.insert(pulsar, pulsar.size * 2)
+        for debris in self.space_debris:
+            self.target_index.insert(debris, debris.spread * 2)
+        for cluster in self.asteroid_clusters:
+            self.target_index.insert(cluster, cluster.spread * 2)
+        for owner in self.space_stations + self.warning_beacons + self.solar_flares + self.energy_anomalies:
+            if owner not in self.triggers.zones:
+                self.triggers.attach(owner.trigger_zone())
+    
+    def show_status(self, zone, text):
+        self.status_zone = zone
+        if self.status_text.text != text:
+            self.status_text.text = text
+    
+    def clear_status(self, zone):
+        if self.status_zone is zone:
+            self.status_zone = None
+            self.status_text.text = ""
+    
+    def on_dock_zone(self, event, zone, body, delta_time):
+        """Docking range around stations; slow enough inside it counts as docked"""
+        if event == "exit":
+            self.clear_status(zone)
+            return
+        docked = math.hypot(body.velocity_x, body.velocity_y) < DOCKING_SPEED
+        self.show_status(zone, f"{'Docked at' if docked else 'In docking range of'} "
+                               f"{zone.owner.station_type} station")
+    
+    def on_hazard_zone(self, event, zone, body, delta_time):
+        """Warnings for beacons, flares and anomalies; a flare pushes the ship along it"""
+        if event == "exit":
+            self.clear_status(zone)
+            return
+        if event == "enter" or self.status_zone is None:
+            # A zone still around the ship takes the line back when the one showing is left
+            self.show_status(zone, HAZARD_MESSAGES[zone.kind])
+        if zone.kind == "flare":
+            push = FLARE_PUSH * zone.owner.intensity * delta_time
+            body.velocity_x += zone.cos * push
+            body.velocity_y += zone.sin * push
+    
+    def cast_beam(self, x0, y0, x1, y1):
+        """First station, debris piece or asteroid on a segment: (target, distance, part) or None"""
+        hit = self.target_index.raycast(x0, y0, x1, y1, self.beam_intersect)
+        if self.asteroid_field.enabled:
+            rock = self.asteroid_field.raycast(x0, y0, x1, y1)
+            if rock is not None and (hit is None or rock[1] < hit[1]):
+                hit = (self.asteroid_field, rock[1], rock[0])
+        return hit
+    
+    def beam_intersect(self, obj, x0, y0, unit_x, unit_y, length):
+        """Where a ray first hits a station, or which piece of a debris field or static cluster it hits"""
+        if isinstance(obj, BaseStation):
+            distance = ray_circle(x0, y0, unit_x, unit_y, length, obj.x, obj.y, obj.size * 0.8)
+            return None if distance is None else (distance, None)
+        if isinstance(obj, AsteroidCluster):
+            if obj.dynamic:
+                return None  # Its rocks are in the asteroid field
+            pieces = obj.asteroids
+        else:
+            pieces = obj.debris
+        if ray_circle(x0, y0, unit_x, unit_y, length, obj.x, obj.y, obj.spread * 2) is None:
+            return None
+        hit = None
+        for index, piece in enumerate(pieces):
+            distance = ray_circle(x0, y0, unit_x, unit_y, length, piece[0], piece[1], piece[2])
+            if distance is not None:
+                hit = (distance, index)
+                length = distance
+        return hit
+    
+    def fire_beams(self, delta_time):
+        """The ship's laser while SPACE is held and the sweeping beams of visible mining stations"""
+        self.beams.update(delta_time)
+        splits = set()  # Rocks to break once every beam has fired; a split reorders the field's broadphase
+        if arcade.key.SPACE in self.keys_pressed:
+            angle_rad = math.radians(self.player.angle)
+            hit = self.beams.fire("laser", self.player, self.player.x + math.sin(angle_rad) * self.player.size,
+                                  self.player.y + math.cos(angle_rad) * self.player.size, self.player.angle)
+            if hit is not None:
+                target, _, part, hit_x, hit_y = hit
+                self.particles.emit("impact", hit_x, hit_y, self.player.angle + 180)
+                if target is self.asteroid_field:
+                    splits.add(part)
+        
+        for station in self.visible_bodies():
+            if not isinstance(station, BaseStation) or station.station_type != "mining":
+                continue
+            if self.detail_level(station.size) == LOD_IMPOSTOR or not self.is_visible(station.x, station.y, station.size):
+                continue
+            angle_rad = math.radians(station.rotation)
+            hit = self.beams.fire("mining", station, station.x + math.sin(angle_rad) * station.size,
+                                  station.y + math.cos(angle_rad) * station.size, station.rotation)
+            if hit is None:
+                station.beam_time = 0.0
+                continue
+            target, _, part, hit_x, hit_y = hit
+            self.particles.emit("sparks", hit_x, hit_y, station.rotation + 180, count=2)
+            if target is not self.asteroid_field:
+                station.beam_time = 0.0
+                continue
+            station.beam_time += delta_time
+            if station.beam_time >= MINING_SPLIT_TIME:
+                station.beam_time = 0.0
+                splits.add(part)
+        
+        # Highest index first, so removing a rock never moves another queued one
+        for index in sorted(splits, reverse=True):
+            self.asteroid_field.split(index)
+    
+    def visible_bodies(self):
+        """Planets, stations and pulsars near the view, from the culling grid"""
+        return self.body_index.query_rect(self.camera.x, self.camera.y,
+                                          self.camera.x + self.camera.view_width,
+                                          self.camera.y + self.camera.view_height)
+    
+    def radar_blip(self, body):
+        """Radar colour and size in texels for a planet, station or pulsar"""
+        if isinstance(body, Planet):
+            return body.color, 3
+        if isinstance(body, BaseStation):
+            return RADAR_STATION_COLOR, 2
+        return body.color, 2
+    
+    def build_impostors(self):
+        """Register impostor sprites for everything that can be drawn as one"""
+        for station in self.space_stations:
+            body_color, _ = STATION_SIMPLE_COLORS[station.station_type]
+            self.impostors.add(station, station.size, station.size * 0.8, body_color)
+        for planet in self.planets:
+            self.impostors.add(planet, planet.size, planet.size, planet.color)
+        for pulsar in self.pulsars:
+            self.impostors.add(pulsar, pulsar.size * 2, pulsar.size, pulsar.color, soft=True)
+        for anomaly in self.energy_anomalies:
+            self.impostors.add(anomaly, anomaly.size, anomaly.size, anomaly.color + (120,), soft=True)
+        for fog in self.space_fog:
+            self.impostors.add(fog, SCENERY_LOD_SIZE, max(fog.width, fog.height) / 2, fog.color + (60,), soft=True)
+        for cluster in self.asteroid_clusters:
+            self.impostors.add(cluster, SCENERY_LOD_SIZE, cluster.spread, (140, 140, 140, 160), soft=True)
+        for debris in self.space_debris:
+            self.impostors.add(debris, SCENERY_LOD_SIZE, debris.spread, (120, 100, 80, 160), soft=True)
+        for beacon in self.warning_beacons:
+            self.impostors.add(beacon, SCENERY_LOD_SIZE, 6, (255, 150, 0))
+    
+    def detail_level(self, lod_size):
+        """Level of detail for an object whose radius in world units is lod_size.
+        
+        Chosen for the zoom the camera is settling at, so cached tiles and
+        impostors agree with the directly drawn objects during a zoom.
+        """
+        screen_radius = lod_size * SCREEN_SCALE * self.camera.target_zoom
+        if screen_radius < LOD_IMPOSTOR_PIXELS:
+            return LOD_IMPOSTOR
+        if screen_radius < LOD_SIMPLE_PIXELS:
+            return LOD_SIMPLE
+        return LOD_FULL
+    
     def is_visible(self, obj_x, obj_y, obj_size=50):
         """Check if object is visible on screen (frustum culling)"""
-        # Calculate screen boundaries in world coordinates
+        # Calculate screen boundaries in world coordinates (follows the zoomed view)
         left = self.camera.x - obj_size
-        right = self.camera.x + SCREEN_WIDTH + obj_size
+        right = self.camera.x + self.camera.view_width + obj_size
         bottom = self.camera.y - obj_size
-        top = self.camera.y + SCREEN_HEIGHT + obj_size
+        top = self.camera.y + self.camera.view_height + obj_size
         
         # Check if object is within visible area
         return (obj_x >= left and obj_x <= right and 
                 obj_y >= bottom and obj_y <= top)
     
+    def render_background_tile(self, left, bottom, texel_scale):
+        """Draw the static scenery overlapping one background tile (called by the tile cache)"""
+        right = left + TILE_SIZE
+        top = bottom + TILE_SIZE
+        
+        def overlaps(x, y, radius):
+            return left - radius <= x <= right + radius and bottom - radius <= y <= top + radius
+        
+        self.batcher.begin()
+        self.starfield.draw(left, bottom, self.quality.value("star_density"), TILE_SIZE, TILE_SIZE)
+        
+        draw_scenery = self.detail_level(SCENERY_LOD_SIZE) != LOD_IMPOSTOR
+        if draw_scenery:
+            fog_density = self.quality.value("fog_density")
+            for fog in self.space_fog:
+                if overlaps(fog.x, fog.y, max(fog.width, fog.height) / 2 + 8):
+                    fog.draw(left, bottom, fog_density)
+        
+        for planet in self.planets:
+            detail = self.detail_level(planet.size)
+            if planet.orbit is None and detail != LOD_IMPOSTOR and overlaps(planet.x, planet.y, planet.size + 2):
+                planet.draw(left, bottom, detail)
+        
+        if draw_scenery:
+            for cluster in self.asteroid_clusters:
+                if not cluster.dynamic and overlaps(cluster.x, cluster.y, cluster.spread + 8):
+                    cluster.draw(left, bottom)
+        self.batcher.end()
+    
     def on_draw(self):
+        if self.profiler:
+            self.profiler.frame_start()
+        
+        self.allocations.begin("draw")
         self.clear()
+        self.render_target.clear()
         
-        # Always draw starfield (background)
-        self.starfield.draw(self.camera.x, self.camera.y)
+        camera_x = self.camera.x
+        camera_y = self.camera.y
+        zoom = self.camera.zoom
         
-        # Draw space fog (with culling)
-        for fog in self.space_fog:
-            if self.is_visible(fog.x, fog.y, 100):  # Larger cull size for fog
-                fog.draw(self.camera.x, self.camera.y)
+        self.world_camera.zoom = zoom
+        self.world_camera.position = (WINDOW_WIDTH / (2 * zoom), WINDOW_HEIGHT / (2 * zoom))
+        self.world_camera.use()
         
-        # Draw solar flares (with culling)
-        for flare in self.solar_flares:
-            if self.is_visible(flare.x, flare.y, flare.length):
-                flare.draw(self.camera.x, self.camera.y)
+        # Static background (stars, fog, fixed planets, asteroids) as a few cached tiles,
+        # rendered at the resolution of the zoom the camera is settling at
+        tile_state = (self.quality.value("star_density"), self.quality.value("fog_density"))
+        self.tile_cache.draw(camera_x, camera_y, self.camera.view_width, self.camera.view_height,
+                             zoom, round(self.camera.target_zoom, 3), tile_state)
+        self.world_camera.use()
         
-        # Draw planets (with culling)
-        for planet in self.planets:
-            if self.is_visible(planet.x, planet.y, planet.size):
-                planet.draw(self.camera.x, self.camera.y)
+        # Bodies and scenery are plain shapes, batched up to the impostor sprites
+        self.batcher.begin()
         
-        # Draw space debris (with culling)
-        for debris in self.space_debris:
-            if self.is_visible(debris.x, debris.y, 60):
-                debris.draw(self.camera.x, self.camera.y)
+        # Orbiting planets move every frame so they are drawn directly
+        visible_bodies = self.visible_bodies()
+        for planet in visible_bodies:
+            if isinstance(planet, Planet) and planet.orbit is not None:
+                detail = self.detail_level(planet.size)
+                if detail != LOD_IMPOSTOR and self.is_visible(planet.x, planet.y, planet.size):
+                    planet.draw(camera_x, camera_y, detail)
         
-        # Draw asteroid clusters (with culling)
-        for cluster in self.asteroid_clusters:
-            if self.is_visible(cluster.x, cluster.y, 60):
-                cluster.draw(self.camera.x, self.camera.y)
+        # Small-detail scenery is replaced by impostors when zoomed out
+        draw_scenery = self.detail_level(SCENERY_LOD_SIZE) != LOD_IMPOSTOR
+        
+        # Draw solar flares (with culling)
+        if draw_scenery:
+            for flare in self.solar_flares:
+                if self.is_visible(flare.x, flare.y, flare.length):
+                    flare.draw(camera_x, camera_y)
+        
+        # Draw space debris (with culling)
+        if draw_scenery:
+            for debris in self.space_debris:
+                if self.is_visible(debris.x, debris.y, debris.spread * 2):
+                    debris.draw(camera_x, camera_y)
         
         # Draw space stations (with culling)
-        for station in self.space_stations:
-            if self.is_visible(station.x, station.y, station.size):
-                station.draw(self.camera.x, self.camera.y)
+        station_detail = self.quality.value("station_detail")
+        for station in visible_bodies:
+            if isinstance(station, BaseStation):
+                detail = self.detail_level(station.size)
+                if detail != LOD_IMPOSTOR and self.is_visible(station.x, station.y, station.size):
+                    station.draw(camera_x, camera_y, min(detail, station_detail))
         
         # Draw warning beacons (with culling)
-        for beacon in self.warning_beacons:
-            if self.is_visible(beacon.x, beacon.y, 20):
-                beacon.draw(self.camera.x, self.camera.y)
+        if draw_scenery:
+            for beacon in self.warning_beacons:
+                if self.is_visible(beacon.x, beacon.y, 20):
+                    beacon.draw(camera_x, camera_y)
         
         # Draw pulsars (with culling)
-        for pulsar in self.pulsars:
-            if self.is_visible(pulsar.x, pulsar.y, pulsar.size * 2):
-                pulsar.draw(self.camera.x, self.camera.y)
+        for pulsar in visible_bodies:
+            if isinstance(pulsar, Pulsar):
+                detail = self.detail_level(pulsar.size * 2)
+                if detail != LOD_IMPOSTOR and self.is_visible(pulsar.x, pulsar.y, pulsar.size * 2):
+                    pulsar.draw(camera_x, camera_y, detail)
         
         # Draw energy anomalies (with culling)
         for anomaly in self.energy_anomalies:
-            if self.is_visible(anomaly.x, anomaly.y, anomaly.size):
-                anomaly.draw(self.camera.x, self.camera.y)
+            detail = self.detail_level(anomaly.size)
+            if detail != LOD_IMPOSTOR and self.is_visible(anomaly.x, anomaly.y, anomaly.size):
+                anomaly.draw(camera_x, camera_y, detail)
         
-        # Always draw player ship
-        self.player.draw(self.camera.x, self.camera.y)
+        self.batcher.end()
         
-        # Draw labels only if visible (with culling)
-        for label in self.labels:
-            label_world_x = label.x / SCREEN_SCALE
-            label_world_y = label.y / SCREEN_SCALE
-            
-            if self.is_visible(label_world_x, label_world_y, 50):
-                screen_x = (label_world_x - self.camera.x) * SCREEN_SCALE
-                screen_y = (label_world_y - self.camera.y) * SCREEN_SCALE
-                
-                temp_text = arcade.Text(label.text, screen_x, screen_y, label.color, label.font_size, anchor_x="center")
-                temp_text.draw()
+        # Everything too small to draw in detail, in a single batch
+        self.impostors.update(self.camera.target_zoom)
+        self.impostor_camera.zoom = zoom
+        self.impostor_camera.position = ((camera_x + self.camera.view_width / 2 - self.origin.x) * SCREEN_SCALE,
+                                         (camera_y + self.camera.view_height / 2 - self.origin.y) * SCREEN_SCALE)
+        self.impostor_camera.use()
+        self.impostors.draw()
+        self.world_camera.use()
+        
+        # Dynamic asteroids move every frame, so they are drawn here in one call at any zoom
+        self.asteroid_field.draw(camera_x, camera_y, SCREEN_SCALE)
         
-        # Draw HUD (no camera offset)
+        # Beams over the scenery they hit
+        self.batcher.begin()
+        self.beams.draw(camera_x, camera_y, SCREEN_SCALE)
+        self.batcher.end()
+        
+        # Particles behind the ship so exhaust trails from under the hull
+        self.particles.draw(camera_x, camera_y, SCREEN_SCALE, SCREEN_SCALE * SCREEN_WIDTH / WINDOW_WIDTH * zoom)
+        
+        # Always draw player ship
+        self.player.draw(camera_x, camera_y)
+        
+        # Single upscale pass to the window
+        self.render_target.blit()
+        
+        # Draw labels only if visible (with culling), sharp at window resolution
+        if self.quality.value("labels") and draw_scenery:
+            self.label_camera.zoom = zoom
+            self.label_camera.position = self.world_camera.position
+            self.label_camera.use()
+            for label in self.labels:
+                if self.is_visible(label.x, label.y, 50):
+                    label.draw(camera_x, camera_y)
+        
+        # Draw HUD (no camera offset); a due radar refresh rebinds the camera
+        self.radar.draw(RADAR_MARGIN, RADAR_MARGIN, RADAR_SIZE * 2)
+        self.gui_camera.use()
         self.fps_text.draw()
         self.coords_text.draw()
+        self.status_text.draw()
+        self.profiler_overlay.draw()
+        
+        self.batcher.frame_end()
+        self.allocations.end("draw")
+        self.allocations.frame_end()
+        
+        self.quality.frame_end()
+        startup_timer.first_frame()
     
     def on_update(self, delta_time):
+        self.allocations.begin("update")
+        self.quality.frame_begin()
         self.frame_delta_time = delta_time
         
+        # Continue building the world within a small per-frame budget
+        if not self.world_builder.done:
+            if self.world_builder.run():
+                startup_timer.world_ready(self.world_builder)
+                self.build_impostors()
+                self.gc_manager.freeze()  # The showcase lives as long as the game
+            self.index_bodies()
+            left, bottom, right, top = SHOWCASE_RECT
+            self.tile_cache.invalidate_rect(left - 100, bottom - 100, right + 100, top + 100)
+        
+        # Generate space ahead of the camera and merge finished sectors
+        view_radius = max(self.camera.view_width, self.camera.view_height) / 2 + SECTOR_SIZE
+        self.sector_streamer.request_around(self.camera.x + self.camera.view_width / 2,
+                                            self.camera.y + self.camera.view_height / 2, view_radius)
+        self.sector_streamer.update()
+        
         # Update FPS and coordinates display
-        fps_value = f"FPS: {1/delta_time:.1f}" if delta_time > 0 else "FPS: --"
+        fps_value = f"FPS: {self.pacer.fps:.1f}" if self.pacer.fps > 0 else "FPS: --"
         self.fps_text.text = fps_value
         
         coord_text = f"X: {int(self.player.x)} Y: {int(self.player.y)}"
         self.coords_text.text = coord_text
+        self.profiler_overlay.update(delta_time)
+        
+        # Orbits are evaluated from the clock, so bodies are where they should be even after a stall
+        self.orbit_time += delta_time
+        self.update_orbits()
+        
+        # Gravity pulls on the player, loose debris and drifting rocks before they move
+        if self.gravity.enabled:
+            self.update_gravity(delta_time)
         
         # Update player
         self.player.update(delta_time, self.keys_pressed)
         
         # Check collisions with debris fields (optimized)
         for debris_field in self.space_debris:
-            self.player.check_collision_with_debris(debris_field, delta_time)
+            if self.player.check_collision_with_debris(debris_field, delta_time):
+                contact_x, contact_y, direction = self.player.contact
+                self.particles.emit("sparks", contact_x, contact_y, direction,
+                                    self.player.velocity_x, self.player.velocity_y)
+        
+        # Dynamic asteroids knock each other and the ship about
+        if self.asteroid_field.enabled:
+            self.update_asteroids(delta_time)
+        
+        # Hit-scan beams resolve against where everything is after the collisions
+        self.fire_beams(delta_time)
+        
+        # Docking and hazard zones the ship has entered, stayed in or left
+        self.triggers.update(self.player, self.player.size, delta_time)
+        
+        # Exhaust trails the thruster flame
+        if self.player.thrusting_forward or (self.player.thrusting_backward and SHOW_REVERSE_THRUSTER):
+            angle_rad = math.radians(self.player.angle)
+            tail = self.player.size * 0.6 + THRUSTER_GAP + THRUSTER_LENGTH
+            name = "exhaust" if self.player.thrusting_forward else "reverse_exhaust"
+            self.particles.emit_continuous(name, self.player.x - math.sin(angle_rad) * tail,
+                                           self.player.y - math.cos(angle_rad) * tail, self.player.angle + 180,
+                                           self.player.velocity_x, self.player.velocity_y, delta_time)
+        self.particles.set_budget(self.quality.value("particle_budget"))
+        self.particles.update(delta_time)
         
         # Update camera to follow player
         self.camera.follow_player(self.player.x, self.player.y)
         self.camera.update(delta_time)
+        self.origin.update(self.camera.x + self.camera.view_width / 2, self.camera.y + self.camera.view_height / 2)
+        self.radar.update(delta_time, self.player.x, self.player.y)
         
-        # Update animated objects (only if visible to save CPU)
+        # Update animated objects (only if visible and drawn in detail to save CPU)
         for anomaly in self.energy_anomalies:
-            if self.is_visible(anomaly.x, anomaly.y, anomaly.size):
+            if self.detail_level(anomaly.size) != LOD_IMPOSTOR and self.is_visible(anomaly.x, anomaly.y, anomaly.size):
                 anomaly.update(delta_time)
         
-        for station in self.space_stations:
-            if self.is_visible(station.x, station.y, station.size):
-                station.update(delta_time)
-        
-        for pulsar in self.pulsars:
-            if self.is_visible(pulsar.x, pulsar.y, pulsar.size * 2):
-                pulsar.update(delta_time)
-        
-        for beacon in self.warning_beacons:
-            if self.is_visible(beacon.x, beacon.y, 20):
-                beacon.update(delta_time)
-        
-        for debris in self.space_debris:
-            if self.is_visible(debris.x, debris.y, 60):
-                debris.update(delta_time)
+        for body in self.visible_bodies():
+            if isinstance(body, BaseStation):
+                if self.detail_level(body.size) != LOD_IMPOSTOR and self.is_visible(body.x, body.y, body.size):
+                    body.update(delta_time)
+            elif isinstance(body, Pulsar):
+                if self.detail_level(body.size * 2) != LOD_IMPOSTOR and self.is_visible(body.x, body.y, body.size * 2):
+                    body.update(delta_time)
+        
+        draw_scenery = self.detail_level(SCENERY_LOD_SIZE) != LOD_IMPOSTOR
+        if draw_scenery:
+            for beacon in self.warning_beacons:
+                if self.is_visible(beacon.x, beacon.y, 20):
+                    beacon.update(delta_time)
+            
+            for debris in self.space_debris:
+                if self.is_visible(debris.x, debris.y, debris.spread * 2):
+                    debris.update(delta_time)
+            
+            for flare in self.solar_flares:
+                if self.is_visible(flare.x, flare.y, flare.length):
+                    flare.update(delta_time)
         
-        for flare in self.solar_flares:
-            if self.is_visible(flare.x, flare.y, flare.length):
-                flare.update(delta_time)
+        self.allocations.end("update")
+    
+    def asteroids_restored(self, field):
+        """A snapshot taken with dynamic asteroids off freezes the rocks; one taken with them on lets them drift"""
+        if not field.enabled and field.clusters:
+            self.freeze_asteroids()
+    
+    def update_asteroids(self, delta_time):
+        """Hand newly generated clusters to the field, step it and bounce the ship off the rocks"""
+        for cluster in self.asteroid_clusters:
+            if not cluster.dynamic and self.asteroid_field.absorb(cluster):
+                self.impostors.hide(cluster)
+                self.tile_cache.invalidate_rect(cluster.x - cluster.spread - 8, cluster.y - cluster.spread - 8,
+                                                cluster.x + cluster.spread + 8, cluster.y + cluster.spread + 8)
+        
+        self.asteroid_field.update(delta_time)
+        contact = self.asteroid_field.collide_body(self.player, self.player.size, self.player.size ** 2)
+        if contact:
+            contact_x, contact_y, direction = contact
+            self.particles.emit("sparks", contact_x, contact_y, direction,
+                                self.player.velocity_x, self.player.velocity_y)
+    
+    def toggle_asteroids(self):
+        """Switch asteroid clusters between static scenery and the collision simulation"""
+        field = self.asteroid_field
+        field.enabled = not field.enabled
+        if field.enabled:
+            return  # Clusters are absorbed on the next update
+        self.freeze_asteroids()
+    
+    def freeze_asteroids(self):
+        """Write the drifting rocks back into their clusters and show the clusters again"""
+        field = self.asteroid_field
+        clusters = field.clusters
+        field.freeze()
+        for cluster in clusters:
+            self.impostors.hide(cluster, False)
+            if cluster in self.target_index:
+                self.target_index.move(cluster, cluster.spread * 2)  # Frozen rocks may have drifted further out
+            self.tile_cache.invalidate_rect(cluster.x - cluster.spread - 8, cluster.y - cluster.spread - 8,
+                                            cluster.x + cluster.spread + 8, cluster.y + cluster.spread + 8)
+    
+    def update_gravity(self, delta_time):
+        """Planets and pulsars attract the player, every debris piece and the drifting rocks"""
+        attractors = [(planet.x, planet.y, planet.size * planet.size * PLANET_DENSITY) for planet in self.planets]
+        attractors += [(pulsar.x, pulsar.y, pulsar.size * pulsar.size * PULSAR_DENSITY) for pulsar in self.pulsars]
+        
+        pieces = [piece for field in self.space_debris for piece in field.debris]
+        xs = [self.player.x] + [piece[0] for piece in pieces]
+        ys = [self.player.y] + [piece[1] for piece in pieces]
+        rocks = self.asteroid_field.count if self.asteroid_field.enabled else 0
+        if rocks:
+            rock_xs, rock_ys = self.asteroid_field.positions()
+            xs += rock_xs
+            ys += rock_ys
+        ax, ay = self.gravity.step(attractors, xs, ys)
+        
+        self.player.velocity_x += ax[0] * delta_time
+        self.player.velocity_y += ay[0] * delta_time
+        
+        if rocks:
+            self.asteroid_field.accelerate(ax[-rocks:], ay[-rocks:], delta_time)
+        
+        for piece, piece_ax, piece_ay in zip(pieces, ax[1:], ay[1:]):
+            piece[6] += piece_ax * delta_time
+            piece[7] += piece_ay * delta_time
+            piece[0] += piece[6] * delta_time
+            piece[1] += piece[7] * delta_time
+        
+        for field in self.space_debris:
+            field.bind(delta_time)
+            self.debris_moved(field)
+    
+    def debris_moved(self, field):
+        """Keep the impostor and beam target of a drifting debris field in step"""
+        self.impostors.move(field)
+        self.target_index.move(field, field.spread * 2)
+    
+    def update_orbits(self):
+        """Place every orbiting body for orbit_time and keep the grids holding it in step"""
+        for orbit in self.orbits.update(self.orbit_time):
+            body = orbit.body
+            if body in self.body_index:
+                self.body_index.move(body)
+            if body in self.target_index:
+                self.target_index.move(body)
+            self.triggers.move(body)
+            self.impostors.move(body)
+    
+    def on_close(self):
+        self.sector_streamer.shutdown()
+        super().on_close()
     
     def on_key_press(self, key, modifiers):
         self.keys_pressed.add(key)
+        
+        # Zoom in and out
+        if key in (arcade.key.EQUAL, arcade.key.NUM_ADD):
+            self.camera.zoom_by(ZOOM_STEP)
+        elif key in (arcade.key.MINUS, arcade.key.NUM_SUBTRACT):
+            self.camera.zoom_by(1 / ZOOM_STEP)
+        
+        # Profiler panel and quality governor toggles
+        if key == arcade.key.F3:
+            self.profiler_overlay.toggle()
+        elif key == arcade.key.F4:
+            self.quality.enabled = not self.quality.enabled
+        elif key == arcade.key.F5:
+            self.pacer.cycle_mode()
+        elif key == arcade.key.F6:
+            self.batcher.enabled = not self.batcher.enabled
+        
+        # Toggle gravity
+        if key == arcade.key.G:
+            self.gravity.enabled = not self.gravity.enabled
+        
+        # Toggle drifting, colliding asteroids
+        if key == arcade.key.R:
+            self.toggle_asteroids()
+        
+        # Quick save and restore of the ship, camera and animation state
+        if key == arcade.key.F7:
+            self.snapshots.quick_save()
+        elif key == arcade.key.F8:
+            self.snapshots.quick_restore()
+        
+        # Capture recent profiler samples on demand
+        if key == arcade.key.F9 and self.profiler:
+            self.profiler.capture()
+        
+        # Print where the next frame allocates
+        if key == arcade.key.F10:
+            self.allocations.capture()
     
     def on_key_release(self, key, modifiers):
         self.keys_pressed.discard(key)
+    
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        self.camera.zoom_by(ZOOM_STEP ** scroll_y)
+    
+    def on_resize(self, width, height):
+        super().on_resize(width, height)
+        self.render_target.resize(*self.get_framebuffer_size())
+        self.label_camera.viewport = LBWH(*self.render_target.viewport)
 
 def main():
     game = SpaceFlightGame()
+    startup_timer.mark("window")
     game.setup()
-    arcade.run()
+    game.gc_manager.freeze()
+    startup_timer.mark("setup")
+    game.pacer.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,32 @@
+import time
+_start_time = time.perf_counter()
+
 import arcade
 import math
 
+from ai_scheduler import AIScheduler
+from alloc_tracker import AllocationTracker
+from beams import BeamSystem
+from draw_batcher import DrawBatcher
+from flow_field import FlowField
+from frame_pacing import FramePacer
+from gc_manager import GCManager
+from minimap import RADAR_SIZE, Radar
+from netcode import (FLAG_REVERSE, FLAG_THRUST, INPUT_FIRE, INPUT_LEFT, INPUT_REVERSE, INPUT_RIGHT, INPUT_THRUST,
+                     KIND_BULLET, KIND_ENEMY_BULLET, KIND_ENEMY_SHIP, ROLE_PLAY, ROLE_WATCH, client_from_env)
+from parallax import ParallaxStarfield
+from particles import ParticleSystem
+from profiler import ProfilerOverlay, SamplingProfiler, profiler_enabled
+from quality import QualityGovernor
+from render_target import PixelRenderTarget
+from ship_shapes import THRUSTER_GAP, ship_hull, thruster_shape, transform_into, vertex_buffer
+from spatial_index import SpatialGrid, ray_circle
+from startup import StartupTimer
+from world_snapshot import ObjectLayout, WorldSnapshotter
+
+startup_timer = StartupTimer("space_flight_minimal", _start_time)
+startup_timer.mark("import")
+
 # Screen and world settings
 SCREEN_WIDTH = 640
 SCREEN_HEIGHT = 360
@@ -31,6 +57,7 @@ THRUSTER_WIDTH = 4
 THRUSTER_COLOR = (255, 100, 50, 180)
 SHOW_REVERSE_THRUSTER = True
 REVERSE_THRUSTER_LENGTH = 4
+REVERSE_THRUSTER_COLOR = (100, 150, 255, 180)  # Blue for reverse
 
 # Shooting settings
 BULLET_SPEED = 200
@@ -38,6 +65,7 @@ BULLET_COOLDOWN = 0.5
 BULLET_COLOR = (100, 200, 255)  # Light blue
 BULLET_LENGTH = 6
 BULLET_WIDTH = 3
+ENEMY_BULLET_COLOR = (255, 50, 50)  # Red
 
 # Mouse control settings
 MAX_ROTATION_PER_FRAME = 4.0  # Maximum degrees of rotation per frame
@@ -48,6 +76,18 @@ ENEMY_MIN_SIZE = 5
 ENEMY_MAX_SIZE = 15
 ENEMY_CIRCLE_COLOR = (255, 100, 100)  # Light red
 ENEMY_SQUARE_COLOR = (100, 100, 255)  # Light blue
+ENEMY_SHIP_FILL_COLOR = (255, 100, 100, 128)  # Red tint
+ENEMY_SHIP_BORDER_COLOR = (255, 100, 100, 255)  # Red border
+
+# Radar in the bottom-right corner of the HUD
+RADAR_MARGIN = 10
+RADAR_SHIP_COLOR = (255, 80, 80)
+RADAR_PLAYER_COLOR = (255, 255, 255)
+
+# Keys sent to a sim_server as input bits when playing online
+NET_INPUT_KEYS = ((INPUT_LEFT, (arcade.key.LEFT,)), (INPUT_RIGHT, (arcade.key.RIGHT,)),
+                  (INPUT_THRUST, (arcade.key.UP, arcade.key.W)), (INPUT_REVERSE, (arcade.key.DOWN, arcade.key.S)),
+                  (INPUT_FIRE, (arcade.key.SPACE,)))
 
 class Enemy:
     def __init__(self, x, y, enemy_type, size):
@@ -66,15 +106,15 @@ class Enemy:
         if self.type == "circle":
             arcade.draw_circle_filled(screen_x, screen_y, screen_size, ENEMY_CIRCLE_COLOR)
         elif self.type == "square":
-            # Draw square as polygon
+            # Axis-aligned, so drawn from its edges without building a point list
             half_size = screen_size
-            square_points = [
-                (screen_x - half_size, screen_y - half_size),
-                (screen_x + half_size, screen_y - half_size),
-                (screen_x + half_size, screen_y + half_size),
-                (screen_x - half_size, screen_y + half_size)
-            ]
-            arcade.draw_polygon_filled(square_points, ENEMY_SQUARE_COLOR)
+            arcade.draw_lrbt_rectangle_filled(screen_x - half_size, screen_x + half_size,
+                                              screen_y - half_size, screen_y + half_size, ENEMY_SQUARE_COLOR)
+    
+    def obstacle(self):
+        """Bounding circle (x, y, radius) that enemy ships route around"""
+        radius = self.size if self.type == "circle" else self.size * math.sqrt(2)
+        return (self.x, self.y, radius)
     
     def check_collision_with_bullet(self, bullet):
         """Check if bullet collides with this enemy"""
@@ -101,6 +141,13 @@ class Bullet:
         self.velocity_y = velocity_y
         self.angle = angle  # Store angle for drawing orientation
         self.color = color if color else BULLET_COLOR  # Use provided color or default
+        self.orient()
+    
+    def orient(self):
+        # Bullets fly straight, so the half-line from the centre to the tip is fixed (screen units)
+        angle_rad = math.radians(self.angle)
+        self.line_dx = math.sin(angle_rad) * BULLET_LENGTH / 2 * SCREEN_SCALE
+        self.line_dy = math.cos(angle_rad) * BULLET_LENGTH / 2 * SCREEN_SCALE
     
     def update(self, delta_time):
         self.x += self.velocity_x * delta_time
@@ -114,71 +161,9 @@ class Bullet:
         screen_x = (self.x - camera_x) * SCREEN_SCALE
         screen_y = (self.y - camera_y) * SCREEN_SCALE
         
-        # Calculate line endpoints based on bullet angle and length
-        angle_rad = math.radians(self.angle)
-        half_length = BULLET_LENGTH / 2
-        
-        # Start and end points of the line
-        start_x = screen_x - math.sin(angle_rad) * half_length * SCREEN_SCALE
-        start_y = screen_y - math.cos(angle_rad) * half_length * SCREEN_SCALE
-        end_x = screen_x + math.sin(angle_rad) * half_length * SCREEN_SCALE
-        end_y = screen_y + math.cos(angle_rad) * half_length * SCREEN_SCALE
-        
-        # Simple drawing without transformations
-        width = BULLET_WIDTH
-        
         # Draw bullet as a line (color depends on who shot it)
-        arcade.draw_line(start_x, start_y, end_x, end_y, self.color, width)
-
-class Star:
-    def __init__(self, x, y, size, opacity):
-        self.x = x
-        self.y = y
-        self.size = size
-        self.opacity = opacity
-    
-    def draw(self, camera_x, camera_y, game_window=None):
-        color = (255, 255, 255, int(255 * self.opacity))
-        screen_x = (self.x - camera_x) * SCREEN_SCALE
-        screen_y = (self.y - camera_y) * SCREEN_SCALE
-        
-        # Simple drawing without complex transformations
-        size = self.size * SCREEN_SCALE
-            
-        arcade.draw_circle_filled(screen_x, screen_y, size, color)
-
-class StarField:
-    def __init__(self, width, height, star_count=300):  # Increased for more dense starfield
-        self.stars = []
-        self.generate_stars(width, height, star_count)
-    
-    def generate_stars(self, width, height, star_count):
-        import random
-        for _ in range(star_count):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            
-            # 80% small dim stars, 20% bright larger stars
-            if random.random() < 0.8:
-                size = 1.0
-                opacity = 0.6
-            else:
-                size = 1.5
-                opacity = 1.0
-            
-            self.stars.append(Star(x, y, size, opacity))
-    
-    def draw(self, camera_x, camera_y, game_window=None):
-        # Only draw stars that are visible on screen
-        left = camera_x
-        right = camera_x + SCREEN_WIDTH
-        bottom = camera_y
-        top = camera_y + SCREEN_HEIGHT
-        
-        for star in self.stars:
-            if (star.x >= left and star.x <= right and 
-                star.y >= bottom and star.y <= top):
-                star.draw(camera_x, camera_y, game_window)
+        arcade.draw_line(screen_x - self.line_dx, screen_y - self.line_dy,
+                         screen_x + self.line_dx, screen_y + self.line_dy, self.color, BULLET_WIDTH)
 
 class Camera:
     def __init__(self):
@@ -211,6 +196,13 @@ class Player:
         self.angle = 0  # 0 = pointing up
         self.size = SHIP_SIZE
         
+        # Local shapes are fixed; draw() transforms them into reused vertex buffers
+        self.hull_shape = ship_hull(self.size)
+        self.thruster_shape = thruster_shape(self.size, THRUSTER_WIDTH, THRUSTER_LENGTH)
+        self.reverse_thruster_shape = thruster_shape(self.size, THRUSTER_WIDTH * 0.8, REVERSE_THRUSTER_LENGTH)
+        self.hull_points = vertex_buffer(3)
+        self.thruster_points = vertex_buffer(4)
+        
         # Thruster state
         self.thrusting_forward = False
         self.thrusting_backward = False
@@ -296,38 +288,16 @@ class Player:
         # Draw thruster first (behind ship)
         self.draw_thruster(camera_x, camera_y, game_window)
         
-        # Calculate triangle points
+        # Rotate and translate the triangle into the reused buffer
         angle_rad = math.radians(self.angle)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        # Triangle points (pointing up)
-        original_points = [
-            (0, self.size),                        # Top point
-            (-self.size * 0.8, -self.size * 0.6),  # Bottom left
-            (self.size * 0.8, -self.size * 0.6)    # Bottom right
-        ]
-        
-        # Rotate and translate points
-        rotated_points = []
-        for px, py in original_points:
-            rotated_x = px * cos_a + py * sin_a
-            rotated_y = -px * sin_a + py * cos_a
-            final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-            final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-            
-            # No transformations needed
-            
-            rotated_points.append((final_x, final_y))
-        
-        # Simple border thickness
-        border_thickness = BORDER_THICKNESS
+        transform_into(self.hull_points, self.hull_shape, self.x, self.y,
+                       math.cos(angle_rad), math.sin(angle_rad), camera_x, camera_y, SCREEN_SCALE)
         
         # Draw filled triangle
-        arcade.draw_polygon_filled(rotated_points, SHIP_FILL_COLOR)
+        arcade.draw_polygon_filled(self.hull_points, SHIP_FILL_COLOR)
         
         # Draw triangle outline
-        arcade.draw_polygon_outline(rotated_points, SHIP_BORDER_COLOR, border_thickness)
+        arcade.draw_polygon_outline(self.hull_points, SHIP_BORDER_COLOR, BORDER_THICKNESS)
     
     def draw_thruster(self, camera_x, camera_y, game_window=None):
         angle_rad = math.radians(self.angle)
@@ -336,64 +306,15 @@ class Player:
         
         # Forward thruster
         if self.thrusting_forward:
-            gap = 1.5
-            thruster_length = THRUSTER_LENGTH
-            thruster_width = THRUSTER_WIDTH
-            
-            # Trapezoidal thruster shape
-            top_width = thruster_width
-            bottom_width = thruster_width * 0.8
-            
-            thruster_points = [
-                (-top_width * 0.5, -self.size * 0.6 - gap),
-                (top_width * 0.5, -self.size * 0.6 - gap),
-                (bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length),
-                (-bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length)
-            ]
-            
-            # Rotate and translate thruster points
-            rotated_thruster = []
-            for px, py in thruster_points:
-                rotated_x = px * cos_a + py * sin_a
-                rotated_y = -px * sin_a + py * cos_a
-                final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-                final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-                
-                # No transformations needed
-                
-                rotated_thruster.append((final_x, final_y))
-            
-            arcade.draw_polygon_filled(rotated_thruster, THRUSTER_COLOR)
+            transform_into(self.thruster_points, self.thruster_shape, self.x, self.y,
+                           cos_a, sin_a, camera_x, camera_y, SCREEN_SCALE)
+            arcade.draw_polygon_filled(self.thruster_points, THRUSTER_COLOR)
         
         # Reverse thruster
         if self.thrusting_backward and SHOW_REVERSE_THRUSTER:
-            gap = 1.5
-            thruster_length = REVERSE_THRUSTER_LENGTH
-            thruster_width = THRUSTER_WIDTH * 0.8
-            
-            top_width = thruster_width
-            bottom_width = thruster_width * 0.8
-            
-            thruster_points = [
-                (-top_width * 0.5, -self.size * 0.6 - gap),
-                (top_width * 0.5, -self.size * 0.6 - gap),
-                (bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length),
-                (-bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length)
-            ]
-            
-            rotated_thruster = []
-            for px, py in thruster_points:
-                rotated_x = px * cos_a + py * sin_a
-                rotated_y = -px * sin_a + py * cos_a
-                final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-                final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-                
-                # No transformations needed
-                
-                rotated_thruster.append((final_x, final_y))
-            
-            reverse_color = (100, 150, 255, 180)  # Blue for reverse
-            arcade.draw_polygon_filled(rotated_thruster, reverse_color)
+            transform_into(self.thruster_points, self.reverse_thruster_shape, self.x, self.y,
+                           cos_a, sin_a, camera_x, camera_y, SCREEN_SCALE)
+            arcade.draw_polygon_filled(self.thruster_points, REVERSE_THRUSTER_COLOR)
     
     def can_shoot(self):
         return self.shoot_cooldown <= 0
@@ -427,6 +348,13 @@ class EnemyShip:
         self.angle = 0  # 0 = pointing up
         self.size = SHIP_SIZE
         
+        # Local shapes are fixed; draw() transforms them into reused vertex buffers
+        self.hull_shape = ship_hull(self.size)
+        self.thruster_shape = thruster_shape(self.size, THRUSTER_WIDTH, THRUSTER_LENGTH)
+        self.reverse_thruster_shape = thruster_shape(self.size, THRUSTER_WIDTH * 0.8, REVERSE_THRUSTER_LENGTH)
+        self.hull_points = vertex_buffer(3)
+        self.thruster_points = vertex_buffer(4)
+        
         # AI state
         self.thrusting_forward = False
         self.thrusting_backward = False
@@ -437,6 +365,12 @@ class EnemyShip:
         self.max_shoot_interval = 2.5  # Maximum time between shots
         self.next_shoot_time = 0.0  # When enemy can shoot next
         self.last_player_distance = 0  # Track player distance for shooting decisions
+        self.target_angle = 0  # Steering target chosen by think()
+        
+        # Schedule kept by the AIScheduler (next_think is negative until it first sees the ship)
+        self.next_think = -1.0
+        self.idle_time = 0.0
+        self.ai_phase = 0
         
         # AI parameters
         self.follow_distance = 100  # Preferred distance from player
@@ -444,15 +378,22 @@ class EnemyShip:
         self.separation_distance = 150  # Minimum distance from other enemies
         self.collision_radius = self.size * 3  # Absolute no-touch zone (triple ship size)
     
-    def update(self, delta_time, player, other_enemies=None):
-        # Clamp delta_time to prevent issues with large time steps
-        delta_time = min(delta_time, 0.1)  # Max 100ms per frame
-        
+    def think(self, player, other_enemies=None, flow=None):
+        """Choose steering target and thrust; may run less often than update()"""
         # Calculate distance and angle to player
         dx_to_player = player.x - self.x
         dy_to_player = player.y - self.y
         distance_to_player = math.sqrt(dx_to_player*dx_to_player + dy_to_player*dy_to_player)
         
+        # With a flow field, chase along its route around obstacles (it points straight when close)
+        chase_x = dx_to_player
+        chase_y = dy_to_player
+        if flow is not None:
+            direction = flow.direction(self.x, self.y)
+            if direction:
+                chase_x = direction[0] * distance_to_player
+                chase_y = direction[1] * distance_to_player
+        
         # Calculate separation force from other enemies
         separation_x = 0
         separation_y = 0
@@ -489,28 +430,48 @@ class EnemyShip:
             follow_strength = 0.4  # Further reduced follow strength
             separation_strength = 8.0  # Even stronger separation force
             
-            desired_x = dx_to_player * follow_strength + separation_x * separation_strength
-            desired_y = dy_to_player * follow_strength + separation_y * separation_strength
+            desired_x = chase_x * follow_strength + separation_x * separation_strength
+            desired_y = chase_y * follow_strength + separation_y * separation_strength
         
         # Calculate angle toward desired direction
         if abs(desired_x) > 0.01 or abs(desired_y) > 0.01:  # Avoid division by zero
-            target_angle = math.degrees(math.atan2(desired_x, desired_y))
+            self.target_angle = math.degrees(math.atan2(desired_x, desired_y))
         else:
             # If no clear direction, just face the player
-            target_angle = math.degrees(math.atan2(dx_to_player, dy_to_player))
+            self.target_angle = math.degrees(math.atan2(dx_to_player, dy_to_player))
         
-        # Calculate shortest rotation direction
-        angle_diff = target_angle - self.angle
-        while angle_diff > 180:
-            angle_diff -= 360
-        while angle_diff < -180:
-            angle_diff += 360
+        # AI movement logic
+        if distance_to_player > self.follow_distance:
+            # Too far - move toward player
+            self.thrusting_forward = True
+            self.thrusting_backward = False
+        elif distance_to_player < self.follow_distance * 0.5:
+            # Too close - back away
+            self.thrusting_forward = False
+            self.thrusting_backward = True
+        else:
+            # Good distance - stop thrusting
+            self.thrusting_forward = False
+            self.thrusting_backward = False
+        
+        # Store player distance for shooting decisions
+        self.last_player_distance = distance_to_player
+    
+    def update(self, delta_time, player, other_enemies=None, think=True):
+        # Clamp delta_time to prevent issues with large time steps
+        delta_time = min(delta_time, 0.1)  # Max 100ms per frame
         
-        # Rotate toward player
+        if think:
+            self.think(player, other_enemies)
+        
+        # Shortest rotation direction, in -180..180
+        angle_diff = (self.target_angle - self.angle + 180) % 360 - 180
+        
+        # Rotate toward the target chosen by think()
         if abs(angle_diff) > 5:  # Only rotate if not close enough
             rotation_speed = self.turn_speed * delta_time
             if abs(angle_diff) < rotation_speed:
-                self.angle = target_angle
+                self.angle = self.target_angle
             else:
                 if angle_diff > 0:
                     self.angle += rotation_speed
@@ -523,20 +484,6 @@ class EnemyShip:
         # Convert angle to radians for physics
         angle_rad = math.radians(self.angle)
         
-        # AI movement logic
-        if distance_to_player > self.follow_distance:
-            # Too far - move toward player
-            self.thrusting_forward = True
-            self.thrusting_backward = False
-        elif distance_to_player < self.follow_distance * 0.5:
-            # Too close - back away
-            self.thrusting_forward = False
-            self.thrusting_backward = True
-        else:
-            # Good distance - stop thrusting
-            self.thrusting_forward = False
-            self.thrusting_backward = False
-        
         # Apply thrust
         if self.thrusting_forward:
             thrust_x = math.sin(angle_rad) * ACCELERATION * delta_time
@@ -588,9 +535,6 @@ class EnemyShip:
         # Update shoot cooldown
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= delta_time
-        
-        # Store player distance for shooting decisions
-        self.last_player_distance = distance_to_player
     
     def can_shoot(self, player, current_time):
         # Basic cooldown check
@@ -673,42 +617,20 @@ class EnemyShip:
         bullet_velocity_y = math.cos(shooting_angle_rad) * BULLET_SPEED
         
         # Enemy bullets are red
-        enemy_bullet_color = (255, 50, 50)  # Red
-        return Bullet(bullet_x, bullet_y, bullet_velocity_x, bullet_velocity_y, shooting_angle, enemy_bullet_color)
+        return Bullet(bullet_x, bullet_y, bullet_velocity_x, bullet_velocity_y, shooting_angle, ENEMY_BULLET_COLOR)
     
     def draw(self, camera_x, camera_y, game_window=None):
         # Draw thruster first (behind ship)
         self.draw_thruster(camera_x, camera_y, game_window)
         
-        # Calculate triangle points (same as player)
+        # Rotate and translate the triangle into the reused buffer (same shape as the player)
         angle_rad = math.radians(self.angle)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        # Triangle points (pointing up)
-        original_points = [
-            (0, self.size),                        # Top point
-            (-self.size * 0.8, -self.size * 0.6),  # Bottom left
-            (self.size * 0.8, -self.size * 0.6)    # Bottom right
-        ]
-        
-        # Rotate and translate points
-        rotated_points = []
-        for px, py in original_points:
-            rotated_x = px * cos_a + py * sin_a
-            rotated_y = -px * sin_a + py * cos_a
-            final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-            final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-            rotated_points.append((final_x, final_y))
-        
-        border_thickness = BORDER_THICKNESS
+        transform_into(self.hull_points, self.hull_shape, self.x, self.y,
+                       math.cos(angle_rad), math.sin(angle_rad), camera_x, camera_y, SCREEN_SCALE)
         
         # Draw filled triangle (red color for enemy)
-        enemy_fill_color = (255, 100, 100, 128)  # Red tint
-        enemy_border_color = (255, 100, 100, 255)  # Red border
-        
-        arcade.draw_polygon_filled(rotated_points, enemy_fill_color)
-        arcade.draw_polygon_outline(rotated_points, enemy_border_color, border_thickness)
+        arcade.draw_polygon_filled(self.hull_points, ENEMY_SHIP_FILL_COLOR)
+        arcade.draw_polygon_outline(self.hull_points, ENEMY_SHIP_BORDER_COLOR, BORDER_THICKNESS)
     
     def draw_thruster(self, camera_x, camera_y, game_window=None):
         angle_rad = math.radians(self.angle)
@@ -717,56 +639,15 @@ class EnemyShip:
         
         # Forward thruster (same as player)
         if self.thrusting_forward:
-            gap = 1.5
-            thruster_length = THRUSTER_LENGTH
-            thruster_width = THRUSTER_WIDTH
-            
-            top_width = thruster_width
-            bottom_width = thruster_width * 0.8
-            
-            thruster_points = [
-                (-top_width * 0.5, -self.size * 0.6 - gap),
-                (top_width * 0.5, -self.size * 0.6 - gap),
-                (bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length),
-                (-bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length)
-            ]
-            
-            rotated_thruster = []
-            for px, py in thruster_points:
-                rotated_x = px * cos_a + py * sin_a
-                rotated_y = -px * sin_a + py * cos_a
-                final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-                final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-                rotated_thruster.append((final_x, final_y))
-            
-            arcade.draw_polygon_filled(rotated_thruster, THRUSTER_COLOR)
+            transform_into(self.thruster_points, self.thruster_shape, self.x, self.y,
+                           cos_a, sin_a, camera_x, camera_y, SCREEN_SCALE)
+            arcade.draw_polygon_filled(self.thruster_points, THRUSTER_COLOR)
         
         # Reverse thruster
         if self.thrusting_backward and SHOW_REVERSE_THRUSTER:
-            gap = 1.5
-            thruster_length = REVERSE_THRUSTER_LENGTH
-            thruster_width = THRUSTER_WIDTH * 0.8
-            
-            top_width = thruster_width
-            bottom_width = thruster_width * 0.8
-            
-            thruster_points = [
-                (-top_width * 0.5, -self.size * 0.6 - gap),
-                (top_width * 0.5, -self.size * 0.6 - gap),
-                (bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length),
-                (-bottom_width * 0.5, -self.size * 0.6 - gap - thruster_length)
-            ]
-            
-            rotated_thruster = []
-            for px, py in thruster_points:
-                rotated_x = px * cos_a + py * sin_a
-                rotated_y = -px * sin_a + py * cos_a
-                final_x = (self.x + rotated_x - camera_x) * SCREEN_SCALE
-                final_y = (self.y + rotated_y - camera_y) * SCREEN_SCALE
-                rotated_thruster.append((final_x, final_y))
-            
-            reverse_color = (100, 150, 255, 180)  # Blue for reverse
-            arcade.draw_polygon_filled(rotated_thruster, reverse_color)
+            transform_into(self.thruster_points, self.reverse_thruster_shape, self.x, self.y,
+                           cos_a, sin_a, camera_x, camera_y, SCREEN_SCALE)
+            arcade.draw_polygon_filled(self.thruster_points, REVERSE_THRUSTER_COLOR)
     
     def check_collision_with_bullet(self, bullet):
         """Check if bullet collides with this enemy ship"""
@@ -786,15 +667,21 @@ class SpaceFlightGame(arcade.Window):
         # Show the mouse cursor (no longer using mouse for controls)
         self.set_mouse_visible(True)
         
-        # Set frame rate to prevent performance issues
-        self.set_update_rate(1/60)  # 60 FPS limit
+        # Fixed 60Hz updates; draw pacing is vsync, capped or uncapped (F5)
+        self.pacer = FramePacer(self)
         
-        # Create Camera2D for proper fullscreen scaling
-        self.world_camera = arcade.Camera2D()
+        # Cyclic GC runs in the idle part of frames once the world is frozen after setup
+        self.gc_manager = GCManager()
+        self.pacer.idle_tasks.append(self.gc_manager.idle)
+        
+        # The world is drawn at native resolution and upscaled once; letterboxing
+        # happens in the blit. The HUD is drawn at window resolution on top.
+        self.render_target = PixelRenderTarget(self, SCREEN_WIDTH, SCREEN_HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.world_camera = self.render_target.camera()
         self.gui_camera = arcade.Camera2D()
         
         self.player = None
-        self.starfield = None
+        self.starfield = ParallaxStarfield(self.ctx)  # Nothing to generate, so created up front
         self.camera = None
         self.keys_pressed = set()
         self.bullets = []
@@ -803,22 +690,80 @@ class SpaceFlightGame(arcade.Window):
         self.enemy_bullets = []  # Enemy bullets
         self.max_enemy_ships = 2  # Maximum number of enemy ships
         
+        # Enemies, enemy ships and bullets of both sides, kept in a grid for the radar
+        self.contacts = SpatialGrid()
+        self.radar = Radar(self, self.contacts.query_radius, self.radar_blip)
+        
+        # Hit-scan laser (L) resolved by walking the grid cells along the beam
+        self.beams = BeamSystem(self.cast_beam, lambda: self.contacts.ray_cells)
+        
+        # Exhaust, impacts and explosions
+        self.particles = ParticleSystem(self.ctx)
+        
+        # Ships, enemies and bullets are plain arcade shapes, drawn in a few calls (F6 toggles)
+        self.batcher = DrawBatcher(self.ctx)
+        
+        # Optional authoritative server (LITTLESPACE_SERVER=host:port, see sim_server.py).
+        # Online the combat lists hold local copies of what the server sends.
+        self.net = client_from_env()
+        self.remote = {}  # Server entity id -> local Player, EnemyShip or Bullet
+        self.other_players = []
+        
         # Mouse control variables (for shooting only)
         self.mouse_pressed = set()  # Track mouse button states
         
         # Performance and safety limits
-        self.max_bullets = 8   # Reduced further to prevent performance issues
+        self.max_bullets = 8   # Set from the quality governor's bullet budget each frame
         self.max_enemies = 2   # Reduced to 2 for better performance
+        
+        # Enemy ships re-plan at the governor's think rate, spread over frames and slower far away
+        self.ai_scheduler = AIScheduler()
+        
+        # Path costs to the player around the enemy hazards, rebuilt a few times a second
+        self.flow_field = FlowField(WORLD_WIDTH, WORLD_HEIGHT)
         self.collision_check_timer = 0  # Throttle collision checks
         self.draw_call_count = 0  # Track draw calls for performance monitoring
         
+        # Simulation state as one binary string, for rollback and instant resume (F7 saves, F8 restores)
+        self.snapshots = self.create_snapshotter()
+        
+        # Opt-in sampling profiler (LITTLESPACE_PROFILE=1, F9 captures on demand)
+        self.profiler = None
+        if profiler_enabled():
+            self.profiler = SamplingProfiler("space_flight_minimal")
+            self.profiler.start()
+        
+        # Opt-in allocation tracking per phase (LITTLESPACE_ALLOC=1, F10 prints the top lines)
+        self.allocations = AllocationTracker("space_flight_minimal")
+        
+        # Runtime quality governor, knobs listed in the order they are reduced.
+        # Start levels match the previous hand-tuned settings.
+        self.quality = QualityGovernor()
+        self.quality.add_knob("star_density", [0.25, 0.5, 0.75, 1.0], start_level=1)
+        self.quality.add_knob("ai_think_rate", [10, 20, 30, 60])
+        self.quality.add_knob("bullet_budget", [4, 8, 16], start_level=1)
+        self.quality.add_knob("particle_budget", [5000, 20000, 50000])
+        
+        # Profiler panel (F3), F4 toggles the governor
+        self.profiler_overlay = ProfilerOverlay(10, WINDOW_HEIGHT - 50)
+        self.profiler_overlay.add_section("quality", self.quality.profiler_lines)
+        self.profiler_overlay.add_section("frame pacing", self.pacer.profiler_lines)
+        self.profiler_overlay.add_section("radar", self.radar.profiler_lines)
+        self.profiler_overlay.add_section("enemy AI", self.ai_scheduler.profiler_lines)
+        self.profiler_overlay.add_section("flow field", self.flow_field.profiler_lines)
+        self.profiler_overlay.add_section("starfield", self.starfield.profiler_lines)
+        self.profiler_overlay.add_section("particles", self.particles.profiler_lines)
+        self.profiler_overlay.add_section("beams", self.beams.profiler_lines)
+        self.profiler_overlay.add_section("draw batching", self.batcher.profiler_lines)
+        self.profiler_overlay.add_section("garbage collector", self.gc_manager.profiler_lines)
+        self.profiler_overlay.add_section("allocations", self.allocations.profiler_lines)
+        self.profiler_overlay.add_section("snapshots", self.snapshots.profiler_lines)
+        if self.net:
+            self.profiler_overlay.add_section("server", self.net.profiler_lines)
+        
         # Fullscreen state (simple)
         self.is_fullscreen = False
         
-        # Track base resolution for scaling
-        self.base_width = WINDOW_WIDTH
-        self.base_height = WINDOW_HEIGHT
-        
         # HUD text objects - positioned relative to screen
         self.fps_text = arcade.Text("FPS: --", 
                                    10, 
@@ -836,9 +781,13 @@ class SpaceFlightGame(arcade.Window):
     def setup(self):
         # Start player in center of world
         self.player = Player(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
-        self.starfield = StarField(WORLD_WIDTH, WORLD_HEIGHT)
         self.camera = Camera()
         
+        # Online the server spawns everything; when watching, the local ship is an invisible free camera
+        if self.net:
+            self.net.join()
+            return
+        
         # Spawn initial enemies
         self.spawn_enemy()  # Old enemy system
         
@@ -846,6 +795,33 @@ class SpaceFlightGame(arcade.Window):
         for _ in range(self.max_enemy_ships):
             self.spawn_enemy_ship()
     
+    def create_snapshotter(self):
+        """Everything the combat simulation steps; particles and the HUD are left out"""
+        motion = [("x", "d"), ("y", "d"), ("velocity_x", "d"), ("velocity_y", "d"), ("angle", "d")]
+        thrust = [("thrusting_forward", "?"), ("thrusting_backward", "?")]
+        snapshots = WorldSnapshotter()
+        snapshots.add_section("game", lambda: [self], ObjectLayout([("collision_check_timer", "d")]))
+        snapshots.add_section("ai", lambda: [self.ai_scheduler], ObjectLayout([("clock", "d"), ("frame", "q"), ("stagger", "B")]))
+        snapshots.add_section("flow field", lambda: [self.flow_field], ObjectLayout(
+            [("refresh_timer", "d"), ("field_target", "i"), ("build_target", "i"), ("build_steps", "I")],
+            restored=FlowField.restored))
+        snapshots.add_section("player", lambda: [self.player], ObjectLayout(
+            motion + thrust + [("shoot_cooldown", "d")]))
+        snapshots.add_section("enemies", lambda: self.enemies, ObjectLayout(
+            [("x", "d"), ("y", "d"), ("type", "B", ("circle", "square")), ("size", "d")],
+            create=lambda: Enemy(0, 0, "circle", ENEMY_MIN_SIZE)), self.contacts, ENEMY_MAX_SIZE)
+        snapshots.add_section("enemy ships", lambda: self.enemy_ships, ObjectLayout(
+            motion + thrust + [("shoot_cooldown", "d"), ("next_shoot_time", "d"), ("last_player_distance", "d"),
+                               ("target_angle", "d"), ("next_think", "d"), ("idle_time", "d"), ("ai_phase", "B")],
+            create=lambda: EnemyShip(0, 0)), self.contacts, SHIP_SIZE)
+        snapshots.add_section("bullets", lambda: self.bullets, ObjectLayout(
+            motion, create=lambda: Bullet(0, 0, 0, 0, 0), restored=Bullet.orient), self.contacts)
+        snapshots.add_section("enemy bullets", lambda: self.enemy_bullets, ObjectLayout(
+            motion, create=lambda: Bullet(0, 0, 0, 0, 0, ENEMY_BULLET_COLOR), restored=Bullet.orient), self.contacts)
+        snapshots.add_section("camera", lambda: [self.camera], ObjectLayout(
+            [("x", "d"), ("y", "d"), ("target_x", "d"), ("target_y", "d")]))
+        return snapshots
+    
     def spawn_enemy(self):
         """Spawn a random enemy around the player"""
         import random
@@ -884,6 +860,7 @@ class SpaceFlightGame(arcade.Window):
                     
                     enemy = Enemy(enemy_x, enemy_y, enemy_type, enemy_size)
                     self.enemies.append(enemy)
+                    self.contacts.insert(enemy, enemy.size)
                     return  # Success, exit
                     
             except Exception:
@@ -911,20 +888,93 @@ class SpaceFlightGame(arcade.Window):
         enemy_y = max(50, min(enemy_y, WORLD_HEIGHT - 50))
         
         new_enemy = EnemyShip(enemy_x, enemy_y)
+        new_enemy.think(self.player, self.enemy_ships)
         self.enemy_ships.append(new_enemy)
+        self.contacts.insert(new_enemy, new_enemy.size)
+    
+    def ship_neighbours(self, ship):
+        """Enemy ships close enough for ship to keep its distance from"""
+        return [other for other in self.contacts.query_radius(ship.x, ship.y, ship.separation_distance)
+                if isinstance(other, EnemyShip)]
+    
+    def cast_beam(self, x0, y0, x1, y1):
+        return self.contacts.raycast(x0, y0, x1, y1, self.beam_intersect)
+    
+    def beam_intersect(self, obj, x0, y0, unit_x, unit_y, length):
+        """Where a ray first hits an enemy or enemy ship; bullets let beams through"""
+        if isinstance(obj, Enemy):
+            x, y, radius = obj.obstacle()
+        elif isinstance(obj, EnemyShip):
+            x, y, radius = obj.x, obj.y, obj.size
+        else:
+            return None
+        distance = ray_circle(x0, y0, unit_x, unit_y, length, x, y, radius)
+        return None if distance is None else (distance, None)
+    
+    def fire_laser(self):
+        """Destroy the first enemy or enemy ship in front of the player"""
+        angle_rad = math.radians(self.player.angle)
+        hit = self.beams.fire("laser", self.player, self.player.x + math.sin(angle_rad) * self.player.size,
+                              self.player.y + math.cos(angle_rad) * self.player.size, self.player.angle)
+        if hit is None:
+            return
+        target, _, _, hit_x, hit_y = hit
+        self.particles.emit("impact", hit_x, hit_y, self.player.angle + 180)
+        self.contacts.remove(target)
+        if isinstance(target, Enemy):
+            self.enemies.remove(target)
+            self.particles.emit("explosion", target.x, target.y, count=int(target.size * 8))
+            self.spawn_enemy()
+        else:
+            self.enemy_ships.remove(target)
+            self.particles.emit("explosion", target.x, target.y,
+                                velocity_x=target.velocity_x, velocity_y=target.velocity_y)
+    
+    def emit_exhaust(self, ship, delta_time):
+        """Exhaust particles from the end of a ship's thruster flame"""
+        if not (ship.thrusting_forward or (ship.thrusting_backward and SHOW_REVERSE_THRUSTER)):
+            return
+        angle_rad = math.radians(ship.angle)
+        tail = ship.size * 0.6 + THRUSTER_GAP + THRUSTER_LENGTH
+        x = ship.x - math.sin(angle_rad) * tail
+        y = ship.y - math.cos(angle_rad) * tail
+        name = "exhaust" if ship.thrusting_forward else "reverse_exhaust"
+        self.particles.emit_continuous(name, x, y, ship.angle + 180, ship.velocity_x, ship.velocity_y, delta_time)
+    
+    def radar_blip(self, contact):
+        """Radar colour and size in texels for an enemy, enemy ship or bullet"""
+        if isinstance(contact, Bullet):
+            return contact.color, 1
+        if isinstance(contact, EnemyShip):
+            return RADAR_SHIP_COLOR, 4
+        if isinstance(contact, Player):
+            return RADAR_PLAYER_COLOR, 4
+        return (ENEMY_CIRCLE_COLOR if contact.type == "circle" else ENEMY_SQUARE_COLOR), 3
     
     def transform_coords(self, x, y):
         """Simple pass-through - no transformation to prevent performance issues"""
         return x, y
     
     def on_draw(self):
+        if self.profiler:
+            self.profiler.frame_start()
+        
+        self.allocations.begin("draw")
         self.clear()
+        self.render_target.clear()
         
-        # Use world camera for game objects
+        # Use world camera for game objects (renders into the offscreen framebuffer)
         self.world_camera.use()
         
-        # Draw starfield (background)
-        self.starfield.draw(self.camera.x, self.camera.y, self)
+        # Parallax star layers (background), generated per pixel; replaces clearing the frame
+        self.starfield.draw(self.camera.x, self.camera.y, SCREEN_SCALE * SCREEN_WIDTH / WINDOW_WIDTH,
+                            self.quality.value("star_density"))
+        
+        # Particles behind the ships so exhaust trails from under the hulls
+        self.particles.draw(self.camera.x, self.camera.y, SCREEN_SCALE, SCREEN_SCALE * SCREEN_WIDTH / WINDOW_WIDTH)
+        
+        # Everything from here to the player is batched
+        self.batcher.begin()
         
         # Draw enemies
         for enemy in self.enemies:
@@ -941,9 +991,21 @@ class SpaceFlightGame(arcade.Window):
         # Draw bullets
         for bullet in self.bullets:
             bullet.draw(self.camera.x, self.camera.y, self)
+        self.beams.draw(self.camera.x, self.camera.y, SCREEN_SCALE)
         
-        # Draw player ship
-        self.player.draw(self.camera.x, self.camera.y, self)
+        # Draw other players online, then our own ship
+        for other_player in self.other_players:
+            other_player.draw(self.camera.x, self.camera.y, self)
+        if not self.net or self.net.role == ROLE_PLAY:
+            self.player.draw(self.camera.x, self.camera.y, self)
+        self.batcher.end()
+        
+        # Single upscale pass to the window
+        self.render_target.blit()
+        
+        # Radar first: a due refresh rebinds the camera
+        radar_width = RADAR_SIZE * 2
+        self.radar.draw(self.width - RADAR_MARGIN - radar_width, RADAR_MARGIN, radar_width)
         
         # Use GUI camera for HUD
         self.gui_camera.use()
@@ -951,14 +1013,33 @@ class SpaceFlightGame(arcade.Window):
         # Draw HUD
         self.fps_text.draw()
         self.coords_text.draw()
+        self.profiler_overlay.draw()
+        
+        self.batcher.frame_end()
+        self.allocations.end("draw")
+        self.allocations.frame_end()
+        
+        self.quality.frame_end()
+        startup_timer.first_frame()
     
     def on_update(self, delta_time):
+        self.allocations.begin("update")
+        self.quality.frame_begin()
+        self.max_bullets = self.quality.value("bullet_budget")
+        self.particles.set_budget(self.quality.value("particle_budget"))
+        
         # Update FPS and coordinates display
-        fps_value = f"FPS: {1/delta_time:.1f}" if delta_time > 0 else "FPS: --"
+        fps_value = f"FPS: {self.pacer.fps:.1f}" if self.pacer.fps > 0 else "FPS: --"
         self.fps_text.text = fps_value
         
         coord_text = f"X: {int(self.player.x)} Y: {int(self.player.y)}"
         self.coords_text.text = coord_text
+        self.profiler_overlay.update(delta_time)
+        
+        if self.net:
+            self.update_online(delta_time)
+            self.allocations.end("update")
+            return
         
         # Handle shooting with limits (keyboard and mouse)
         shooting = (arcade.key.SPACE in self.keys_pressed or 
@@ -967,6 +1048,12 @@ class SpaceFlightGame(arcade.Window):
             bullet = self.player.shoot()
             if bullet:
                 self.bullets.append(bullet)
+                self.contacts.insert(bullet)
+        
+        # The laser hits instantly, before anything moves this frame
+        self.beams.update(delta_time)
+        if arcade.key.L in self.keys_pressed:
+            self.fire_laser()
         
         # Pure keyboard controls - no mouse steering
         
@@ -976,6 +1063,7 @@ class SpaceFlightGame(arcade.Window):
         except Exception:
             # Reset player if update fails
             self.player = Player(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
+        self.emit_exhaust(self.player, delta_time)
         
         # Update bullets and check collisions (optimized and safe)
         try:
@@ -986,6 +1074,7 @@ class SpaceFlightGame(arcade.Window):
             for i, bullet in enumerate(self.bullets):
                 if bullet and hasattr(bullet, 'update'):
                     bullet.update(delta_time)
+                    self.contacts.move(bullet)
                     
                     # Check if bullet is off screen
                     if hasattr(bullet, 'is_off_screen') and bullet.is_off_screen():
@@ -1016,6 +1105,7 @@ class SpaceFlightGame(arcade.Window):
                                     bullets_to_remove.append(i)
                                 if j not in enemies_to_remove:
                                     enemies_to_remove.append(j)
+                                self.particles.emit("impact", bullet.x, bullet.y)
                                 bullet_hit = True
                                 break
                         except Exception:
@@ -1025,12 +1115,14 @@ class SpaceFlightGame(arcade.Window):
             # Safely remove objects (in reverse order to maintain indices)
             for i in sorted(set(bullets_to_remove), reverse=True):
                 if 0 <= i < len(self.bullets):
-                    self.bullets.pop(i)
+                    self.contacts.remove(self.bullets.pop(i))
             
             enemies_destroyed = 0
             for j in sorted(set(enemies_to_remove), reverse=True):
                 if 0 <= j < len(self.enemies):
-                    self.enemies.pop(j)
+                    enemy = self.enemies.pop(j)
+                    self.contacts.remove(enemy)
+                    self.particles.emit("explosion", enemy.x, enemy.y, count=int(enemy.size * 8))
                     enemies_destroyed += 1
             
             # Spawn new enemies for destroyed ones (but not more than max)
@@ -1042,26 +1134,35 @@ class SpaceFlightGame(arcade.Window):
             self.bullets = [b for b in self.bullets if b and hasattr(b, 'x')]
             self.enemies = [e for e in self.enemies if e and hasattr(e, 'x')]
         
+        # Enemy decisions are spread over frames within a budget and run less often far
+        # from the player; near ships still steer and move every frame
+        self.flow_field.set_obstacles([enemy.obstacle() for enemy in self.enemies])
+        self.flow_field.update(delta_time, self.player.x, self.player.y)
+        moves = self.ai_scheduler.plan(self.enemy_ships, self.player, self.ship_neighbours, delta_time,
+                                       self.quality.value("ai_think_rate"), self.flow_field)
+        
         # Update enemy ships
         enemy_ships_to_remove = []
-        for i, enemy_ship in enumerate(self.enemy_ships):
+        for enemy_ship, step in moves:
             try:
-                # Pass all enemy ships for separation behavior
-                enemy_ship.update(delta_time, self.player, self.enemy_ships)
+                enemy_ship.update(step, self.player, think=False)
+                self.contacts.move(enemy_ship)
+                self.emit_exhaust(enemy_ship, step)
                 
                 # Enemy shooting with intelligent timing
                 if enemy_ship.can_shoot(self.player, delta_time):
                     enemy_bullet = enemy_ship.shoot(self.player)
                     if enemy_bullet:
                         self.enemy_bullets.append(enemy_bullet)
+                        self.contacts.insert(enemy_bullet)
             except Exception:
                 # If enemy ship update fails, mark for removal
-                enemy_ships_to_remove.append(i)
+                enemy_ships_to_remove.append(enemy_ship)
         
         # Remove failed enemy ships
-        for i in sorted(enemy_ships_to_remove, reverse=True):
-            if 0 <= i < len(self.enemy_ships):
-                self.enemy_ships.pop(i)
+        for enemy_ship in enemy_ships_to_remove:
+            self.enemy_ships.remove(enemy_ship)
+            self.contacts.remove(enemy_ship)
         
         # Update enemy bullets
         try:
@@ -1069,13 +1170,14 @@ class SpaceFlightGame(arcade.Window):
             for i, bullet in enumerate(self.enemy_bullets):
                 if bullet and hasattr(bullet, 'update'):
                     bullet.update(delta_time)
+                    self.contacts.move(bullet)
                     if hasattr(bullet, 'is_off_screen') and bullet.is_off_screen():
                         enemy_bullets_to_remove.append(i)
             
             # Remove off-screen enemy bullets
             for i in sorted(enemy_bullets_to_remove, reverse=True):
                 if 0 <= i < len(self.enemy_bullets):
-                    self.enemy_bullets.pop(i)
+                    self.contacts.remove(self.enemy_bullets.pop(i))
                     
         except Exception:
             # Clear problematic enemy bullets
@@ -1091,6 +1193,7 @@ class SpaceFlightGame(arcade.Window):
                 
             for enemy_idx, enemy_ship in enumerate(self.enemy_ships):
                 if enemy_ship and enemy_ship.check_collision_with_bullet(bullet):
+                    self.particles.emit("impact", bullet.x, bullet.y)
                     bullets_to_remove.append(bullet_idx)
                     enemy_ships_to_remove.append(enemy_idx)
                     break  # Bullet can only hit one enemy
@@ -1098,12 +1201,15 @@ class SpaceFlightGame(arcade.Window):
         # Remove bullets that hit enemy ships
         for i in sorted(set(bullets_to_remove), reverse=True):
             if 0 <= i < len(self.bullets):
-                self.bullets.pop(i)
+                self.contacts.remove(self.bullets.pop(i))
         
         # Remove destroyed enemy ships
         for i in sorted(set(enemy_ships_to_remove), reverse=True):
             if 0 <= i < len(self.enemy_ships):
-                self.enemy_ships.pop(i)
+                enemy_ship = self.enemy_ships.pop(i)
+                self.contacts.remove(enemy_ship)
+                self.particles.emit("explosion", enemy_ship.x, enemy_ship.y,
+                                    velocity_x=enemy_ship.velocity_x, velocity_y=enemy_ship.velocity_y)
         
         # Spawn new enemy ships to maintain the count
         while len(self.enemy_ships) < self.max_enemy_ships:
@@ -1118,21 +1224,93 @@ class SpaceFlightGame(arcade.Window):
                     distance = math.sqrt((self.player.x - bullet.x)**2 + (self.player.y - bullet.y)**2)
                     if distance <= self.player.size:
                         enemy_bullets_to_remove.append(i)
+                        self.particles.emit("impact", bullet.x, bullet.y, color=bullet.color)
                         # TODO: Add player damage/destruction here later
                         # For now, just remove the bullet
             
             # Remove enemy bullets that hit player
             for i in sorted(enemy_bullets_to_remove, reverse=True):
                 if 0 <= i < len(self.enemy_bullets):
-                    self.enemy_bullets.pop(i)
+                    self.contacts.remove(self.enemy_bullets.pop(i))
                     
         except Exception:
             # Clear problematic collisions
             pass
         
+        self.particles.update(delta_time)
+        
         # Update camera to follow player
         self.camera.follow_player(self.player.x, self.player.y)
         self.camera.update(delta_time)
+        self.radar.update(delta_time, self.player.x, self.player.y)
+        
+        self.allocations.end("update")
+    
+    def update_online(self, delta_time):
+        """Send input to the server and show its latest snapshot instead of simulating"""
+        bits = 0
+        for bit, keys in NET_INPUT_KEYS:
+            if any(key in self.keys_pressed for key in keys):
+                bits |= bit
+        if arcade.MOUSE_BUTTON_LEFT in self.mouse_pressed:
+            bits |= INPUT_FIRE
+        if self.net.role == ROLE_WATCH:
+            self.player.update(delta_time, self.keys_pressed)
+        
+        # The view rect decides what the server sends us
+        self.net.send_input(bits, self.camera.x, self.camera.y,
+                            self.camera.x + SCREEN_WIDTH, self.camera.y + SCREEN_HEIGHT)
+        if self.net.poll():
+            self.apply_remote_state()
+        
+        for ship in self.enemy_ships + self.other_players + [self.player]:
+            self.emit_exhaust(ship, delta_time)
+        self.particles.update(delta_time)
+        self.camera.follow_player(self.player.x, self.player.y)
+        self.camera.update(delta_time)
+        self.radar.update(delta_time, self.player.x, self.player.y)
+    
+    def apply_remote_state(self):
+        """Mirror the newest server state into the lists on_draw and the radar use"""
+        self.enemy_ships = []
+        self.bullets = []
+        self.enemy_bullets = []
+        self.other_players = []
+        lists = {KIND_ENEMY_SHIP: self.enemy_ships, KIND_BULLET: self.bullets, KIND_ENEMY_BULLET: self.enemy_bullets}
+        seen = set()
+        for entity_id, kind, x, y, angle, flags in self.net.entities():
+            if entity_id == self.net.ship_id:
+                self.player.x, self.player.y, self.player.angle = x, y, angle
+                self.player.thrusting_forward = bool(flags & FLAG_THRUST)
+                self.player.thrusting_backward = bool(flags & FLAG_REVERSE)
+                continue
+            seen.add(entity_id)
+            obj = self.remote.get(entity_id)
+            if obj is None:
+                if kind == KIND_ENEMY_SHIP:
+                    obj = EnemyShip(x, y)
+                elif kind == KIND_BULLET:
+                    obj = Bullet(x, y, 0, 0, angle)
+                elif kind == KIND_ENEMY_BULLET:
+                    obj = Bullet(x, y, 0, 0, angle, ENEMY_BULLET_COLOR)
+                else:
+                    obj = Player(x, y)
+                self.remote[entity_id] = obj
+                self.contacts.insert(obj, getattr(obj, "size", 0.0))
+            obj.x, obj.y, obj.angle = x, y, angle
+            obj.thrusting_forward = bool(flags & FLAG_THRUST)
+            obj.thrusting_backward = bool(flags & FLAG_REVERSE)
+            self.contacts.move(obj)
+            lists.get(kind, self.other_players).append(obj)
+        
+        # Out of view or destroyed; the server does not say which
+        for entity_id in [entity_id for entity_id in self.remote if entity_id not in seen]:
+            self.contacts.remove(self.remote.pop(entity_id))
+    
+    def on_close(self):
+        if self.net:
+            self.net.close()
+        super().on_close()
     
     def on_key_press(self, key, modifiers):
         self.keys_pressed.add(key)
@@ -1141,6 +1319,30 @@ class SpaceFlightGame(arcade.Window):
         if key == arcade.key.F:
             self.toggle_fullscreen()
         
+        # Profiler panel and quality governor toggles
+        if key == arcade.key.F3:
+            self.profiler_overlay.toggle()
+        elif key == arcade.key.F4:
+            self.quality.enabled = not self.quality.enabled
+        elif key == arcade.key.F5:
+            self.pacer.cycle_mode()
+        elif key == arcade.key.F6:
+            self.batcher.enabled = not self.batcher.enabled
+        
+        # Quick save and restore of the simulation state
+        if key == arcade.key.F7:
+            self.snapshots.quick_save()
+        elif key == arcade.key.F8:
+            self.snapshots.quick_restore()
+        
+        # Capture recent profiler samples on demand
+        if key == arcade.key.F9 and self.profiler:
+            self.profiler.capture()
+        
+        # Print where the next frame allocates
+        if key == arcade.key.F10:
+            self.allocations.capture()
+        
         # Handle escape key to exit
         if key == arcade.key.ESCAPE:
             self.close()
@@ -1169,30 +1371,8 @@ class SpaceFlightGame(arcade.Window):
         """Handle window resize with proper aspect ratio preservation"""
         super().on_resize(width, height)
         
-        # Calculate aspect ratios
-        game_aspect = self.base_width / self.base_height
-        window_aspect = width / height
-        
-        if window_aspect > game_aspect:
-            # Window is wider - scale by height and center horizontally
-            scale = height / self.base_height
-            viewport_width = self.base_width * scale
-            viewport_height = height
-            viewport_x = (width - viewport_width) / 2
-            viewport_y = 0
-        else:
-            # Window is taller - scale by width and center vertically
-            scale = width / self.base_width
-            viewport_width = width
-            viewport_height = self.base_height * scale
-            viewport_x = 0
-            viewport_y = (height - viewport_height) / 2
-        
-        # Configure world camera viewport for proper scaling
-        self.world_camera.viewport_left = viewport_x
-        self.world_camera.viewport_bottom = viewport_y
-        self.world_camera.viewport_width = viewport_width
-        self.world_camera.viewport_height = viewport_height
+        # The world keeps its native resolution; only the blit rect changes
+        self.render_target.resize(*self.get_framebuffer_size())
         
         # GUI camera uses full window
         self.gui_camera.viewport_left = 0
@@ -1207,11 +1387,15 @@ class SpaceFlightGame(arcade.Window):
         if self.coords_text:
             self.coords_text.x = 10
             self.coords_text.y = 20
+        self.profiler_overlay.text.position = (10, height - 50)
 
 def main():
     game = SpaceFlightGame()
+    startup_timer.mark("window")
     game.setup()
-    arcade.run()
+    game.gc_manager.freeze()
+    startup_timer.mark("setup")
+    game.pacer.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
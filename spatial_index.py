@@ -0,0 +1,193 @@
+import math
+
+SPATIAL_CELL_SIZE = 128  # World units; about a fifth of the screen at 1x zoom
+
+
+def segment_cells(x0, y0, x1, y1, cell_size):
+    """Cells (column, row, distance from the start where the segment enters) the segment crosses, in order.
+
+    A grid walk (DDA): each step crosses the nearer of the next vertical
+    and horizontal cell boundary, so only crossed cells are visited.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    length = math.hypot(dx, dy)
+    column = int(x0 // cell_size)
+    row = int(y0 // cell_size)
+    steps = abs(int(x1 // cell_size) - column) + abs(int(y1 // cell_size) - row)
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    # Fraction of the segment to the next boundary on each axis, and between boundaries
+    next_x = ((column + (dx > 0)) * cell_size - x0) / dx if dx else math.inf
+    next_y = ((row + (dy > 0)) * cell_size - y0) / dy if dy else math.inf
+    delta_x = cell_size / abs(dx) if dx else math.inf
+    delta_y = cell_size / abs(dy) if dy else math.inf
+
+    yield column, row, 0.0
+    for _ in range(steps):
+        if next_x < next_y:
+            column += step_x
+            entry = next_x
+            next_x += delta_x
+        else:
+            row += step_y
+            entry = next_y
+            next_y += delta_y
+        yield column, row, entry * length
+
+
+def ray_circle(x0, y0, unit_x, unit_y, length, center_x, center_y, radius):
+    """Distance along a unit ray to where it enters the circle, 0 from inside, or None if it misses within length"""
+    offset_x = center_x - x0
+    offset_y = center_y - y0
+    along = offset_x * unit_x + offset_y * unit_y
+    miss = offset_x * offset_x + offset_y * offset_y - along * along
+    if miss > radius * radius:
+        return None
+    half_chord = math.sqrt(radius * radius - miss)
+    if along + half_chord < 0:
+        return None  # Behind the start
+    distance = max(along - half_chord, 0.0)
+    return distance if distance <= length else None
+
+
+class SpatialGrid:
+    """Uniform grid of objects bucketed by their centre (obj.x, obj.y).
+
+    Objects that move must be passed to move() afterwards; it only touches the
+    buckets when the object changes cell. Queries are widened by the largest
+    radius of the objects held, so objects overlapping the area from a
+    neighbouring cell are returned too; it shrinks again when that object
+    shrinks or leaves. Results keep insertion order within a cell.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> {obj: None}, dicts keep a stable order
+        self.object_cells = {}  # obj -> (column, row)
+        self.radii = {}  # obj -> radius
+        self.max_radius = 0.0
+        self.ray_cells = 0  # Cells visited by raycast(), cumulative
+
+    def __len__(self):
+        return len(self.object_cells)
+
+    def __contains__(self, obj):
+        return obj in self.object_cells
+
+    def cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, obj, radius=0.0):
+        if obj in self.object_cells:
+            return
+        key = self.cell(obj.x, obj.y)
+        self.cells.setdefault(key, {})[obj] = None
+        self.object_cells[obj] = key
+        self.radii[obj] = radius
+        self.max_radius = max(self.max_radius, radius)
+
+    def move(self, obj, radius=None):
+        """Follow an object that has moved; pass radius if it has changed size"""
+        if radius is not None:
+            old_radius = self.radii[obj]
+            self.radii[obj] = radius
+            if radius > self.max_radius:
+                self.max_radius = radius
+            elif old_radius == self.max_radius and radius < old_radius:
+                self.max_radius = max(self.radii.values())
+        key = self.cell(obj.x, obj.y)
+        old_key = self.object_cells[obj]
+        if key == old_key:
+            return
+        bucket = self.cells[old_key]
+        del bucket[obj]
+        if not bucket:
+            del self.cells[old_key]
+        self.cells.setdefault(key, {})[obj] = None
+        self.object_cells[obj] = key
+
+    def remove(self, obj):
+        key = self.object_cells.pop(obj, None)
+        if key is None:
+            return
+        if self.radii.pop(obj) == self.max_radius:
+            self.max_radius = max(self.radii.values(), default=0.0)
+        bucket = self.cells[key]
+        del bucket[obj]
+        if not bucket:
+            del self.cells[key]
+
+    def query_rect(self, left, bottom, right, top):
+        """Objects whose centre lies within the rect widened by the largest radius"""
+        margin = self.max_radius
+        left -= margin
+        bottom -= margin
+        right += margin
+        top += margin
+        first_column, first_row = self.cell(left, bottom)
+        last_column, last_row = self.cell(right, top)
+
+        # Sparse worlds: walking the occupied cells beats walking a large empty area
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(self.cells):
+            buckets = [bucket for (column, row), bucket in self.cells.items()
+                       if first_column <= column <= last_column and first_row <= row <= last_row]
+        else:
+            cells = self.cells
+            buckets = [cells[(column, row)]
+                       for column in range(first_column, last_column + 1)
+                       for row in range(first_row, last_row + 1)
+                       if (column, row) in cells]
+
+        return [obj for bucket in buckets for obj in bucket
+                if left <= obj.x <= right and bottom <= obj.y <= top]
+
+    def query_radius(self, x, y, radius):
+        """Objects whose centre lies within radius of (x, y), nearest first"""
+        found = []
+        for obj in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            distance = math.hypot(obj.x - x, obj.y - y)
+            if distance <= radius:
+                found.append((distance, obj))
+        found.sort(key=lambda entry: entry[0])
+        return [obj for _, obj in found]
+
+    def raycast(self, x0, y0, x1, y1, intersect):
+        """First object along the segment from (x0, y0) to (x1, y1): (obj, distance, part) or None.
+
+        intersect(obj, x0, y0, unit_x, unit_y, length) returns (distance,
+        part) where the ray first hits the object, part naming what was hit
+        for objects made of pieces, or None. Objects are bucketed by centre,
+        so each crossed cell is searched together with the ring of cells
+        the largest radius reaches into; cells are visited in order along
+        the ray and the walk stops once no unvisited cell can hold a closer
+        hit.
+        """
+        length = math.hypot(x1 - x0, y1 - y0)
+        if not length:
+            return None
+        unit_x = (x1 - x0) / length
+        unit_y = (y1 - y0) / length
+        reach = math.ceil(self.max_radius / self.cell_size)
+        # Farthest a hit can lie before the entry point of the crossed cell that found it
+        slack = (reach + 1) * self.cell_size * math.sqrt(2) + self.max_radius
+        cells = self.cells
+        visited = set()
+        best = None
+        best_distance = length
+        for column, row, entry in segment_cells(x0, y0, x1, y1, self.cell_size):
+            if entry - slack > best_distance:
+                break
+            for near_column in range(column - reach, column + reach + 1):
+                for near_row in range(row - reach, row + reach + 1):
+                    key = (near_column, near_row)
+                    if key in visited:
+                        continue
+                    visited.add(key)
+                    for obj in cells.get(key, ()):
+                        hit = intersect(obj, x0, y0, unit_x, unit_y, best_distance)
+                        if hit is not None and hit[0] <= best_distance:
+                            best_distance, part = hit
+                            best = obj
+        self.ray_cells += len(visited)
+        return None if best is None else (best, best_distance, part)
@@ -0,0 +1,71 @@
+import time
+
+# Budget for incremental world building, spent at the start of each frame
+WORLD_BUILD_BUDGET = 0.004  # 4ms per frame
+
+
+class StartupTimer:
+    """Measures import time, setup time and time-to-first-frame for an entry point"""
+
+    def __init__(self, name, start_time):
+        self.name = name
+        self.start_time = start_time  # perf_counter() taken before the heavy imports
+        self.marks = {}
+        self.last_mark = start_time
+        self.reported = False
+
+    def mark(self, label):
+        """Record the time spent since the previous mark under label"""
+        now = time.perf_counter()
+        self.marks[label] = now - self.last_mark
+        self.last_mark = now
+
+    def first_frame(self):
+        """Call at the end of on_draw; reports once on the first frame"""
+        if self.reported:
+            return
+        self.reported = True
+        self.mark("first_frame")
+        self.marks["total"] = time.perf_counter() - self.start_time
+        print(self.summary())
+
+    def world_ready(self, builder):
+        """Report when the incremental world build has finished"""
+        ready_at = time.perf_counter() - self.start_time
+        print(f"[{self.name}] world built: {builder.build_time * 1000:.1f}ms of work "
+              f"over {builder.frames} frames, ready at {ready_at * 1000:.1f}ms")
+
+    def summary(self):
+        parts = [f"{label} {seconds * 1000:.1f}ms" for label, seconds in self.marks.items()]
+        return f"[{self.name}] startup: " + ", ".join(parts)
+
+
+class WorldBuilder:
+    """Runs world construction steps a few at a time so the first frame is not blocked"""
+
+    def __init__(self, steps, budget=WORLD_BUILD_BUDGET):
+        # steps is an iterator; each next() performs one small unit of work
+        self.steps = steps
+        self.budget = budget
+        self.done = False
+        self.build_time = 0.0
+        self.frames = 0
+
+    def run(self, budget=None):
+        """Run steps until the time budget is used up. Returns True once finished."""
+        if self.done:
+            return True
+
+        start = time.perf_counter()
+        deadline = start + (self.budget if budget is None else budget)
+        try:
+            while True:
+                next(self.steps)
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self.done = True
+
+        self.build_time += time.perf_counter() - start
+        self.frames += 1
+        return self.done
@@ -0,0 +1,127 @@
+import arcade
+import collections
+import math
+from arcade.types import LBWH, LRBT
+
+from render_target import TextureBlitter
+
+TILE_SIZE = 256                  # World units per tile side
+TILE_CACHE_TEXELS = 8 * 1024 * 1024  # ~32MB of RGBA tiles before the least recently used are dropped
+
+
+class Tile:
+    def __init__(self, ctx, size):
+        self.size = size  # Texels per side
+        self.texture = ctx.texture((size, size), components=4, filter=(ctx.NEAREST, ctx.NEAREST))
+        self.framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+
+    def delete(self):
+        self.framebuffer.delete()
+        self.texture.delete()
+
+
+class TileCache:
+    """Static scenery prerendered into world-aligned tiles, kept in an LRU texture cache.
+
+    render_tile(left, bottom, texel_scale) draws everything overlapping the
+    tile in screen units relative to (left, bottom), exactly as the objects
+    would be drawn with camera (left, bottom). Tiles are opaque and replace
+    clearing the frame, so draw() must come first. Tiles are keyed by
+    position, texel scale and a caller-supplied state tuple (e.g. quality
+    levels) and are only re-rendered when evicted or invalidated.
+    """
+
+    def __init__(self, window, render_tile, draw_scale, tile_size=TILE_SIZE, max_texels=TILE_CACHE_TEXELS):
+        self.ctx = window.ctx
+        self.render_tile = render_tile
+        self.draw_scale = draw_scale  # Screen units per world unit used by the draw code
+        self.tile_size = tile_size
+        self.max_texels = max_texels
+        self.blitter = TextureBlitter(self.ctx)
+
+        self.tiles = collections.OrderedDict()  # (column, row, texel scale, state) -> Tile, oldest first
+        self.texels = 0
+        self.tiles_rendered = 0
+        self.tiles_drawn = 0  # Last frame
+
+    def draw(self, view_left, view_bottom, view_width, view_height, zoom, texel_scale, state=()):
+        """Composite the tiles covering the view into the bound framebuffer.
+
+        zoom is framebuffer pixels per world unit; texel_scale is the resolution
+        tiles are rendered at (the zoom the camera is settling at). Rendering a
+        missing tile rebinds the framebuffer and camera, so the caller must
+        re-apply its camera afterwards.
+        """
+        target = self.ctx.active_framebuffer
+        viewport = self.ctx.viewport
+        size = self.tile_size
+
+        first_column = max(0, int(view_left // size))
+        last_column = int((view_left + view_width) // size)
+        first_row = max(0, int(view_bottom // size))
+        last_row = int((view_bottom + view_height) // size)
+
+        self.tiles_drawn = 0
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                tile = self.get(column, row, texel_scale, state)
+                target.use()
+
+                # Shared edges are rounded once so neighbouring tiles never gap or overlap
+                left = round((column * size - view_left) * zoom)
+                right = round(((column + 1) * size - view_left) * zoom)
+                bottom = round((row * size - view_bottom) * zoom)
+                top = round(((row + 1) * size - view_bottom) * zoom)
+                self.blitter.draw(tile.texture, (left, bottom, right - left, top - bottom))
+                self.tiles_drawn += 1
+
+        self.evict()
+        self.ctx.viewport = viewport
+
+    def get(self, column, row, texel_scale, state):
+        key = (column, row, texel_scale, state)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+
+        tile = Tile(self.ctx, max(1, math.ceil(self.tile_size * texel_scale)))
+        self.tiles[key] = tile
+        self.texels += tile.size * tile.size
+
+        # Logical tile area mapped onto the tile's texels
+        half = self.tile_size * self.draw_scale / 2
+        camera = arcade.Camera2D(
+            viewport=LBWH(0, 0, tile.size, tile.size),
+            projection=LRBT(-half, half, -half, half),
+            position=(half, half),
+            render_target=tile.framebuffer
+        )
+        camera.use()
+        tile.framebuffer.clear(color=arcade.color.BLACK)
+        self.render_tile(column * self.tile_size, row * self.tile_size, texel_scale)
+        self.tiles_rendered += 1
+        return tile
+
+    def evict(self):
+        # Tiles drawn this frame were just moved to the end, so only stale ones go
+        while self.texels > self.max_texels and len(self.tiles) > self.tiles_drawn:
+            _, tile = self.tiles.popitem(last=False)
+            self.texels -= tile.size * tile.size
+            tile.delete()
+
+    def invalidate_rect(self, left, bottom, right, top):
+        """Drop every tile overlapping the world rect so it is rendered again when next seen"""
+        size = self.tile_size
+        columns = range(int(left // size), int(right // size) + 1)
+        rows = range(int(bottom // size), int(top // size) + 1)
+        for key in [key for key in self.tiles if key[0] in columns and key[1] in rows]:
+            tile = self.tiles.pop(key)
+            self.texels -= tile.size * tile.size
+            tile.delete()
+
+    def profiler_lines(self):
+        return [
+            f"tiles: {self.tiles_drawn} drawn, {len(self.tiles)} cached ({self.texels * 4 / (1024 * 1024):.1f}MB)",
+            f"rendered: {self.tiles_rendered} total"
+        ]
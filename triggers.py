@@ -0,0 +1,125 @@
+import collections
+import math
+import time
+
+from spatial_index import SpatialGrid
+
+TRIGGER_EVENTS = ("enter", "stay", "exit")
+STATS_WINDOW = 1.0
+
+
+class TriggerZone:
+    """A circle, or a rectangle turned to angle, that moves with its owner.
+
+    kind picks the handlers that hear about the zone. The zone's centre is
+    the owner's position plus (offset_x, offset_y); a rectangle is
+    2 * half_length along angle (degrees counter-clockwise from +x, like
+    SolarFlare.direction) by 2 * half_width across it.
+    """
+    __slots__ = ("owner", "kind", "radius", "half_length", "half_width", "cos", "sin", "offset_x", "offset_y")
+
+    def __init__(self, owner, kind, radius=0.0, half_length=0.0, half_width=0.0, angle=0.0, offset_x=0.0, offset_y=0.0):
+        self.owner = owner
+        self.kind = kind
+        self.radius = radius
+        self.half_length = half_length
+        self.half_width = half_width
+        self.cos = math.cos(math.radians(angle))
+        self.sin = math.sin(math.radians(angle))
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    @property
+    def x(self):
+        return self.owner.x + self.offset_x
+
+    @property
+    def y(self):
+        return self.owner.y + self.offset_y
+
+    def bounding_radius(self):
+        return self.radius or math.hypot(self.half_length, self.half_width)
+
+    def contains(self, x, y, margin=0.0):
+        """Whether a circle of radius margin at (x, y) overlaps the zone; rectangles are widened by margin all round"""
+        dx = x - self.owner.x - self.offset_x
+        dy = y - self.owner.y - self.offset_y
+        if self.radius:
+            reach = self.radius + margin
+            return dx * dx + dy * dy <= reach * reach
+        along = dx * self.cos + dy * self.sin
+        across = dy * self.cos - dx * self.sin
+        return abs(along) <= self.half_length + margin and abs(across) <= self.half_width + margin
+
+
+class TriggerSystem:
+    """Enter, stay and exit events for bodies moving through trigger zones.
+
+    Zones are bucketed by centre in a SpatialGrid, so update() for a body
+    only tests the zones in the cells around it, however many zones the
+    world has; zones whose owner moves are passed to move(). The zones each
+    body was inside at its last update are kept, and the events are the
+    difference: enter for new overlaps, stay for continuing ones (every
+    update, with the delta time) and exit for the ones left behind.
+    Handlers registered with on(kind, handler) are called as
+    handler(event, zone, body, delta_time).
+    """
+
+    def __init__(self):
+        self.grid = SpatialGrid()
+        self.zones = {}     # owner -> [zones]
+        self.handlers = {}  # kind -> [handlers]
+        self.inside = {}    # body -> {zone: None} it overlapped at its last update
+        self.tested = 0     # Zones tested at the last update
+        self.update_time = 0.0
+        self.events = collections.deque()  # (time, event)
+
+    def __len__(self):
+        return len(self.grid)
+
+    def attach(self, zone):
+        """Add a zone; returns False if its owner already has one of this kind"""
+        zones = self.zones.setdefault(zone.owner, [])
+        if any(other.kind == zone.kind for other in zones):
+            return False
+        zones.append(zone)
+        self.grid.insert(zone, zone.bounding_radius())
+        return True
+
+    def move(self, owner):
+        """Follow an owner that has moved"""
+        for zone in self.zones.get(owner, ()):
+            self.grid.move(zone)
+
+    def on(self, kind, handler):
+        self.handlers.setdefault(kind, []).append(handler)
+
+    def update(self, body, radius, delta_time):
+        """Test a body of the given radius against the zones near it and send the events"""
+        start = time.perf_counter()
+        near = self.grid.query_rect(body.x - radius, body.y - radius, body.x + radius, body.y + radius)
+        self.tested = len(near)
+        current = {zone: None for zone in near if zone.contains(body.x, body.y, radius)}
+        previous = self.inside.get(body, {})
+        self.inside[body] = current
+        self.update_time = time.perf_counter() - start
+
+        for zone in previous:
+            if zone not in current:
+                self.send("exit", zone, body, delta_time)
+        for zone in current:
+            self.send("stay" if zone in previous else "enter", zone, body, delta_time)
+
+    def send(self, event, zone, body, delta_time):
+        now = time.perf_counter()
+        self.events.append((now, event))
+        while self.events[0][0] < now - STATS_WINDOW:
+            self.events.popleft()
+        for handler in self.handlers.get(zone.kind, ()):
+            handler(event, zone, body, delta_time)
+
+    def profiler_lines(self):
+        counts = collections.Counter(event for _, event in self.events)
+        inside = ", ".join(f"{zone.kind}" for zones in self.inside.values() for zone in zones) or "nothing"
+        return [f"{len(self)} zones, {self.tested} tested last update in {self.update_time * 1e6:.0f}us; inside {inside}",
+                "events/s: " + ", ".join(f"{counts[event]} {event}" for event in TRIGGER_EVENTS)]
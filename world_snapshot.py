@@ -0,0 +1,153 @@
+import operator
+import struct
+import time
+
+SNAPSHOT_MAGIC = b"LSS1"
+HEADER = struct.Struct("<4sH")  # magic, section count
+COUNT = struct.Struct("<I")     # objects in a section
+TIMING_SAMPLES = 10             # Save/restore pairs averaged by measure()
+
+
+class ObjectLayout:
+    """Which attributes of one kind of object a snapshot holds, and how each is packed.
+
+    fields is a list of (attribute, struct code) or (attribute, struct code,
+    choices) where the attribute holds one of the choices and is stored as
+    its index. Values are written exactly, so use "d" for anything a
+    resimulation must reproduce bit for bit. create() builds a blank object
+    when a restore needs more than exist; without it the list is treated as
+    append-only (world bodies) and a restore only writes back the objects
+    that were saved. restored(obj) refreshes state derived from the restored
+    attributes (cached geometry, scene nodes). With items the objects are
+    lists and each field names an index into them instead of an attribute
+    (debris pieces, rock rows).
+    """
+
+    def __init__(self, fields, create=None, restored=None, items=False):
+        self.names = tuple(field[0] for field in fields)
+        self.record = struct.Struct("<" + "".join(field[1] for field in fields))
+        self.items = items
+        getter = operator.itemgetter if items else operator.attrgetter
+        self.get = getter(*self.names) if len(self.names) > 1 else (
+            lambda obj, get=getter(self.names[0]): (get(obj),))
+        self.choices = [(index, field[2]) for index, field in enumerate(fields) if len(field) > 2]
+        self.create = create
+        self.restored = restored
+        self.spare = []  # Objects dropped by a restore, reused before create()
+
+    def pack(self, obj):
+        if not self.choices:
+            return self.record.pack(*self.get(obj))
+        values = list(self.get(obj))
+        for index, choices in self.choices:
+            values[index] = choices.index(values[index])
+        return self.record.pack(*values)
+
+    def apply(self, obj, values):
+        if self.choices:
+            values = list(values)
+            for index, choices in self.choices:
+                values[index] = choices[values[index]]
+        if self.items:
+            for index, value in zip(self.names, values):
+                obj[index] = value
+        else:
+            obj.__dict__.update(zip(self.names, values))
+        if self.restored:
+            self.restored(obj)
+
+
+class WorldSnapshotter:
+    """Saves and restores a game's simulation state as one compact binary string.
+
+    The state is a list of sections, each a list of objects sharing an
+    ObjectLayout; a single object (the player, the camera, the game's own
+    timers) is a one-object section. The snapshot holds only the packed
+    values, in section order, so it is tied to the layouts it was saved with.
+    restore() writes the values back into the live objects in place, so
+    references to them stay valid; variable lists (bullets) are trimmed or
+    refilled from spare objects, and a section's spatial grid is kept in
+    step. The random module's state is not part of a snapshot, so a
+    resimulation only replays exactly where the rules themselves do not
+    draw random numbers.
+    """
+
+    def __init__(self):
+        self.sections = []  # (name, callable returning the live list, layout, grid, radius, restored)
+        self.saved = None   # Quick save (F7), restored by F8
+        self.size = 0
+        self.save_time = 0.0
+        self.restore_time = 0.0
+
+    def add_section(self, name, objects, layout, grid=None, radius=0.0, restored=None):
+        """objects returns the live list; restore() edits that list in place, then calls restored(list)"""
+        self.sections.append((name, objects, layout, grid, radius, restored))
+
+    def save(self):
+        start = time.perf_counter()
+        parts = [HEADER.pack(SNAPSHOT_MAGIC, len(self.sections))]
+        for _, objects, layout, _, _, _ in self.sections:
+            objects = objects()
+            parts.append(COUNT.pack(len(objects)))
+            parts.extend([layout.pack(obj) for obj in objects])
+        data = b"".join(parts)
+        self.size = len(data)
+        self.save_time = time.perf_counter() - start
+        return data
+
+    def restore(self, data):
+        start = time.perf_counter()
+        magic, section_count = HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or section_count != len(self.sections):
+            raise ValueError("snapshot does not match this game's layout")
+        view = memoryview(data)
+        offset = HEADER.size
+        for _, objects, layout, grid, radius, restored in self.sections:
+            count = COUNT.unpack_from(data, offset)[0]
+            offset += COUNT.size
+            end = offset + count * layout.record.size
+            records = layout.record.iter_unpack(view[offset:end])
+            offset = end
+
+            objects = objects()
+            while layout.create and len(objects) > count:
+                obj = objects.pop()
+                if grid is not None:
+                    grid.remove(obj)
+                layout.spare.append(obj)
+            while layout.create and len(objects) < count:
+                objects.append(layout.spare.pop() if layout.spare else layout.create())
+            for obj, values in zip(objects, records):
+                layout.apply(obj, values)
+                if grid is not None:
+                    if obj in grid:
+                        grid.move(obj)
+                    else:
+                        grid.insert(obj, radius)
+            if restored:
+                restored(objects)
+        self.restore_time = time.perf_counter() - start
+
+    def quick_save(self):
+        self.saved = self.save()
+
+    def quick_restore(self):
+        if self.saved is not None:
+            self.restore(self.saved)
+
+    def measure(self, samples=TIMING_SAMPLES):
+        """Average (save, restore) seconds for the current state; restoring it is a no-op"""
+        save_total = restore_total = 0.0
+        for _ in range(samples):
+            data = self.save()
+            save_total += self.save_time
+            self.restore(data)
+            restore_total += self.restore_time
+        return save_total / samples, restore_total / samples
+
+    def profiler_lines(self):
+        save_time, restore_time = self.measure()
+        counts = ", ".join(f"{len(objects())} {name}" for name, objects, _, _, _, _ in self.sections)
+        held = f"{len(self.saved)}B held" if self.saved is not None else "nothing held"
+        return [f"{self.size}B: {counts}",
+                f"save {save_time * 1e6:.0f}us, restore {restore_time * 1e6:.0f}us; {held} (F7 saves, F8 restores)"]
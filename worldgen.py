@@ -0,0 +1,272 @@
+import collections
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import random
+import time
+from array import array
+
+# Sectors are generated independently in worker processes
+SECTOR_SIZE = 250
+GENERATION_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Leave a core for the game loop
+MERGE_BUDGET = 0.002  # Seconds per frame spent turning finished jobs into world objects
+
+# Chance of each kind of content appearing in a sector
+FOG_CHANCE = 0.3
+ASTEROID_CHANCE = 0.25
+DEBRIS_CHANCE = 0.2
+STATION_CHANCE = 0.1
+SYSTEM_CHANCE = 0.15
+STARS_PER_SECTOR = 6
+
+# Star systems: a star with up to three planets, some with an orbiting station
+SYSTEM_RADIUS = 140  # Outermost planet orbit plus its station
+
+FOG_COLORS = [
+    (64, 224, 208),
+    (32, 178, 170),
+    (16, 134, 128),
+    (150, 50, 200),
+    (50, 100, 200)
+]
+STATION_TYPES = [
+    "command", "fuel", "bar", "mining", "research",
+    "trade", "military", "shipyard", "medical", "casino"
+]
+STAR_COLORS = [
+    (255, 240, 200),
+    (255, 200, 120),
+    (200, 220, 255)
+]
+PLANET_SCHEMES = [
+    ("Rocky", (205, 92, 92), (139, 69, 69), (180, 60, 60)),
+    ("Ocean", (70, 130, 180), (25, 25, 112), (100, 200, 100)),
+    ("Desert", (255, 228, 181), (205, 133, 63), (200, 180, 120)),
+    ("Ice", (72, 201, 176), (47, 79, 79), (120, 220, 200)),
+    ("Gas", (222, 184, 135), (139, 90, 43), (180, 140, 100))
+]
+DEBRIS_COLORS = [
+    (150, 150, 120),  # Metal
+    (100, 80, 60),    # Rusty
+    (80, 100, 120),   # Blue metal
+    (120, 100, 80)    # Brown
+]
+
+
+def generate_sector(seed, sector_x, sector_y, exclude_rects):
+    """Generate one sector's content as flat float arrays (runs in a worker process).
+
+    Positions are local to the sector's bottom-left corner, so the float32
+    arrays stay exact however far the sector is from the world origin; the
+    merge adds the corner back in double precision.
+
+    Record layouts:
+      stars      x, y, size, opacity, rank
+      fog        x, y, width, height, color index, particle count
+      fog_parts  x, y, size, opacity            (particle counts from fog)
+      asteroids  x, y, spread, rock count
+      rocks      x, y, size, gray               (rock counts from asteroids)
+      debris     x, y, spread, piece count
+      pieces     x, y, size, rotation, rotation speed, color index
+      stations   x, y, size, type index
+      systems    x, y, star size, star color index, planet count
+      planets    orbit radius, eccentricity, periapsis angle, phase, size, scheme index,
+                 station type index (-1 for none), station orbit radius, station phase,
+                 flare direction (-1 for none)     (planet counts from systems)
+    """
+    rng = random.Random(f"{seed}:{sector_x}:{sector_y}")
+    left = sector_x * SECTOR_SIZE
+    bottom = sector_y * SECTOR_SIZE
+
+    def excluded(x, y, margin):
+        x += left
+        y += bottom
+        for ex_left, ex_bottom, ex_right, ex_top in exclude_rects:
+            if ex_left - margin <= x <= ex_right + margin and ex_bottom - margin <= y <= ex_top + margin:
+                return True
+        return False
+
+    def random_point(margin):
+        return rng.uniform(margin, SECTOR_SIZE - margin), rng.uniform(margin, SECTOR_SIZE - margin)
+
+    data = {name: array("f") for name in
+            ("stars", "fog", "fog_parts", "asteroids", "rocks", "debris", "pieces", "stations",
+             "systems", "planets")}
+
+    # Star tile: 80% small dim stars, 20% bright larger stars
+    for _ in range(STARS_PER_SECTOR):
+        x = rng.uniform(0, SECTOR_SIZE)
+        y = rng.uniform(0, SECTOR_SIZE)
+        if rng.random() < 0.8:
+            data["stars"].extend((x, y, 1.0, 0.6, rng.random()))
+        else:
+            data["stars"].extend((x, y, 1.5, 1.0, rng.random()))
+
+    if rng.random() < FOG_CHANCE:
+        x, y = random_point(60)
+        if not excluded(x, y, 60):
+            width = rng.uniform(80, 140)
+            height = rng.uniform(60, 90)
+            count = int(rng.uniform(0.2, 0.35) * 100)
+            data["fog"].extend((x, y, width, height, rng.randrange(len(FOG_COLORS)), count))
+            for _ in range(count):
+                data["fog_parts"].extend((
+                    x + rng.uniform(-width / 2, width / 2),
+                    y + rng.uniform(-height / 2, height / 2),
+                    rng.uniform(3, 8),
+                    rng.uniform(0.1, 0.3)
+                ))
+
+    if rng.random() < ASTEROID_CHANCE:
+        x, y = random_point(50)
+        if not excluded(x, y, 50):
+            spread = rng.uniform(25, 45)
+            count = rng.randint(6, 14)
+            data["asteroids"].extend((x, y, spread, count))
+            for _ in range(count):
+                data["rocks"].extend((
+                    x + rng.uniform(-spread, spread),
+                    y + rng.uniform(-spread, spread),
+                    rng.uniform(2, 6),
+                    rng.randint(100, 180)
+                ))
+
+    if rng.random() < DEBRIS_CHANCE:
+        x, y = random_point(40)
+        if not excluded(x, y, 40):
+            spread = 30
+            count = rng.randint(5, 10)
+            data["debris"].extend((x, y, spread, count))
+            for _ in range(count):
+                data["pieces"].extend((
+                    x + rng.uniform(-spread, spread),
+                    y + rng.uniform(-spread, spread),
+                    rng.uniform(1, 4),
+                    rng.uniform(0, 360),
+                    rng.uniform(-45, 45),
+                    rng.randrange(len(DEBRIS_COLORS))
+                ))
+
+    if rng.random() < STATION_CHANCE:
+        x, y = random_point(40)
+        if not excluded(x, y, 40):
+            data["stations"].extend((x, y, rng.choice((20, 22, 25)), rng.randrange(len(STATION_TYPES))))
+
+    if rng.random() < SYSTEM_CHANCE:
+        x, y = random_point(SECTOR_SIZE / 2 - 15)
+        if not excluded(x, y, SYSTEM_RADIUS):
+            count = rng.randint(1, 3)
+            data["systems"].extend((x, y, rng.uniform(10, 14), rng.randrange(len(STAR_COLORS)), count))
+            radius = 30
+            for _ in range(count):
+                radius += rng.uniform(18, 25)
+                has_station = rng.random() < 0.5
+                data["planets"].extend((
+                    radius,
+                    rng.uniform(0, 0.12),
+                    rng.uniform(0, 2 * math.pi),
+                    rng.uniform(0, 2 * math.pi),
+                    rng.uniform(6, 10),
+                    rng.randrange(len(PLANET_SCHEMES)),
+                    rng.randrange(len(STATION_TYPES)) if has_station else -1,
+                    rng.uniform(18, 22),
+                    rng.uniform(0, 2 * math.pi),
+                    rng.uniform(0, 360) if rng.random() < 0.3 else -1
+                ))
+
+    return sector_x, sector_y, data
+
+
+def records(values, size):
+    """Split a flat array into tuples of the given size"""
+    it = iter(values)
+    return list(zip(*[it] * size))
+
+
+def world_records(values, size, left, bottom):
+    """Like records, with each leading x, y moved from sector-local to world coordinates"""
+    return [(left + record[0], bottom + record[1]) + record[2:] for record in records(values, size)]
+
+
+class SectorStreamer:
+    """Generates sectors around the camera in a process pool and merges them a little per frame.
+
+    merge_sector(sector_x, sector_y, data) must be a generator that adds the
+    sector's objects to the world and yields after each one; the streamer runs
+    these generators within MERGE_BUDGET per frame, nearest sectors first.
+    """
+
+    def __init__(self, merge_sector, world_width, world_height, seed=None, exclude_rects=(),
+                 workers=GENERATION_WORKERS):
+        self.merge_sector = merge_sector
+        self.columns = (world_width + SECTOR_SIZE - 1) // SECTOR_SIZE
+        self.rows = (world_height + SECTOR_SIZE - 1) // SECTOR_SIZE
+        self.seed = random.randrange(1 << 30) if seed is None else seed
+        self.exclude_rects = tuple(exclude_rects)
+
+        # Spawn rather than fork: the parent holds a GL context and pyglet threads
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.workers = workers
+        self.requested = set()
+        self.pending = []  # Futures not yet finished
+        self.merges = collections.deque()
+        self.sectors_merged = 0
+        self.merge_time = 0.0
+
+    def request_around(self, x, y, radius):
+        """Submit jobs for every sector within radius of (x, y), nearest first"""
+        min_col = max(0, int((x - radius) // SECTOR_SIZE))
+        max_col = min(self.columns - 1, int((x + radius) // SECTOR_SIZE))
+        min_row = max(0, int((y - radius) // SECTOR_SIZE))
+        max_row = min(self.rows - 1, int((y + radius) // SECTOR_SIZE))
+
+        wanted = []
+        for sector_x in range(min_col, max_col + 1):
+            for sector_y in range(min_row, max_row + 1):
+                if (sector_x, sector_y) not in self.requested:
+                    center_x = (sector_x + 0.5) * SECTOR_SIZE
+                    center_y = (sector_y + 0.5) * SECTOR_SIZE
+                    wanted.append(((center_x - x) ** 2 + (center_y - y) ** 2, sector_x, sector_y))
+
+        for _, sector_x, sector_y in sorted(wanted):
+            self.requested.add((sector_x, sector_y))
+            self.pending.append(self.pool.submit(
+                generate_sector, self.seed, sector_x, sector_y, self.exclude_rects))
+
+    def update(self, budget=MERGE_BUDGET):
+        """Collect finished jobs and merge within the time budget. Returns True if anything merged."""
+        if self.pending:
+            still_pending = []
+            for future in self.pending:
+                if future.done():
+                    sector_x, sector_y, data = future.result()
+                    self.merges.append(self.merge_sector(sector_x, sector_y, data))
+                else:
+                    still_pending.append(future)
+            self.pending = still_pending
+
+        if not self.merges:
+            return False
+
+        start = time.perf_counter()
+        deadline = start + budget
+        while self.merges and time.perf_counter() < deadline:
+            try:
+                next(self.merges[0])
+            except StopIteration:
+                self.merges.popleft()
+                self.sectors_merged += 1
+        self.merge_time += time.perf_counter() - start
+        return True
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def profiler_lines(self):
+        return [
+            f"workers: {self.workers}",
+            f"sectors: {self.sectors_merged} merged, {len(self.pending)} generating, {len(self.merges)} merging",
+            f"merge time: {self.merge_time * 1000:.1f}ms total"
+        ]